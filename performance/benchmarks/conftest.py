@@ -0,0 +1,162 @@
+# performance/benchmarks/conftest.py
+
+"""
+Shared fixtures of the GroundInsight benchmark suite.
+
+The benchmarks use pytest-benchmark and run on synthetic networks of several topologies and sizes.
+Each network has a source at its first bus and a fault at the bus farthest away from it and is
+evaluated at three frequencies.
+
+Run the suite and store the timings with:
+
+    pytest performance/benchmarks --benchmark-storage=performance/benchmarks/.results --benchmark-autosave
+
+and compare a later run against the last stored timings, failing on a slowdown of more than 10 %:
+
+    pytest performance/benchmarks --benchmark-storage=performance/benchmarks/.results \
+        --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Commit the stored timings of a release so the next release can be compared against them.
+"""
+
+import math
+import pytest
+import groundinsight as gi
+from groundinsight.models.core_models import BusType, BranchType, Network
+
+FREQUENCIES = [50.0, 250.0, 500.0]
+
+# Topology -> number of buses. Meshed topologies stay small because the number of paths between
+# source and fault grows exponentially with their size.
+SIZES = {
+    "radial": [10, 100, 500],
+    "ladder": [10, 20],
+    "grid": [9, 16],
+    "multi_source": [10, 100],
+}
+
+NETWORK_CASES = [
+    pytest.param((topology, size), id=f"{topology}-{size}")
+    for topology, sizes in SIZES.items()
+    for size in sizes
+]
+
+BUS_TYPE = BusType(
+    name="BenchmarkBusType",
+    system_type="Grounded",
+    voltage_level=230.0,
+    impedance_formula="rho * 0.01 + 1 + I * f * 1/50",
+)
+
+BRANCH_TYPE = BranchType(
+    name="BenchmarkBranchType",
+    grounding_conductor=True,
+    self_impedance_formula="(rho * 0.001 + 0.25 + I * f * 0.012)*l",
+    mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+)
+
+
+def _connect(net: Network, from_bus: str, to_bus: str, index: int):
+    gi.create_branch(
+        name=f"branch{index}",
+        type=BRANCH_TYPE,
+        from_bus=from_bus,
+        to_bus=to_bus,
+        length=0.5 + (index % 7) * 0.1,
+        specific_earth_resistance=100.0,
+        network=net,
+    )
+
+
+def build_network(topology: str, size: int) -> Network:
+    """
+    Build a synthetic benchmark network.
+
+    Args:
+        topology (str): "radial" (a chain), "ladder" (two chains connected at every bus), "grid"
+                        (a square mesh) or "multi_source" (a chain with a source at every tenth bus).
+        size (int): The number of buses.
+
+    Returns:
+        Network: The network with sources, one fault and no paths.
+    """
+    net = gi.create_network(name=f"bench_{topology}_{size}", frequencies=FREQUENCIES)
+    for index in range(1, size + 1):
+        gi.create_bus(
+            name=f"bus{index}",
+            type=BUS_TYPE,
+            specific_earth_resistance=100.0 + index % 11,
+            network=net,
+        )
+
+    branches = []
+    if topology in ("radial", "multi_source"):
+        branches = [(index, index + 1) for index in range(1, size)]
+    elif topology == "ladder":
+        half = size // 2
+        branches = [(index, index + 1) for index in range(1, half)]
+        branches += [(half + index, half + index + 1) for index in range(1, half)]
+        branches += [(index, half + index) for index in range(1, half + 1)]
+    elif topology == "grid":
+        width = math.isqrt(size)
+        for row in range(width):
+            for column in range(width):
+                index = row * width + column + 1
+                if column + 1 < width:
+                    branches.append((index, index + 1))
+                if row + 1 < width:
+                    branches.append((index, index + width))
+    else:
+        raise ValueError(f"Unknown benchmark topology '{topology}'.")
+    for branch_index, (from_index, to_index) in enumerate(branches, start=1):
+        _connect(net, f"bus{from_index}", f"bus{to_index}", branch_index)
+
+    source_buses = [1]
+    if topology == "multi_source":
+        source_buses += list(range(10, size + 1, 10))
+    for source_bus in source_buses:
+        gi.create_source(
+            name=f"source{source_bus}",
+            bus=f"bus{source_bus}",
+            values={50.0: 60.0, 250.0: 10.0, 500.0: 5.0},
+            network=net,
+        )
+    gi.create_fault(
+        name="fault1",
+        bus=f"bus{size}",
+        scalings={freq: 1.0 for freq in FREQUENCIES},
+        network=net,
+    )
+    return net
+
+
+_network_cache = {}
+
+
+def cached_network(topology: str, size: int, solved: bool = False) -> Network:
+    """
+    Return a benchmark network with paths, built once per test session.
+
+    Args:
+        topology (str): The topology of the network.
+        size (int): The number of buses.
+        solved (bool, optional): Whether the fault has to be solved. Defaults to False.
+
+    Returns:
+        Network: The cached network. Benchmarks must not change its elements.
+    """
+    key = (topology, size)
+    if key not in _network_cache:
+        net = build_network(topology, size)
+        gi.create_paths(network=net)
+        _network_cache[key] = net
+    net = _network_cache[key]
+    if solved and "fault1" not in net.results:
+        gi.run_fault(network=net, fault_name="fault1")
+    return net
+
+
+@pytest.fixture(params=NETWORK_CASES)
+def network_case(request):
+    """The (topology, size) of a benchmark network."""
+    return request.param
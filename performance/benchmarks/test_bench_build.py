@@ -0,0 +1,49 @@
+# performance/benchmarks/test_bench_build.py
+
+"""Benchmarks of impedance evaluation and network construction."""
+
+import pytest
+import groundinsight as gi
+from groundinsight.utils.impedance_calculator import compute_impedance
+from conftest import BUS_TYPE, BRANCH_TYPE, FREQUENCIES, build_network
+
+
+def test_bus_impedance_evaluation(benchmark):
+    benchmark(
+        compute_impedance,
+        BUS_TYPE.impedance_formula,
+        FREQUENCIES,
+        {"rho": 100.0},
+    )
+
+
+def test_branch_impedance_evaluation(benchmark):
+    benchmark(
+        compute_impedance,
+        BRANCH_TYPE.self_impedance_formula,
+        FREQUENCIES,
+        {"rho": 100.0, "l": 1.0},
+    )
+
+
+@pytest.mark.parametrize("size", [10, 100])
+def test_build_radial_network(benchmark, size):
+    benchmark.pedantic(build_network, args=("radial", size), rounds=3)
+
+
+@pytest.mark.parametrize("size", [1000, 10000])
+def test_generate_tree_network(benchmark, size):
+    benchmark.pedantic(
+        gi.create_tree_network,
+        kwargs=dict(
+            name="bench_tree",
+            frequencies=FREQUENCIES,
+            number_buses=size,
+            bus_type=BUS_TYPE,
+            branch_type=BRANCH_TYPE,
+            branching=3,
+            rho_range=(50.0, 500.0),
+            seed=1,
+        ),
+        rounds=3,
+    )
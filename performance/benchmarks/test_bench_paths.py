@@ -0,0 +1,15 @@
+# performance/benchmarks/test_bench_paths.py
+
+"""Benchmarks of the path search between sources and faults."""
+
+from conftest import cached_network
+
+
+def test_define_paths(benchmark, network_case):
+    net = cached_network(*network_case)
+
+    def clear_paths():
+        net.paths = {}
+
+    benchmark.pedantic(net.define_paths, setup=clear_paths, rounds=5)
+    assert net.paths
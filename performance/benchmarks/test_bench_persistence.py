@@ -0,0 +1,63 @@
+# performance/benchmarks/test_bench_persistence.py
+
+"""Benchmarks of the database, JSON and Arrow round trips."""
+
+import pytest
+import groundinsight as gi
+from sqlalchemy.orm import sessionmaker
+from groundinsight.database.crud import save_network, load_network
+from groundinsight.database.engine import create_db_engine
+from groundinsight.models.database_models import Base
+from conftest import cached_network
+
+
+@pytest.fixture
+def db_session(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'benchmark.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_db_save(benchmark, network_case, db_session):
+    net = cached_network(*network_case, solved=True)
+
+    def save():
+        # a new name defeats the unchanged-network shortcut
+        save.count += 1
+        copy = net.model_copy(update={"name": f"{net.name}_{save.count}"})
+        save_network(copy, db_session)
+
+    save.count = 0
+    benchmark.pedantic(save, rounds=5)
+
+
+def test_db_load(benchmark, network_case, db_session):
+    net = cached_network(*network_case, solved=True)
+    save_network(net, db_session, overwrite=True)
+    benchmark.pedantic(load_network, args=(net.name, db_session), rounds=5)
+
+
+@pytest.mark.parametrize("stream", [False, True], ids=["oneshot", "stream"])
+def test_json_round_trip(benchmark, network_case, tmp_path, stream):
+    net = cached_network(*network_case, solved=True)
+    path = str(tmp_path / "network.json")
+
+    def round_trip():
+        gi.save_network_to_json(network=net, path=path, stream=stream)
+        return gi.load_network_from_json(path=path, stream=stream)
+
+    benchmark.pedantic(round_trip, rounds=5)
+
+
+def test_arrow_round_trip(benchmark, network_case, tmp_path):
+    net = cached_network(*network_case, solved=True)
+    path = str(tmp_path / "study")
+
+    def round_trip():
+        gi.save_network_to_arrow(network=net, path=path)
+        return gi.load_network_from_arrow(path=path)
+
+    benchmark.pedantic(round_trip, rounds=5)
@@ -0,0 +1,36 @@
+# performance/benchmarks/test_bench_results.py
+
+"""Benchmarks of the result DataFrame builders and result queries."""
+
+import polars as pl
+from conftest import cached_network
+
+
+def test_res_buses(benchmark, network_case):
+    net = cached_network(*network_case, solved=True)
+    benchmark.pedantic(net.res_buses, args=("fault1",), rounds=20)
+
+
+def test_res_branches(benchmark, network_case):
+    net = cached_network(*network_case, solved=True)
+    benchmark.pedantic(net.res_branches, args=("fault1",), rounds=20)
+
+
+def test_results_lazy_query(benchmark, network_case):
+    net = cached_network(*network_case, solved=True)
+
+    def query():
+        return (
+            net.results_lazy()
+            .filter(pl.col("frequency_Hz") == 50)
+            .group_by("bus_name")
+            .agg(pl.col("EPR_V").max())
+            .collect()
+        )
+
+    benchmark(query)
+
+
+def test_worst_cases(benchmark, network_case):
+    net = cached_network(*network_case, solved=True)
+    benchmark(net.worst_cases, metric="uepr", k=10)
@@ -0,0 +1,157 @@
+# performance/benchmarks/test_bench_solve.py
+
+"""Benchmarks of the admittance matrix assembly, its factorization and the full fault calculation."""
+
+import pytest
+import groundinsight as gi
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+from groundinsight.electrical_network import ElectricalNetwork
+from groundinsight.simulation.krylov import KrylovSolver
+from groundinsight.simulation.symbolic import SymbolicAnalysis
+from groundinsight.simulation.symmetric import SymmetricFactorization
+from groundinsight.simulation.tree_solver import TreeFactorization
+from conftest import cached_network
+
+
+def test_electrical_network_build(benchmark, network_case):
+    net = cached_network(*network_case)
+    net.set_active_fault("fault1")
+    benchmark(ElectricalNetwork, net)
+
+
+def test_y_matrix_assembly(benchmark, network_case):
+    net = cached_network(*network_case)
+    net.set_active_fault("fault1")
+    electrical_network = ElectricalNetwork(net)
+    benchmark(electrical_network._construct_Y_matrices)
+
+
+def test_factorization(benchmark, network_case):
+    net = cached_network(*network_case)
+    net.set_active_fault("fault1")
+    electrical_network = ElectricalNetwork(net)
+
+    def factorize():
+        return [splu(csc_matrix(Y)) for Y in electrical_network.Y_matrices.values()]
+
+    benchmark(factorize)
+
+
+def test_symmetric_factorization(benchmark, network_case):
+    # compare with test_factorization for the symmetric ordering shared by all frequencies
+    net = cached_network(*network_case)
+    net.set_active_fault("fault1")
+    electrical_network = ElectricalNetwork(net)
+
+    def factorize():
+        ordering = None
+        factorizations = []
+        for Y in electrical_network.Y_matrices.values():
+            factorizations.append(SymmetricFactorization.factorize(Y, ordering))
+            ordering = factorizations[-1].ordering
+        return factorizations
+
+    benchmark(factorize)
+
+
+def test_symbolic_factorization(benchmark, network_case):
+    # compare with test_symmetric_factorization for the ordering and permutation kept per pattern
+    net = cached_network(*network_case)
+    net.set_active_fault("fault1")
+    electrical_network = ElectricalNetwork(net)
+    matrices = list(electrical_network.Y_matrices.values())
+    analysis = SymbolicAnalysis(matrices[0])
+    analysis.factorize(matrices[0])
+
+    def factorize():
+        return [analysis.factorize(Y) for Y in matrices]
+
+    benchmark(factorize)
+
+
+def test_run_fault(benchmark, network_case):
+    net = cached_network(*network_case)
+    benchmark(gi.run_fault, network=net, fault_name="fault1")
+
+
+def test_run_fault_profiled(benchmark, network_case):
+    # compare with test_run_fault for the overhead of an active StageProfiler
+    net = cached_network(*network_case)
+
+    def run_profiled():
+        with gi.StageProfiler():
+            gi.run_fault(network=net, fault_name="fault1")
+
+    benchmark(run_profiled)
+
+
+def test_branch_outage_sweep(benchmark, network_case):
+    net = cached_network(*network_case)
+    analysis = gi.ContingencyAnalysis(net, "fault1")
+    benchmark(analysis.branch_outages)
+
+
+def test_impedance_sensitivities(benchmark, network_case):
+    # compare with test_run_fault times the number of buses and branches for finite differences
+    net = cached_network(*network_case)
+    analysis = gi.SensitivityAnalysis(net, "fault1")
+    benchmark(analysis.impedance_sensitivities)
+
+
+def test_monte_carlo(benchmark, network_case):
+    # one batch of samples, compare with test_run_fault times the batch size
+    net = cached_network(*network_case)
+    analysis = gi.MonteCarloAnalysis(net, "fault1", seed=0)
+    benchmark(analysis.run, 32)
+
+
+def test_tree_factorization(benchmark, network_case):
+    # compare with test_factorization for the sweep of the tree solver on radial networks
+    topology, _ = network_case
+    if topology not in ("radial", "multi_source"):
+        pytest.skip("the tree solver needs a radial network")
+    net = cached_network(*network_case)
+    net.set_active_fault("fault1")
+    electrical_network = ElectricalNetwork(net, solver="tree")
+    matrices = list(electrical_network.Y_matrices.values())
+    benchmark(TreeFactorization.factorize, electrical_network.tree_topology, matrices)
+
+
+def test_krylov_solve(benchmark, network_case):
+    # compare with test_factorization for the preconditioner and the iterations of the Krylov solver
+    net = cached_network(*network_case)
+    gi.run_fault(network=net, fault_name="fault1")
+    electrical_network = net.electrical_network
+
+    def solve():
+        return [
+            KrylovSolver(electrical_network.Y_matrices[freq]).solve(vector)
+            for freq, vector in electrical_network.i_vectors.items()
+        ]
+
+    benchmark(solve)
+
+
+def test_kron_reduction(benchmark, network_case):
+    net = cached_network(*network_case)
+    names = list(net.buses)
+    benchmark(net.reduced_admittance, [names[0], names[len(names) // 2], names[-1]])
+
+
+def test_transfer_impedance_query(benchmark, network_case):
+    # a cached column answers the query without a solve
+    net = cached_network(*network_case)
+    gi.run_fault(network=net, fault_name="fault1")
+    cache = net.electrical_network.transfer_impedances
+    names = list(net.buses)
+    cache.column(names[-1], 50.0)
+    benchmark(cache.impedance, names[0], names[-1], 50.0)
+
+
+def test_rescale_sources(benchmark, network_case):
+    # the result is rebuilt from the unit responses of the sources
+    net = cached_network(*network_case)
+    gi.run_fault(network=net, fault_name="fault1", store_unit_responses=True)
+    source_name = next(iter(net.sources))
+    benchmark(net.rescale_sources, sources={source_name: 1.0})
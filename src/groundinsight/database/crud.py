@@ -7,12 +7,14 @@ CRUD Operations Module.
 This module provides functions for creating, reading, updating, and deleting (CRUD) entities
 in the GroundInsight database using SQLAlchemy sessions. It facilitates the management of
 core electrical network components such as BusTypes, BranchTypes, Networks, Buses, Branches,
-Faults, Sources, and Paths. The functions convert between Pydantic models and SQLAlchemy
-database models to ensure seamless data manipulation and persistence.
+Faults, Sources, Paths, and the Results of fault calculations. The functions convert between
+Pydantic models and SQLAlchemy database models to ensure seamless data manipulation and
+persistence.
 """
 
-from groundinsight.models.core_models import Network, BusType, BranchType
-from sqlalchemy.orm import Session
+from groundinsight.models.core_models import Network, BusType, BranchType, Result
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, selectinload
 from groundinsight.models.database_models import (
     BusTypeDB,
     BusDB,
@@ -22,8 +24,17 @@ from groundinsight.models.database_models import (
     SourceDB,
     PathDB,
     NetworkDB,
+    ResultDB,
+    network_buses,
+    network_branches,
+    network_faults,
+    network_sources,
+    network_paths,
 )
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Set
+
+# Maximum number of values in one SQL IN clause, below the parameter limits of all backends
+_IN_CLAUSE_CHUNK_SIZE = 500
 
 
 def save_bustype(bus_type: BusType, session: Session):
@@ -101,14 +112,16 @@ def load_branchtypes(session: Session) -> Dict[str, BranchType]:
     return {bt.name: bt.to_pydantic() for bt in branch_types}
 
 
-def save_network(network: Network, session: Session, overwrite: bool = False):
+def save_network(network: Network, session: Session, overwrite: bool = False) -> bool:
     """
     Save a Network to the database.
 
     This function saves a comprehensive `Network` instance to the database, including all
     associated BusTypes, BranchTypes, Buses, Branches, Faults, Sources, and Paths. It handles
     the creation or updating of related entities and ensures referential integrity. If `overwrite`
-    is set to `True`, an existing network with the same name will be deleted and replaced.
+    is set to `True`, an existing network with the same name will be deleted and replaced, unless
+    its stored content hash shows that it is unchanged. In that case only the description and the
+    active fault, which do not enter the content hash, are updated and the stored results are kept.
 
     Args:
         network (Network): The Network instance to be saved.
@@ -117,6 +130,9 @@ def save_network(network: Network, session: Session, overwrite: bool = False):
             If `True`, existing network data with the same name will be overwritten.
             Defaults to `False`.
 
+    Returns:
+        bool: True if the network was written, False if the stored network was unchanged.
+
     Raises:
         ValueError: If the network already exists and `overwrite` is set to `False`.
         Exception: If there is an error during the database commit.
@@ -127,6 +143,14 @@ def save_network(network: Network, session: Session, overwrite: bool = False):
         raise ValueError(
             f"Network '{network.name}' already exists. Use overwrite=True to overwrite."
         )
+    elif existing_network and existing_network.content_hash == network.content_hash:
+        # Unchanged network, skip the rewrite
+        existing_network.description = network.description
+        existing_network.active_fault_name = network.active_fault
+        for fault_db in existing_network.faults:
+            fault_db.active = network.faults[fault_db.name].active
+        session.commit()
+        return False
     elif existing_network and overwrite:
         session.delete(existing_network)
         session.commit()
@@ -200,6 +224,7 @@ def save_network(network: Network, session: Session, overwrite: bool = False):
 
     # Commit the session
     session.commit()
+    return True
 
 
 def load_network(name: str, session: Session) -> Network:
@@ -225,3 +250,303 @@ def load_network(name: str, session: Session) -> Network:
         raise ValueError(f"Network '{name}' not found.")
     network = network_db.to_pydantic()
     return network
+
+
+def load_subnetwork(
+    name: str,
+    session: Session,
+    bus_names: Optional[Iterable[str]] = None,
+    hops: Optional[int] = None,
+    fault_name: Optional[str] = None,
+) -> Network:
+    """
+    Load a part of a Network from the database.
+
+    This function loads only the buses within `hops` branches of the given buses (or of the bus
+    of the given fault) together with the branches between them, the faults and sources located
+    at these buses, and the paths that run entirely inside this part of the network. The
+    neighbourhood is expanded hop by hop with indexed queries, so the amount of data read is
+    bounded by the size of the subnetwork and not by the size of the stored network.
+
+    If a fault is given and `hops` is `None`, the whole connected part of the network around
+    the fault bus is loaded, which contains everything needed to run the calculation for this
+    fault. Only the given fault is included in that case.
+
+    Args:
+        name (str): The name of the network to load.
+        session (Session): The SQLAlchemy session used for database operations.
+        bus_names (Optional[Iterable[str]], optional): The names of the buses at the center of the
+                                                       subnetwork. Defaults to None.
+        hops (Optional[int], optional): The number of branches to walk away from the center buses.
+                                        `None` loads the whole connected part. Defaults to None.
+        fault_name (Optional[str], optional): The name of a fault whose bus is added to the center
+                                              buses. Defaults to None.
+
+    Returns:
+        Network: The loaded `Network` instance containing only the subnetwork.
+
+    Raises:
+        ValueError: If the network, a bus or the fault does not exist in the database, or if
+                    neither bus names nor a fault are given.
+    """
+    network_db = session.get(NetworkDB, name)
+    if not network_db:
+        raise ValueError(f"Network '{name}' not found.")
+
+    center_buses = set(bus_names) if bus_names is not None else set()
+    if fault_name is not None:
+        fault_db = (
+            session.query(FaultDB)
+            .join(network_faults, network_faults.c.fault_name == FaultDB.name)
+            .filter(network_faults.c.network_name == name, FaultDB.name == fault_name)
+            .one_or_none()
+        )
+        if fault_db is None:
+            raise ValueError(f"Fault '{fault_name}' not found in network '{name}'.")
+        center_buses.add(fault_db.bus_name)
+    if not center_buses:
+        raise ValueError("Either bus names or a fault name have to be given.")
+
+    found_buses = _select_in_network(
+        session, network_buses.c.bus_name, network_buses, name, center_buses
+    )
+    missing_buses = center_buses - found_buses
+    if missing_buses:
+        raise ValueError(
+            f"Buses {sorted(missing_buses)} not found in network '{name}'."
+        )
+
+    # Breadth-first expansion over the branches of this network
+    loaded_bus_names = set(center_buses)
+    loaded_branch_names = set()
+    frontier = set(center_buses)
+    hop = 0
+    while frontier and (hops is None or hop < hops):
+        next_frontier = set()
+        for branch_name, from_bus, to_bus in _incident_branches(
+            session, name, frontier
+        ):
+            loaded_branch_names.add(branch_name)
+            for bus_name in (from_bus, to_bus):
+                if bus_name not in loaded_bus_names:
+                    loaded_bus_names.add(bus_name)
+                    next_frontier.add(bus_name)
+        frontier = next_frontier
+        hop += 1
+
+    # Branches between two buses of the outermost hop close the subnetwork
+    for branch_name, from_bus, to_bus in _incident_branches(session, name, frontier):
+        if from_bus in loaded_bus_names and to_bus in loaded_bus_names:
+            loaded_branch_names.add(branch_name)
+
+    buses = {
+        bus_db.name: bus_db.to_pydantic()
+        for bus_db in _query_in(
+            session.query(BusDB).options(selectinload(BusDB.type)),
+            BusDB.name,
+            loaded_bus_names,
+        )
+    }
+    branches = {
+        branch_db.name: branch_db.to_pydantic()
+        for branch_db in _query_in(
+            session.query(BranchDB).options(selectinload(BranchDB.type)),
+            BranchDB.name,
+            loaded_branch_names,
+        )
+    }
+
+    if fault_name is not None and hops is None:
+        fault_query = session.query(FaultDB).filter(FaultDB.name == fault_name)
+    else:
+        fault_query = (
+            session.query(FaultDB)
+            .join(network_faults, network_faults.c.fault_name == FaultDB.name)
+            .filter(network_faults.c.network_name == name)
+        )
+    faults = {
+        fault_db.name: fault_db.to_pydantic()
+        for fault_db in _query_in(fault_query, FaultDB.bus_name, loaded_bus_names)
+    }
+
+    source_query = (
+        session.query(SourceDB)
+        .join(network_sources, network_sources.c.source_name == SourceDB.name)
+        .filter(network_sources.c.network_name == name)
+    )
+    sources = {
+        source_db.name: source_db.to_pydantic()
+        for source_db in _query_in(source_query, SourceDB.bus_name, loaded_bus_names)
+    }
+
+    path_query = (
+        session.query(PathDB)
+        .options(selectinload(PathDB.segments).selectinload(BranchDB.type))
+        .join(network_paths, network_paths.c.path_name == PathDB.name)
+        .filter(network_paths.c.network_name == name)
+    )
+    paths = {}
+    # the paths are chunked by fault, the sources are checked with the loaded sources
+    for path_db in _query_in(path_query, PathDB.fault_name, set(faults.keys())):
+        if path_db.source_name in sources and all(
+            branch_db.name in branches for branch_db in path_db.segments
+        ):
+            paths[path_db.name] = path_db.to_pydantic()
+
+    active_fault = (
+        network_db.active_fault_name if network_db.active_fault_name in faults else None
+    )
+
+    return Network(
+        name=network_db.name,
+        description=network_db.description,
+        frequencies=network_db.frequencies,
+        buses=buses,
+        branches=branches,
+        faults=faults,
+        sources=sources,
+        paths=paths,
+        active_fault=active_fault,
+    )
+
+
+def _chunks(values: Set[str]):
+    """
+    Split a set of values into lists that fit into one SQL IN clause.
+
+    Args:
+        values (Set[str]): The values to split.
+
+    Yields:
+        List[str]: Consecutive chunks of at most `_IN_CLAUSE_CHUNK_SIZE` values.
+    """
+    values = list(values)
+    for start in range(0, len(values), _IN_CLAUSE_CHUNK_SIZE):
+        yield values[start : start + _IN_CLAUSE_CHUNK_SIZE]
+
+
+def _query_in(query, column, values: Set[str]) -> List:
+    """
+    Run a query restricted to rows whose column value is in the given set.
+
+    Args:
+        query (Query): The SQLAlchemy query to restrict.
+        column (Column): The column compared with the values.
+        values (Set[str]): The allowed values.
+
+    Returns:
+        List: The rows of all chunked queries.
+    """
+    rows = []
+    for chunk in _chunks(values):
+        rows.extend(query.filter(column.in_(chunk)).all())
+    return rows
+
+
+def _select_in_network(
+    session: Session, column, table, name: str, values: Set[str]
+) -> Set[str]:
+    """
+    Return the values that are associated with a network in an association table.
+
+    Args:
+        session (Session): The SQLAlchemy session used for database operations.
+        column (Column): The element column of the association table.
+        table (Table): The association table.
+        name (str): The name of the network.
+        values (Set[str]): The element names to look up.
+
+    Returns:
+        Set[str]: The element names that belong to the network.
+    """
+    query = session.query(column).filter(table.c.network_name == name)
+    return {row[0] for row in _query_in(query, column, values)}
+
+
+def _incident_branches(session: Session, name: str, bus_names: Set[str]) -> List:
+    """
+    Query the branches of a network that are connected to the given buses.
+
+    Args:
+        session (Session): The SQLAlchemy session used for database operations.
+        name (str): The name of the network.
+        bus_names (Set[str]): The names of the buses.
+
+    Returns:
+        List: Tuples of (branch name, from bus name, to bus name).
+    """
+    rows = []
+    for chunk in _chunks(bus_names):
+        rows.extend(
+            session.query(BranchDB.name, BranchDB.from_bus_name, BranchDB.to_bus_name)
+            .join(network_branches, network_branches.c.branch_name == BranchDB.name)
+            .filter(
+                network_branches.c.network_name == name,
+                or_(BranchDB.from_bus_name.in_(chunk), BranchDB.to_bus_name.in_(chunk)),
+            )
+            .all()
+        )
+    return rows
+
+
+def save_results(
+    network: Network, session: Session, faults: Optional[List[str]] = None
+):
+    """
+    Save the Results of a Network to the database.
+
+    This function stores the results of the given faults (all faults with results by default)
+    for a network that has already been saved. Existing results of the same faults are replaced.
+
+    Args:
+        network (Network): The Network instance whose results are saved.
+        session (Session): The SQLAlchemy session used for database operations.
+        faults (Optional[List[str]], optional): The names of the faults whose results are saved.
+                                                Defaults to all faults with results.
+
+    Raises:
+        ValueError: If the network is not stored in the database or a fault has no results.
+        Exception: If there is an error during the database commit.
+    """
+    if not session.get(NetworkDB, network.name):
+        raise ValueError(
+            f"Network '{network.name}' not found. Save the network before its results."
+        )
+
+    if faults is None:
+        faults = list(network.results.keys())
+
+    for fault_name in faults:
+        if fault_name not in network.results:
+            raise ValueError(f"No results available for fault '{fault_name}'.")
+        result_db = ResultDB.from_pydantic(network.name, network.results[fault_name])
+        session.merge(result_db)
+
+    session.commit()
+
+
+def load_results(
+    name: str, session: Session, faults: Optional[List[str]] = None
+) -> Dict[str, Result]:
+    """
+    Load the stored Results of a Network from the database.
+
+    Args:
+        name (str): The name of the network.
+        session (Session): The SQLAlchemy session used for database operations.
+        faults (Optional[List[str]], optional): The names of the faults whose results are loaded.
+                                                Defaults to all stored results.
+
+    Returns:
+        Dict[str, Result]: A dictionary where keys are fault names and values are Result instances.
+
+    Raises:
+        ValueError: If the specified network does not exist in the database.
+    """
+    if not session.get(NetworkDB, name):
+        raise ValueError(f"Network '{name}' not found.")
+
+    query = session.query(ResultDB).filter(ResultDB.network_name == name)
+    if faults is not None:
+        query = query.filter(ResultDB.fault_name.in_(faults))
+    return {result_db.fault_name: result_db.to_pydantic() for result_db in query}
@@ -0,0 +1,58 @@
+# database/migrations.py
+
+"""
+Schema Migration Module.
+
+This module upgrades databases that were created by an earlier version of GroundInsight.
+`Base.metadata.create_all` only creates missing tables, it does not change tables that already
+exist. `upgrade_schema` therefore adds the columns and indexes that were introduced later to the
+existing tables. It is idempotent and is run every time a database session is started.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from groundinsight.models.database_models import Base
+
+
+def upgrade_schema(connection: Connection):
+    """
+    Add missing columns and indexes of the GroundInsight models to existing tables.
+
+    Only nullable columns without a default are added, so the existing rows stay valid. Such a
+    column, e.g. `networks.content_hash`, is NULL for rows that were written before the upgrade.
+
+    Args:
+        connection (Connection): An open connection to the database, within a transaction.
+
+    Raises:
+        RuntimeError: If a missing column cannot be added to an existing table.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {
+            column["name"] for column in inspector.get_columns(table.name)
+        }
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            if not column.nullable or column.primary_key or column.default is not None:
+                raise RuntimeError(
+                    f"Cannot add column '{table.name}.{column.name}' to the existing database."
+                )
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(
+                text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                )
+            )
+
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(connection)
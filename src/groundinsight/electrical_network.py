@@ -15,9 +15,15 @@ i - vector of current sources and the mutual copplings between current sources a
 """
 
 import numpy as np
-from typing import Dict, Optional
-from scipy.sparse import csc_matrix
+from typing import Any, Dict, Optional, Tuple
+from scipy.sparse import coo_matrix, csc_matrix
 from scipy.sparse.linalg import splu
+from groundinsight.profiling import stage
+from groundinsight.simulation.krylov import KRYLOV_OPTIONS, KrylovSolver
+from groundinsight.simulation.symbolic import SymbolicAnalysis
+from groundinsight.simulation.symmetric import SymmetricFactorization
+from groundinsight.simulation.transfer_impedance import TransferImpedanceCache
+from groundinsight.simulation.tree_solver import TreeFactorization, TreeTopology
 from groundinsight.models.core_models import (
     Network,
     Bus,
@@ -29,9 +35,102 @@ from groundinsight.models.core_models import (
     Result,
     ResultBus,
     ResultBranch,
+    ResultConvergence,
     ResultReductionFactor,
 )
 
+# The solvers of the admittance equations, see `ElectricalNetwork.__init__`
+SOLVERS = ("auto", "lu", "symmetric", "tree", "krylov")
+# The number of buses from which "auto" factorizes meshed networks with the symmetric ordering of
+# their sparsity pattern; below it, permuting the matrices costs more than the smaller fill-in saves
+_SYMMETRIC_MIN_BUSES = 100
+
+
+def admittance_entries(
+    network: Network, bus_indices: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the rows and columns of the elements that the buses and branches add to Y.
+
+    The bus admittances are on the diagonal, followed by the elements (from, to), (to, from),
+    (from, from) and (to, to) of each branch, so duplicates are summed in the same order as
+    element by element. The elements of the branches enter with the signs -1, -1, 1, 1.
+
+    Args:
+        network (Network): The network.
+        bus_indices (Dict[str, int]): The row and column of each bus.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The rows and columns of the buses and the branches in the
+                                       order of `network.buses` and `network.branches`.
+    """
+    bus_idx = np.array([bus_indices[name] for name in network.buses], dtype=int)
+    from_idx = np.array(
+        [bus_indices[branch.from_bus] for branch in network.branches.values()],
+        dtype=int,
+    )
+    to_idx = np.array(
+        [bus_indices[branch.to_bus] for branch in network.branches.values()], dtype=int
+    )
+    rows = np.concatenate(
+        [bus_idx, np.stack([from_idx, to_idx, from_idx, to_idx], axis=1).ravel()]
+    )
+    cols = np.concatenate(
+        [bus_idx, np.stack([to_idx, from_idx, from_idx, to_idx], axis=1).ravel()]
+    )
+    return rows, cols
+
+
+def admittance_matrices(
+    network: Network, bus_indices: Dict[str, int]
+) -> Dict[float, csc_matrix]:
+    """
+    Build the admittance matrices Y of a network for each of its frequencies.
+
+    The bus admittances are added to the diagonal, the admittances of the branches with a grounding
+    conductor to the diagonal and off-diagonal elements of the buses they connect.
+
+    Args:
+        network (Network): The network.
+        bus_indices (Dict[str, int]): The row and column of each bus.
+
+    Returns:
+        Dict[float, csc_matrix]: The sparse admittance matrices per frequency.
+    """
+    num_buses = len(bus_indices)
+    Y_matrices = {}
+    frequencies = network.frequencies
+    buses = list(network.buses.values())
+    branches = list(network.branches.values())
+    rows, cols = admittance_entries(network, bus_indices)
+    for freq in frequencies:
+        with stage("build.admittance", freq):
+            bus_admittances = np.zeros(len(buses), dtype=complex)
+            for k, bus in enumerate(buses):
+                impedance = bus.impedance.get(freq)
+                if impedance:
+                    bus_admittances[k] = 1 / complex(impedance.real, impedance.imag)
+
+            branch_admittances = np.zeros(len(branches), dtype=complex)
+            for k, branch in enumerate(branches):
+                impedance = branch.self_impedance.get(freq)
+                if impedance and branch.type.grounding_conductor:
+                    branch_admittances[k] = 1 / complex(impedance.real, impedance.imag)
+
+            signs = np.array([-1, -1, 1, 1])
+            data = np.concatenate(
+                [bus_admittances, (branch_admittances[:, None] * signs).ravel()]
+            )
+            # duplicate entries, e.g. of parallel branches, are summed
+            Y_matrix = coo_matrix(
+                (data, (rows, cols)), shape=(num_buses, num_buses)
+            ).tocsc()
+            Y_matrix.eliminate_zeros()
+
+        Y_matrices[freq] = Y_matrix
+
+    return Y_matrices
+
 
 class ElectricalNetwork:
     """
@@ -40,9 +139,24 @@ class ElectricalNetwork:
     This class handles the construction of admittance matrices, voltage and current vectors,
     and performs network analysis to compute results such as bus voltages, branch currents,
     reduction factors, and grounding impedances.
+
+    Radial networks, whose branches form a tree or a forest, are solved with a linear-time sweep
+    over all frequencies at once (see `groundinsight.simulation.tree_solver`). Meshed networks and
+    deep trees with few frequencies are solved with a sparse LU factorization per frequency.
+    The "symmetric" solver uses the symmetry of the matrices for an ordering with about half the
+    fill-in (see `groundinsight.simulation.symmetric`). The tree topology and the ordering depend
+    only on the sparsity pattern of the matrices, so they are computed once per pattern and reused
+    for all frequencies and faults (see `groundinsight.simulation.symbolic`). Very
+    large meshed networks can be solved iteratively instead (see `groundinsight.simulation.krylov`),
+    which needs far less memory than the LU factors.
     """
 
-    def __init__(self, network: Network):
+    def __init__(
+        self,
+        network: Network,
+        solver: str = "auto",
+        solver_options: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize the ElectricalNetwork with a given Network model.
 
@@ -50,8 +164,38 @@ class ElectricalNetwork:
 
         Args:
             network (Network): The Network instance containing buses, branches, sources, and faults.
+            solver (str, optional): "auto", "lu", "symmetric", "tree" or "krylov". "auto" uses the
+                                    tree solver for radial networks where it is faster than sparse
+                                    LU, the "symmetric" solver for meshed networks with 100 buses
+                                    or more, and sparse LU for all other networks. "symmetric" uses a
+                                    symmetric ordering and diagonal pivots for sparse LU. "krylov"
+                                    solves iteratively with an ILU preconditioner. Defaults to
+                                    "auto".
+            solver_options (Optional[Dict[str, Any]], optional): The options of the "krylov" solver:
+                                    "method" ("bicgstab" or "gmres"), "rtol", "maxiter", "drop_tol",
+                                    "fill_factor" and "on_failure" ("lu" or "raise"), see
+                                    `KrylovSolver`. Defaults to None.
+
+        Raises:
+            ValueError: If the solver or a solver option is unknown, or if the tree solver is
+                        requested for a meshed network.
         """
+        if solver not in SOLVERS:
+            raise ValueError(
+                f"Unknown solver '{solver}'. Choose one of {', '.join(SOLVERS)}."
+            )
+        solver_options = dict(solver_options or {})
+        if solver_options and solver != "krylov":
+            raise ValueError("Solver options are only used by the 'krylov' solver.")
+        unknown = [key for key in solver_options if key not in KRYLOV_OPTIONS]
+        if unknown:
+            raise ValueError(
+                f"Unknown solver options {unknown}. Choose from {', '.join(KRYLOV_OPTIONS)}."
+            )
         self.network = network
+        self.solver = solver
+        self.solver_options = solver_options
+        self.tree_topology: Optional[TreeTopology] = None  # set for radial networks
         self.bus_indices = {}
         self.Y_matrices = {}  # Admittance matrices for each frequency
         self.u_vectors = {}  # Voltage vectors for each frequency
@@ -61,8 +205,21 @@ class ElectricalNetwork:
         self.results: Result = Result()  # Stores the calculation results
         self.i_mutuals = {}  # Store mutual currents per frequency per branch
         self.total_source_currents = {}  # Store total source currents per frequency
+        # Source current coupled into each branch per frequency, i_mut = coupling * Z_mutual / Z_self
+        self.mutual_couplings = {}
+        self.factorizations = (
+            {}
+        )  # LU, tree or Krylov factorizations of the admittance matrices per frequency
+        self._tree_factorization: Optional[TreeFactorization] = None
+        # elimination order of the "symmetric" solver, shared by all frequencies
+        self.symmetric_ordering: Optional[np.ndarray] = None
+        # pattern-dependent parts of the factorizations, shared by the faults of the network
+        self.symbolic_analysis: Optional[SymbolicAnalysis] = None
+        self._transfer_impedances: Optional[TransferImpedanceCache] = None
 
         self._initialize()
+        # content hash of the network the matrices were built from, stored with the results
+        self.network_hash: str = network.content_hash
 
     def _initialize(self):
         """
@@ -74,6 +231,8 @@ class ElectricalNetwork:
         self._assign_bus_indices()
         self._assign_parallel_coefficients()
         self._construct_Y_matrices()
+        self._analyze_pattern()
+        self._detect_tree_topology()
         self._construct_vectors()
 
     def _assign_bus_indices(self):
@@ -142,33 +301,74 @@ class ElectricalNetwork:
 
         Builds the admittance matrix by adding bus admittances to the diagonal and branch
         admittances to the off-diagonal elements. Mutual admittances are also accounted for.
+        The matrices are stored as sparse CSC matrices, see `admittance_matrices`.
         """
-        frequencies = self.network.frequencies
-        for freq in frequencies:
-            Y_matrix = np.zeros((self.num_buses, self.num_buses), dtype=complex)
-            # add the bus admittances to the diagonal of the matrix
-            for bus_name, bus in self.network.buses.items():
-                idx = self.bus_indices[bus_name]
-                impedance = bus.impedance.get(freq)
-                if impedance:
-                    admittance = 1 / complex(impedance.real, impedance.imag)
-                    Y_matrix[idx, idx] += admittance
+        self.Y_matrices = admittance_matrices(self.network, self.bus_indices)
 
-            # Add branch admittances to Y_matrix
-            for branch in self.network.branches.values():
-                from_idx = self.bus_indices[branch.from_bus]
-                to_idx = self.bus_indices[branch.to_bus]
-                impedance = branch.self_impedance.get(freq)
-                if impedance and branch.type.grounding_conductor:
-                    admittance = 1 / complex(impedance.real, impedance.imag)
-                    # Off-diagonal elements
-                    Y_matrix[from_idx, to_idx] -= admittance
-                    Y_matrix[to_idx, from_idx] -= admittance
-                    # Diagonal elements
-                    Y_matrix[from_idx, from_idx] += admittance
-                    Y_matrix[to_idx, to_idx] += admittance
+    def _analyze_pattern(self):
+        """
+        Look up the symbolic analysis of the sparsity pattern of the admittance matrices.
 
-            self.Y_matrices[freq] = Y_matrix
+        The analysis is kept with the network and reused by the electrical networks of later
+        faults as long as the pattern does not change. `symbolic_analysis` stays None if the
+        pattern differs between frequencies, e.g. where an admittance vanishes at one frequency.
+        """
+        matrices = list(self.Y_matrices.values())
+        if not matrices or self.num_buses == 0:
+            return
+        analysis = self.network._symbolic_analysis
+        if analysis is None or not analysis.matches(matrices[0]):
+            analysis = SymbolicAnalysis(matrices[0])
+        if all(analysis.matches(matrix) for matrix in matrices[1:]):
+            self.symbolic_analysis = analysis
+            self.network._symbolic_analysis = analysis
+
+    @property
+    def transfer_impedances(self) -> TransferImpedanceCache:
+        """
+        The columns of the bus impedance matrix Z = Y^-1, computed on demand and cached.
+
+        The cache is created on first access with its default memory limit, which can be changed
+        through its `max_bytes` attribute.
+
+        Returns:
+            TransferImpedanceCache: The cache of this electrical network.
+
+        Examples:
+            >>> cache = network.electrical_network.transfer_impedances
+            >>> cache.impedance("bus3", "bus7", frequency=50)  # EPR at bus3 per A injected at bus7
+        """
+        if self._transfer_impedances is None:
+            self._transfer_impedances = TransferImpedanceCache(self)
+        return self._transfer_impedances
+
+    def _detect_tree_topology(self):
+        """
+        Detect whether the network can be solved with the tree solver.
+
+        Sets `tree_topology` if the branches of the admittance matrices form a tree or a forest and
+        the solver is "tree", or the solver is "auto" and the tree is not so deep that sparse LU is
+        faster, e.g. a long chain evaluated at a few frequencies.
+
+        Raises:
+            ValueError: If the tree solver is requested for a meshed network.
+        """
+        if self.solver in ("lu", "symmetric", "krylov") or self.num_buses == 0:
+            return
+        if self.symbolic_analysis is not None:
+            topology = self.symbolic_analysis.tree_topology()
+        else:
+            topology = TreeTopology.from_matrices(
+                list(self.Y_matrices.values()), self.num_buses
+            )
+        if topology is None and self.solver == "tree":
+            raise ValueError(
+                f"The tree solver cannot solve the meshed network '{self.network.name}'."
+            )
+        if self.solver == "auto" and topology is not None:
+            if not topology.is_efficient(len(self.network.frequencies)):
+                topology = None
+        self.tree_topology = topology
 
     def _construct_vectors(self):
         """
@@ -190,43 +390,47 @@ class ElectricalNetwork:
         paths_from_sources = self._get_paths_from_sources_to_fault()
 
         for freq in frequencies:
-            u_vector = np.zeros(self.num_buses, dtype=complex)
-            i_vector = np.zeros(self.num_buses, dtype=complex)
-            total_source_current = 0
-            source_currents = {}
-            # Initialize mutual currents dictionary for this frequency
-            self.i_mutuals[freq] = {}
-
-            # Iterate over the sources and add the source values to the current vector
-            for source_name, source in self.network.sources.items():
-                # Check if the source has a path to the fault
-                branches_in_paths = paths_from_sources.get(source_name)
-                if branches_in_paths:
-                    bus_idx = self.bus_indices[source.bus]
-                    scaling = fault.scalings.get(freq, 1)
-                    current = source.values.get(freq, 0)
-                    if current:
-                        current_complex = scaling * complex(current.real, current.imag)
-                        total_source_current += current_complex
-                        # Store the source current for mutual coupling calculations
-                        source_currents[source_name] = current_complex
-                        # Source injection into their buses
-                        i_vector[bus_idx] += current_complex
-                else:
-                    # Source does not have a path to the fault
-                    continue  # Do not include this source
+            with stage("build.vectors", freq):
+                u_vector = np.zeros(self.num_buses, dtype=complex)
+                i_vector = np.zeros(self.num_buses, dtype=complex)
+                total_source_current = 0
+                source_currents = {}
+                # Initialize mutual currents dictionary for this frequency
+                self.i_mutuals[freq] = {}
+                self.mutual_couplings[freq] = {}
+
+                # Iterate over the sources and add the source values to the current vector
+                for source_name, source in self.network.sources.items():
+                    # Check if the source has a path to the fault
+                    branches_in_paths = paths_from_sources.get(source_name)
+                    if branches_in_paths:
+                        bus_idx = self.bus_indices[source.bus]
+                        scaling = fault.scalings.get(freq, 1)
+                        current = source.values.get(freq, 0)
+                        if current:
+                            current_complex = scaling * complex(
+                                current.real, current.imag
+                            )
+                            total_source_current += current_complex
+                            # Store the source current for mutual coupling calculations
+                            source_currents[source_name] = current_complex
+                            # Source injection into their buses
+                            i_vector[bus_idx] += current_complex
+                    else:
+                        # Source does not have a path to the fault
+                        continue  # Do not include this source
 
-            # Inject the fault current into the fault bus
-            i_vector[fault_bus_idx] -= total_source_current
-            self.total_source_currents[freq] = total_source_current
+                # Inject the fault current into the fault bus
+                i_vector[fault_bus_idx] -= total_source_current
+                self.total_source_currents[freq] = total_source_current
 
-            # Include mutual currents
-            self._add_mutual_currents(
-                i_vector, freq, source_currents, paths_from_sources
-            )
+                # Include mutual currents
+                self._add_mutual_currents(
+                    i_vector, freq, source_currents, paths_from_sources
+                )
 
-            self.i_vectors[freq] = i_vector
-            self.u_vectors[freq] = u_vector
+                self.i_vectors[freq] = i_vector
+                self.u_vectors[freq] = u_vector
 
     def _construct_vectors_no_mutual(self):
         """
@@ -352,13 +556,10 @@ class ElectricalNetwork:
                         # check if the branch can carry current
                         if branch.type.grounding_conductor:
                             # Calculate mutual current
-                            i_mut = (
-                                sign
-                                * coefficient
-                                * i_source
-                                * (Z_mutual_complex / Z_self_complex)
-                            )
+                            coupling = sign * coefficient * i_source
+                            i_mut = coupling * (Z_mutual_complex / Z_self_complex)
                         else:
+                            coupling = 0
                             i_mut = 0
                         # Update i_vector with sign convention
                         i_vector[from_idx] += i_mut  # Negative at from_bus
@@ -368,8 +569,10 @@ class ElectricalNetwork:
                         # Accumulate if multiple sources contribute to mutual current
                         if branch.name in self.i_mutuals[freq]:
                             self.i_mutuals[freq][branch.name] += i_mut
+                            self.mutual_couplings[freq][branch.name] += coupling
                         else:
                             self.i_mutuals[freq][branch.name] = i_mut
+                            self.mutual_couplings[freq][branch.name] = coupling
 
     def solve_network(self):
         """
@@ -377,60 +580,213 @@ class ElectricalNetwork:
 
         This method computes the bus voltages by solving the admittance matrix equations for each frequency.
         The results are stored in the network's results object.
-        It uses the csc_matrix and splu functions from scipy, assuming the Y-Matrix is a sparse matrix.
+        Radial networks are solved for all frequencies at once with the tree solver, meshed networks
+        with the splu function from scipy. The factorizations are kept in `factorizations`.
         """
         fault_name = self.network.active_fault
         if fault_name is None:
             raise ValueError("No active fault set in the network.")
 
-        result = Result(buses=[], branches=[], fault=fault_name)
-        for freq in self.network.frequencies:
-            Y_matrix = self.Y_matrices[freq]
-            Y_matrix_sparse = csc_matrix(Y_matrix)
-            lu = splu(Y_matrix_sparse)
-            i_vector = self.i_vectors[freq]
-            try:
-                # Solve for u_vector
-                u_vector = lu.solve(i_vector)
-                self.u_vectors[freq] = u_vector
-            except np.linalg.LinAlgError as e:
-                print(f"Error solving network equations at frequency {freq}: {e}")
-                continue
+        result = Result(
+            buses=[],
+            branches=[],
+            fault=fault_name,
+            network_hash=self.network_hash,
+        )
+        self._factorize()
+        self.u_vectors.update(self._solve(self.i_vectors, "solve.linear"))
+        result.convergence = self._convergence()
 
         # Create ResultBus instances
-        for bus_name, idx in self.bus_indices.items():
-            uepr_freq = {}
-            ia_freq = {}
-            for freq in self.network.frequencies:
-                voltage = self.u_vectors[freq][idx]
-                bus = self.network.buses.get(bus_name)
-                impedance = bus.impedance.get(freq)
-                try:
-                    Z_self_complex = complex(impedance.real, impedance.imag)
-                    current = voltage / Z_self_complex
-                except ZeroDivisionError:
-                    current = 0
-
-                uepr_freq[freq] = ComplexNumber(real=voltage.real, imag=voltage.imag)
-                ia_freq[freq] = ComplexNumber(real=current.real, imag=current.imag)
-
-            # Calculate RMS values
-            rms_voltage = self._calculate_rms(uepr_freq)
-            rms_current = self._calculate_rms(ia_freq)
-
-            result_bus = ResultBus(
-                name=bus_name,
-                uepr=rms_voltage,
-                ia=rms_current,
-                uepr_freq=uepr_freq,
-                ia_freq=ia_freq,
-            )
-            result.buses.append(result_bus)
+        with stage("solve.results"):
+            for bus_name, idx in self.bus_indices.items():
+                uepr_freq = {}
+                ia_freq = {}
+                for freq in self.network.frequencies:
+                    voltage = self.u_vectors[freq][idx]
+                    bus = self.network.buses.get(bus_name)
+                    impedance = bus.impedance.get(freq)
+                    try:
+                        Z_self_complex = complex(impedance.real, impedance.imag)
+                        current = voltage / Z_self_complex
+                    except ZeroDivisionError:
+                        current = 0
+
+                    uepr_freq[freq] = ComplexNumber(
+                        real=voltage.real, imag=voltage.imag
+                    )
+                    ia_freq[freq] = ComplexNumber(real=current.real, imag=current.imag)
+
+                # Calculate RMS values
+                rms_voltage = self._calculate_rms(uepr_freq)
+                rms_current = self._calculate_rms(ia_freq)
+
+                result_bus = ResultBus(
+                    name=bus_name,
+                    uepr=rms_voltage,
+                    ia=rms_current,
+                    uepr_freq=uepr_freq,
+                    ia_freq=ia_freq,
+                )
+                result.buses.append(result_bus)
 
         # Store the result in the network's results dictionary
         self.network.results[fault_name] = result
         self.results = result  # Also keep a reference in self.results
 
+    def _factorize(self):
+        """
+        Factorize the admittance matrices of all frequencies.
+
+        Radial networks are factorized for all frequencies at once with the tree solver, meshed
+        networks with a sparse LU factorization per frequency. The symmetric factorization orders
+        the buses once per sparsity pattern, for all frequencies and faults, the "krylov" solver
+        computes an incomplete LU preconditioner per frequency instead.
+        """
+        frequencies = self.network.frequencies
+        if self._factorizes_symmetrically():
+            for freq in frequencies:
+                with stage("solve.factorize", freq):
+                    if self.symbolic_analysis is not None:
+                        factorization = self.symbolic_analysis.factorize(
+                            self.Y_matrices[freq]
+                        )
+                    else:
+                        factorization = SymmetricFactorization.factorize(
+                            self.Y_matrices[freq], self.symmetric_ordering
+                        )
+                self.symmetric_ordering = factorization.ordering
+                self.factorizations[freq] = factorization
+            return
+        if self.solver == "krylov":
+            for freq in frequencies:
+                with stage("solve.factorize", freq):
+                    self.factorizations[freq] = KrylovSolver(
+                        self.Y_matrices[freq], **self.solver_options
+                    )
+            return
+        if self.tree_topology is not None:
+            with stage("solve.factorize"):
+                factorization = TreeFactorization.factorize(
+                    self.tree_topology, [self.Y_matrices[freq] for freq in frequencies]
+                )
+            self.factorizations = {
+                freq: factorization.matrix(k) for k, freq in enumerate(frequencies)
+            }
+            self._tree_factorization = factorization
+            return
+        for freq in frequencies:
+            with stage("solve.factorize", freq):
+                self.factorizations[freq] = splu(self.Y_matrices[freq])
+
+    def _factorizes_symmetrically(self) -> bool:
+        """
+        Whether the admittance matrices are factorized with a symmetric ordering.
+
+        Returns:
+            bool: True for the "symmetric" solver, and for the "auto" solver if the network is
+                  meshed, has at least `_SYMMETRIC_MIN_BUSES` buses and one sparsity pattern for
+                  all frequencies, so the ordering is computed once.
+        """
+        if self.solver == "symmetric":
+            return True
+        return (
+            self.solver == "auto"
+            and self.tree_topology is None
+            and self.symbolic_analysis is not None
+            and self.num_buses >= _SYMMETRIC_MIN_BUSES
+        )
+
+    def _solve(self, vectors: Dict[float, np.ndarray], name: str):
+        """
+        Solve Y * u = i for the current vectors of all frequencies with the factorizations.
+
+        Args:
+            vectors (Dict[float, np.ndarray]): The current vectors per frequency.
+            name (str): The profiling stage of the solves.
+
+        Returns:
+            Dict[float, np.ndarray]: The voltage vectors per frequency. Frequencies whose equations
+                                     cannot be solved are missing.
+        """
+        frequencies = self.network.frequencies
+        if self.solver == "krylov":
+            return self._solve_iteratively(vectors, name)
+        if self.tree_topology is not None:
+            with stage(name):
+                i_matrix = np.stack([vectors[freq] for freq in frequencies], axis=1)
+                u_matrix = self._tree_factorization.solve(i_matrix)
+            return {freq: u_matrix[:, k] for k, freq in enumerate(frequencies)}
+
+        solutions = {}
+        for freq in frequencies:
+            with stage(name, freq):
+                try:
+                    solutions[freq] = self.factorizations[freq].solve(vectors[freq])
+                except np.linalg.LinAlgError as e:
+                    print(f"Error solving network equations at frequency {freq}: {e}")
+        return solutions
+
+    def _solve_iteratively(self, vectors: Dict[float, np.ndarray], name: str):
+        """
+        Solve Y * u = i iteratively, starting each frequency from the solution of the previous one.
+
+        The previous solution is scaled to the norm of the current vector, since the source
+        currents usually differ by orders of magnitude between the frequencies. Frequencies whose
+        iterations do not converge are solved with sparse LU, unless the "on_failure" option is
+        "raise".
+
+        Args:
+            vectors (Dict[float, np.ndarray]): The current vectors per frequency.
+            name (str): The profiling stage of the solves.
+
+        Returns:
+            Dict[float, np.ndarray]: The voltage vectors per frequency.
+
+        Raises:
+            RuntimeError: If the iterations do not converge and the "on_failure" option is "raise".
+        """
+        solutions = {}
+        previous, previous_norm = None, 0.0
+        for freq in self.network.frequencies:
+            solver = self.factorizations[freq]
+            fallbacks = solver.fallbacks
+            vector = vectors[freq]
+            norm = np.linalg.norm(vector)
+            x0 = previous * (norm / previous_norm) if previous_norm else None
+            with stage(name, freq):
+                solutions[freq] = solver.solve(vector, x0=x0)
+            if norm:
+                previous, previous_norm = solutions[freq], norm
+            if solver.fallbacks > fallbacks:
+                print(
+                    f"The {solver.method} solver did not converge at frequency {freq}: "
+                    f"relative residual {solver.residual:.3g} after {solver.iterations} "
+                    f"iterations. The equations were solved with sparse LU instead."
+                )
+        return solutions
+
+    def _convergence(self) -> Optional[Dict[float, ResultConvergence]]:
+        """
+        Collect the convergence statistics of the iterative solves per frequency.
+
+        Returns:
+            Optional[Dict[float, ResultConvergence]]: The statistics per frequency, or None if the
+                                                      equations are solved directly.
+        """
+        if self.solver != "krylov":
+            return None
+        return {
+            freq: ResultConvergence(
+                method=solver.method,
+                iterations=solver.iterations,
+                residual=solver.residual,
+                converged=solver.converged,
+                fallbacks=solver.fallbacks,
+            )
+            for freq, solver in self.factorizations.items()
+        }
+
     def compute_branch_currents(self):
         """
         Compute branch currents for each frequency and store them in the Result object.
@@ -537,20 +893,9 @@ class ElectricalNetwork:
         # Step 2: Create i_vectors without mutual currents
         self._construct_vectors_no_mutual()
         # Step 3: Solve network without mutual currents
-        self.u_vectors_no_mutual = {}
-        for freq in frequencies:
-            Y_matrix = self.Y_matrices[freq]
-            i_vector = self.i_vectors_no_mutual[freq]
-            try:
-                # Solve for u_vector without mutual currents
-                u_vector = np.linalg.solve(Y_matrix, i_vector)
-                self.u_vectors_no_mutual[freq] = u_vector
-
-            except np.linalg.LinAlgError as e:
-                print(
-                    f"Error solving network equations at frequency {freq} without mutual currents: {e}"
-                )
-                continue
+        self.u_vectors_no_mutual = self._solve(
+            self.i_vectors_no_mutual, "reduction_factors.linear"
+        )
 
         # Store uepr without mutual currents
         for freq in frequencies:
@@ -577,6 +922,7 @@ class ElectricalNetwork:
             fault_bus=fault_bus, value=reduction_factors
         )
         result.reduction_factor = result_reduction_factor
+        result.convergence = self._convergence()
 
         # Update the result in the network's results dictionary
         self.network.results[fault_name] = result
@@ -1,18 +1,34 @@
 # models/core_models.py
 
+import gc
+import hashlib
+import json
+from contextlib import contextmanager
 import numpy as np
 from pydantic import (
     BaseModel,
     PrivateAttr,
     computed_field,
+    field_serializer,
     field_validator,
     model_validator,
 )
-from typing import Optional, List, Dict
+from typing import ClassVar, Collection, Optional, List, Dict, Tuple, Union
 from sympy import lambdify, sympify, symbols
 from groundinsight.utils.validations import validate_impedance_formula_value
-from groundinsight.utils.impedance_calculator import compute_impedance
+from groundinsight.utils.impedance_calculator import (
+    compute_impedance,
+    compute_impedance_array,
+)
+from groundinsight.models.result_store import ResultStore
+from groundinsight.models.memory_report import network_memory_report
+from groundinsight.models.result_index import (
+    WORST_CASE_METRICS,
+    ResultSummary,
+    query_worst_cases,
+)
 import polars as pl
+from polars.io.plugins import register_io_source
 
 
 # data types
@@ -171,8 +187,68 @@ class ComplexNumber(BaseModel):
             raise TypeError(f"Cannot convert {type(value)} to ComplexNumber")
 
 
+class _HashedModel(BaseModel):
+    """
+    Base class of the models that enter the content hash of a network.
+
+    The digest of a model is cached until one of its fields is assigned. Values changed inside a
+    field, e.g. a single frequency of `values`, are only detected once the field is assigned again.
+
+    Attributes:
+        _digest (Optional[int]): The cached SHA-256 digest of the model as an integer.
+    """
+
+    _digest: Optional[int] = PrivateAttr(default=None)
+    _digest_exclude: ClassVar[Optional[set]] = None
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self.__pydantic_private__["_digest"] = None
+        super().__setattr__(name, value)
+
+    def model_copy(self, *, update=None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        copied._digest = None
+        return copied
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return super().__eq__(other)
+        # the cached digest does not take part in the comparison
+        private = {**self.__pydantic_private__, "_digest": None}
+        other_private = {**other.__pydantic_private__, "_digest": None}
+        return (
+            self.__dict__ == other.__dict__
+            and private == other_private
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+
+    def _digest_fields(self):
+        """
+        Returns the JSON-compatible fields of the model that enter its digest.
+        """
+        return self.model_dump(mode="json", exclude=self._digest_exclude)
+
+    def content_digest(self) -> int:
+        """
+        Calculates the stable hash of the model from its canonical JSON representation.
+
+        Returns:
+            int: The SHA-256 digest of the model as an integer, cached until a field is assigned.
+        """
+        # the private storage is read directly, the attribute lookup of pydantic is slow
+        digest = self.__pydantic_private__["_digest"]
+        if digest is None:
+            canonical = json.dumps(
+                self._digest_fields(), sort_keys=True, separators=(",", ":")
+            )
+            digest = int.from_bytes(hashlib.sha256(canonical.encode()).digest(), "big")
+            self.__pydantic_private__["_digest"] = digest
+        return digest
+
+
 # user interface
-class BusType(BaseModel):
+class BusType(_HashedModel):
     """
     Represents the type of a bus, including its default impedance formula.
 
@@ -198,7 +274,7 @@ class BusType(BaseModel):
         return f"BusType(name={self.name}, system_type={self.system_type}, voltage_level={self.voltage_level})"
 
 
-class Bus(BaseModel):
+class Bus(_HashedModel):
     """
     Represents a grounding bus within the network.
 
@@ -216,6 +292,12 @@ class Bus(BaseModel):
     impedance: Dict[float, ComplexNumber]
     specific_earth_resistance: float = 100.0
 
+    # the type enters the network hash on its own, so that changes of a shared type are detected
+    _digest_exclude: ClassVar[Optional[set]] = {"type"}
+
+    def _digest_fields(self):
+        return {**super()._digest_fields(), "type": self.type.name}
+
     def calculate_impedance(self, frequencies: List[float]):
         """
         Calculates impedance for each frequency using the impedance formula.
@@ -256,7 +338,7 @@ class Bus(BaseModel):
         )
 
 
-class BranchType(BaseModel):
+class BranchType(_HashedModel):
     """
     Represents the type of a branch, including its impedance formulas.
 
@@ -282,7 +364,7 @@ class BranchType(BaseModel):
         return f"BranchType(name={self.name}, grounding_conductor={self.grounding_conductor})"
 
 
-class Branch(BaseModel):
+class Branch(_HashedModel):
     """
     Represents a branch (conductor) connecting two buses within the network.
 
@@ -310,6 +392,12 @@ class Branch(BaseModel):
     specific_earth_resistance: float = 100.0
     parallel_coefficient: Optional[float] = None  # Default to None
 
+    # the type enters the network hash on its own, so that changes of a shared type are detected
+    _digest_exclude: ClassVar[Optional[set]] = {"type"}
+
+    def _digest_fields(self):
+        return {**super()._digest_fields(), "type": self.type.name}
+
     def calculate_impedance(self, frequencies: List[float]):
         """
         Calculates self and mutual impedance for each frequency using the impedance formula.
@@ -395,7 +483,7 @@ class Branch(BaseModel):
         return f"Branch(name={self.name}, from={self.from_bus}, to={self.to_bus})"
 
 
-class Fault(BaseModel):
+class Fault(_HashedModel):
     """
     Represents a fault within the network.
 
@@ -412,6 +500,7 @@ class Fault(BaseModel):
     bus: str  # Location of the fault
     scalings: Dict[float, float] = {}  # Scaling factors for sources
     _active: bool = PrivateAttr(default=False)
+    _digest_exclude: ClassVar[Optional[set]] = {"active"}
 
     @computed_field()
     @property
@@ -425,7 +514,7 @@ class Fault(BaseModel):
         return f"Fault(name={self.name}, bus={self.bus})"
 
 
-class Source(BaseModel):
+class Source(_HashedModel):
     """
     Represents a current source within the network.
 
@@ -523,6 +612,28 @@ class ResultGroundingImpedance(BaseModel):
         return f"ResultGroundingImpedance(name={self.name}, grounding_impedance={self.grounding_impedance})"
 
 
+class ResultConvergence(BaseModel):
+    """
+    Represents the convergence of the iterative solves of the network equations at one frequency.
+
+    Attributes:
+        method (str): The Krylov method.
+        iterations (int): The total number of iterations.
+        residual (float): The largest relative residual ||Y * u - i|| / ||i|| of the iterations.
+        converged (bool): Whether the iterations of all solves reached the tolerance.
+        fallbacks (int): The number of solves that did not converge and were solved with sparse LU.
+    """
+
+    method: str
+    iterations: int
+    residual: float
+    converged: bool
+    fallbacks: int = 0
+
+    def __str__(self):
+        return f"ResultConvergence(method={self.method}, iterations={self.iterations}, converged={self.converged})"
+
+
 class Result(BaseModel):
     """
     Represents the overall results of the network calculations.
@@ -533,6 +644,9 @@ class Result(BaseModel):
         reduction_factor (Optional[ResultReductionFactor]): The reduction factor result, if any.
         grounding_impedance (Optional[ResultGroundingImpedance]): The grounding impedance result, if any.
         fault (str): The name of the active fault.
+        network_hash (Optional[str]): The content hash of the network the result was calculated for.
+        convergence (Optional[Dict[float, ResultConvergence]]): The convergence of the iterative solver
+            per frequency, None if the equations were solved directly.
     """
 
     buses: List[ResultBus] = []
@@ -540,12 +654,16 @@ class Result(BaseModel):
     reduction_factor: Optional[ResultReductionFactor] = None
     grounding_impedance: Optional[ResultGroundingImpedance] = None
     fault: str = ""  # name of the fault that was active
+    network_hash: Optional[str] = None  # content hash of the calculated network
+    convergence: Optional[Dict[float, ResultConvergence]] = (
+        None  # iterative solver only
+    )
 
     def __str__(self):
         return f"Result(buses={len(self.buses)}, branches={len(self.branches)})"
 
 
-class Path(BaseModel):
+class Path(_HashedModel):
     """
     Represents the path between a source and a fault bus within the network.
 
@@ -563,10 +681,290 @@ class Path(BaseModel):
     fault: str
     segments: List[Branch] = []
 
+    def _digest_fields(self):
+        # the segments are hashed by name only, their content enters the hash through the branches
+        return [
+            self.name,
+            self.description,
+            self.source,
+            self.fault,
+            [segment.name for segment in self.segments],
+        ]
+
     def __str__(self):
         return f"Path(name={self.name}, source={self.source}, fault={self.fault})"
 
 
+# Sections of a network whose elements enter its content hash
+_HASHED_SECTIONS = ("buses", "branches", "faults", "sources", "paths")
+
+
+def _group_by_formula(elements: List[BaseModel], formula_field: str) -> Dict[str, list]:
+    """
+    Groups buses or branches by an impedance formula of their type.
+
+    Args:
+        elements (List[BaseModel]): The buses or branches.
+        formula_field (str): The formula field of the type, e.g. "impedance_formula".
+
+    Returns:
+        Dict[str, list]: The elements keyed by formula, in their original order.
+    """
+    groups = {}
+    for element in elements:
+        groups.setdefault(getattr(element.type, formula_field), []).append(element)
+    return groups
+
+
+def _complex_dicts(
+    values: np.ndarray, frequencies: List[float]
+) -> List[Dict[float, ComplexNumber]]:
+    """
+    Converts a complex array of shape (elements, frequencies) into impedance dictionaries.
+
+    The values are already validated floats, so the ComplexNumber instances are constructed
+    without running the validators.
+
+    Args:
+        values (np.ndarray): The complex values.
+        frequencies (List[float]): The frequencies of the columns.
+
+    Returns:
+        List[Dict[float, ComplexNumber]]: One dictionary of frequency to value per element.
+    """
+    construct = ComplexNumber.model_construct
+    with _gc_paused():
+        return [
+            {
+                freq: construct(real=real, imag=imag)
+                for freq, real, imag in zip(frequencies, reals, imags)
+            }
+            for reals, imags in zip(values.real.tolist(), values.imag.tolist())
+        ]
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the cyclic garbage collector while many objects are created.
+
+    Creating millions of models triggers a full collection again and again, although none of the
+    new objects is garbage. The previous state of the collector is restored afterwards.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _result_frame(
+    fault: str,
+    name_column: str,
+    names: List[str],
+    rms: Dict[str, List[float]],
+    phasors: Dict[Tuple[str, str], List[Dict[float, ComplexNumber]]],
+    columns: Optional[Collection[str]] = None,
+    frequencies: Optional[Collection[float]] = None,
+) -> pl.DataFrame:
+    """
+    Builds a typed result DataFrame with one row per element and frequency plus one RMS row per element.
+
+    All phasor dictionaries of an element have to share the frequencies of the first one. Magnitudes
+    and angles are computed on whole NumPy arrays, and the rows of each element are kept together
+    with the RMS row last.
+
+    Args:
+        fault (str): The name of the fault of the results.
+        name_column (str): The name of the column holding the element names.
+        names (List[str]): The element names.
+        rms (Dict[str, List[float]]): The RMS values per element keyed by their magnitude column.
+        phasors (Dict[Tuple[str, str], List[Dict[float, ComplexNumber]]]): The frequency-dependent values
+            per element keyed by their (magnitude, angle) columns.
+        columns (Optional[Collection[str]], optional): The magnitude and angle columns to compute. The
+            other ones are left out of the DataFrame. Defaults to all columns.
+        frequencies (Optional[Collection[float]], optional): The frequencies to build rows for. The RMS
+            rows are always built. Defaults to all frequencies.
+
+    Returns:
+        pl.DataFrame: The result DataFrame with the columns name, `fault`, `frequency_Hz`, `RMS` and the
+                      magnitude and angle columns.
+    """
+    first_phasors = next(iter(phasors.values()))
+    if frequencies is None:
+        element_freqs = first_phasors
+    else:
+        frequencies = set(frequencies)
+        element_freqs = [
+            [freq for freq in values if freq in frequencies] for values in first_phasors
+        ]
+    counts = np.fromiter((len(freqs) for freqs in element_freqs), dtype=np.int64)
+    n_elements = len(names)
+    n_freq_rows = int(counts.sum())
+
+    # rows of element i are its frequency rows followed by its RMS row
+    element_index = np.repeat(np.arange(n_elements), counts + 1)
+    is_rms = np.zeros(n_freq_rows + n_elements, dtype=bool)
+    is_rms[np.cumsum(counts + 1) - 1] = True
+
+    frequency_column = np.zeros(is_rms.shape)
+    frequency_column[~is_rms] = [freq for freqs in element_freqs for freq in freqs]
+
+    columns_data = {
+        name_column: pl.Series(names, dtype=pl.String).gather(element_index),
+        "frequency_Hz": frequency_column,
+        "RMS": is_rms,
+    }
+    rms_null_columns = ["frequency_Hz"]
+    for (magnitude_column, angle_column), element_values in phasors.items():
+        if columns is not None and not {magnitude_column, angle_column} & set(columns):
+            continue
+        flat_values = [
+            value
+            for freq_values, freqs in zip(element_values, element_freqs)
+            for value in (
+                freq_values.values()
+                if freq_values is freqs or list(freq_values) == list(freqs)
+                else [freq_values[freq] for freq in freqs]
+            )
+        ]
+        values = np.array(
+            [value.real for value in flat_values], dtype=float
+        ) + 1j * np.array([value.imag for value in flat_values], dtype=float)
+        magnitudes = np.empty(is_rms.shape)
+        magnitudes[~is_rms] = np.abs(values)
+        magnitudes[is_rms] = rms[magnitude_column]
+        angles = np.zeros(is_rms.shape)
+        angles[~is_rms] = np.angle(values, deg=True)
+        columns_data[magnitude_column] = magnitudes
+        columns_data[angle_column] = angles
+        rms_null_columns.append(angle_column)
+
+    # RMS rows have neither a frequency nor an angle
+    return pl.DataFrame(columns_data).select(
+        name_column,
+        pl.lit(fault, dtype=pl.String).alias("fault"),
+        *(
+            (
+                pl.when(pl.col("RMS"))
+                .then(None)
+                .otherwise(pl.col(column))
+                .alias(column)
+                if column in rms_null_columns
+                else pl.col(column)
+            )
+            for column in columns_data
+            if column != name_column
+        ),
+    )
+
+
+def _bus_result_frame(
+    fault: str,
+    result: Result,
+    columns: Optional[Collection[str]] = None,
+    frequencies: Optional[Collection[float]] = None,
+) -> pl.DataFrame:
+    """
+    Builds the bus result DataFrame of a fault.
+
+    Args:
+        fault (str): The name of the fault.
+        result (Result): The result of the fault.
+        columns (Optional[Collection[str]], optional): The value columns to compute. Defaults to all.
+        frequencies (Optional[Collection[float]], optional): The frequencies to build rows for.
+                                                             Defaults to all.
+
+    Returns:
+        pl.DataFrame: The bus result DataFrame.
+    """
+    return _result_frame(
+        fault=fault,
+        name_column="bus_name",
+        names=[result_bus.name for result_bus in result.buses],
+        rms={
+            "EPR_V": [result_bus.uepr for result_bus in result.buses],
+            "I_bus_A": [result_bus.ia for result_bus in result.buses],
+        },
+        phasors={
+            ("EPR_V", "EPR_degree"): [
+                result_bus.uepr_freq for result_bus in result.buses
+            ],
+            ("I_bus_A", "I_bus_degree"): [
+                result_bus.ia_freq for result_bus in result.buses
+            ],
+        },
+        columns=columns,
+        frequencies=frequencies,
+    )
+
+
+def _branch_result_frame(
+    fault: str,
+    result: Result,
+    columns: Optional[Collection[str]] = None,
+    frequencies: Optional[Collection[float]] = None,
+) -> pl.DataFrame:
+    """
+    Builds the branch result DataFrame of a fault.
+
+    Args:
+        fault (str): The name of the fault.
+        result (Result): The result of the fault.
+        columns (Optional[Collection[str]], optional): The value columns to compute. Defaults to all.
+        frequencies (Optional[Collection[float]], optional): The frequencies to build rows for.
+                                                             Defaults to all.
+
+    Returns:
+        pl.DataFrame: The branch result DataFrame.
+    """
+    return _result_frame(
+        fault=fault,
+        name_column="branch_name",
+        names=[result_branch.name for result_branch in result.branches],
+        rms={"I_branch_A": [result_branch.i_s for result_branch in result.branches]},
+        phasors={
+            ("I_branch_A", "I_branch_degree"): [
+                result_branch.i_s_freq for result_branch in result.branches
+            ]
+        },
+        columns=columns,
+        frequencies=frequencies,
+    )
+
+
+def _conjuncts(predicate: pl.Expr) -> List[pl.Expr]:
+    """
+    Splits a predicate into the expressions that are combined with `&` at its top level.
+
+    Args:
+        predicate (pl.Expr): The predicate.
+
+    Returns:
+        List[pl.Expr]: The conjuncts, or the predicate itself if it is not a conjunction.
+    """
+    inputs = predicate.meta.pop()
+    if len(inputs) == 2 and any(
+        (left & right).meta.eq(predicate)
+        for left, right in (inputs, inputs[::-1])
+    ):
+        return _conjuncts(inputs[0]) + _conjuncts(inputs[1])
+    return [predicate]
+
+
+_RESULT_FRAME_BUILDERS = {
+    "buses": _bus_result_frame,
+    "branches": _branch_result_frame,
+}
+
+_RESULT_FRAME_SCHEMAS = {
+    element: build_frame("", Result()).schema
+    for element, build_frame in _RESULT_FRAME_BUILDERS.items()
+}
+
+
 class Network(BaseModel):
     """
     Represents the entire electrical network.
@@ -579,10 +977,19 @@ class Network(BaseModel):
         branches (Dict[str, Branch]): A dictionary of branches in the network.
         faults (Dict[str, Fault]): A dictionary of faults in the network.
         sources (Dict[str, Source]): A dictionary of sources in the network.
-        results (Dict[str, Result]): A dictionary of results per fault.
+        results (Dict[str, Result]): A dictionary of results per fault, or a `ResultStore` with a memory
+            budget after `limit_result_memory` was called.
         paths (Dict[str, Path]): A dictionary of paths within the network.
         active_fault (Optional[str]): The name of the currently active fault.
+        content_hash (str): A stable hash over frequencies, buses, branches, their types, faults, sources
+            and paths.
         _electrical_network (Optional["ElectricalNetwork"]): A private attribute for the electrical network.
+        _result_summaries (Dict[str, Tuple[object, ResultSummary]]): Result magnitudes for worst-case queries
+            keyed by fault name, stored together with the Result (or ResultStore version) they summarize.
+        _unit_responses (Dict[str, UnitResponses]): The results per unit source current keyed by fault name,
+            stored by `run_fault(..., store_unit_responses=True)` for `rescale_sources`.
+        _symbolic_analysis (Optional[SymbolicAnalysis]): The tree topology and the symmetric ordering of
+            the sparsity pattern of the admittance matrices, shared by the electrical networks of all faults.
     """
 
     name: str
@@ -596,11 +1003,105 @@ class Network(BaseModel):
     paths: Dict[str, Path] = {}
     active_fault: Optional[str] = None  # Name of the active fault
     _electrical_network: Optional["ElectricalNetwork"] = PrivateAttr(default=None)
+    _result_summaries: Dict[str, Tuple[object, ResultSummary]] = PrivateAttr(
+        default_factory=dict
+    )
+    _unit_responses: Dict[str, "UnitResponses"] = PrivateAttr(default_factory=dict)
+    _symbolic_analysis: Optional["SymbolicAnalysis"] = PrivateAttr(default=None)
 
     @property
     def electrical_network(self):
         return self._electrical_network
 
+    @computed_field()
+    @property
+    def content_hash(self) -> str:
+        """
+        A stable SHA-256 hash over the frequencies, buses, branches, types, faults, sources and paths.
+
+        The hash does not depend on the insertion order of the elements, the active fault or
+        the results. It combines the cached digests of the elements and their types, which are
+        only calculated again after a field of the element or type was assigned.
+
+        Returns:
+            str: The hexadecimal content hash.
+        """
+        # the sum of the digests is independent of the element order
+        combined = 0
+        type_digests = set()
+        for section in _HASHED_SECTIONS:
+            for element in getattr(self, section).values():
+                combined += element.content_digest()
+                element_type = getattr(element, "type", None)
+                if element_type is not None:
+                    type_digests.add(element_type.content_digest())
+        combined = (combined + sum(type_digests)) % (1 << 256)
+
+        frequencies = json.dumps([float(freq) for freq in self.frequencies])
+        digest = hashlib.sha256()
+        digest.update(frequencies.encode())
+        digest.update(combined.to_bytes(32, "big"))
+        return digest.hexdigest()
+
+    def limit_result_memory(
+        self, max_bytes: Optional[int], spill_path: Optional[str] = None
+    ):
+        """
+        Limits the memory used by the results of the network.
+
+        The results are moved into a `ResultStore` that keeps at most `max_bytes` of results in memory
+        and spills the least recently used ones to a file on disk. Spilled results are loaded again
+        when they are accessed through `results[...]`, `res_buses` or `res_branches`. Results that are
+        modified in place have to be assigned to `results` again to be kept.
+
+        Args:
+            max_bytes (Optional[int]): The memory budget in bytes. If None, all results are loaded back
+                                       into a plain dictionary and the spill file is closed.
+            spill_path (Optional[str], optional): The path of the spill file. Defaults to a temporary file.
+
+        Raises:
+            ValueError: If max_bytes is not positive.
+
+        Examples:
+            >>> net.limit_result_memory(max_bytes=500 * 1024**2)
+            >>> for fault_name in net.faults:
+            ...     gi.run_fault(net, fault_name)
+        """
+        current = self.results
+        if max_bytes is None:
+            if isinstance(current, ResultStore):
+                self.results = dict(current.items())
+                current.close()
+            return
+        store = ResultStore(
+            max_bytes,
+            spill_path=spill_path,
+            results=current,
+        )
+        if isinstance(current, ResultStore):
+            current.close()
+        self.results = store
+
+    @field_serializer("results")
+    def _serialize_results(self, results: Dict[str, Result]) -> Dict[str, Result]:
+        # a ResultStore is serialized like a plain dictionary
+        return dict(results.items())
+
+    def is_result_current(self, fault: str) -> bool:
+        """
+        Checks whether the result of a fault was calculated for the current state of the network.
+
+        Args:
+            fault (str): The name of the fault.
+
+        Returns:
+            bool: True if a result exists and its network hash matches the current content hash.
+        """
+        result = self.results.get(fault)
+        if result is None or result.network_hash is None:
+            return False
+        return result.network_hash == self.content_hash
+
     @electrical_network.setter
     def electrical_network(self, value):
         self._electrical_network = value
@@ -721,6 +1222,99 @@ class Network(BaseModel):
         # Trigger impedance calculation when a branch is added
         branch.calculate_impedance(self.frequencies)
 
+    def add_buses(self, buses: List[Bus], overwrite: bool = False):
+        """
+        Adds many buses to the network at once.
+
+        This is the bulk counterpart of `add_bus`: the impedances of all buses of a bus type are
+        evaluated in one vectorized call instead of once per bus.
+
+        Args:
+            buses (List[Bus]): The bus instances to add.
+            overwrite (bool, optional): If True, overwrites existing buses with the same names. Defaults to False.
+
+        Raises:
+            ValueError: If a bus name is duplicated or already exists in the network and overwrite is False.
+        """
+        names = [bus.name for bus in buses]
+        if len(set(names)) != len(names):
+            raise ValueError("The buses to add contain duplicate names.")
+        if not overwrite:
+            existing = [name for name in names if name in self.buses]
+            if existing:
+                raise ValueError(
+                    f"Buses {existing[:5]} already exist in the network '{self.name}'. If you want to overwrite, set overwrite=True."
+                )
+
+        for formula, group in _group_by_formula(buses, "impedance_formula").items():
+            impedances = compute_impedance_array(
+                formula,
+                self.frequencies,
+                {"rho": [bus.specific_earth_resistance for bus in group]},
+            )
+            for bus, impedance in zip(
+                group, _complex_dicts(impedances, self.frequencies)
+            ):
+                bus.impedance = impedance
+
+        for bus in buses:
+            self.buses[bus.name] = bus
+
+    def add_branches(self, branches: List[Branch], overwrite: bool = False):
+        """
+        Adds many branches to the network at once.
+
+        This is the bulk counterpart of `add_branch`: the self and mutual impedances of all branches
+        of a branch type are evaluated in one vectorized call instead of once per branch.
+
+        Args:
+            branches (List[Branch]): The branch instances to add.
+            overwrite (bool, optional): If True, overwrites existing branches with the same names. Defaults to False.
+
+        Raises:
+            ValueError: If a branch name is duplicated or already exists and overwrite is False, or if
+                        connected buses are not in the network.
+        """
+        names = [branch.name for branch in branches]
+        if len(set(names)) != len(names):
+            raise ValueError("The branches to add contain duplicate names.")
+        if not overwrite:
+            existing = [name for name in names if name in self.branches]
+            if existing:
+                raise ValueError(
+                    f"Branches {existing[:5]} already exist in the network '{self.name}'. If you want to overwrite, set overwrite=True."
+                )
+        for branch in branches:
+            if branch.from_bus not in self.buses:
+                raise ValueError(
+                    f"from_bus '{branch.from_bus}' is not in the network '{self.name}'"
+                )
+            if branch.to_bus not in self.buses:
+                raise ValueError(
+                    f"to_bus '{branch.to_bus}' is not in the network '{self.name}'"
+                )
+
+        for attribute, formula_field in (
+            ("self_impedance", "self_impedance_formula"),
+            ("mutual_impedance", "mutual_impedance_formula"),
+        ):
+            for formula, group in _group_by_formula(branches, formula_field).items():
+                impedances = compute_impedance_array(
+                    formula,
+                    self.frequencies,
+                    {
+                        "rho": [branch.specific_earth_resistance for branch in group],
+                        "l": [branch.length for branch in group],
+                    },
+                )
+                for branch, impedance in zip(
+                    group, _complex_dicts(impedances, self.frequencies)
+                ):
+                    setattr(branch, attribute, impedance)
+
+        for branch in branches:
+            self.branches[branch.name] = branch
+
     def add_fault(self, fault: Fault, overwrite: bool = False):
         """
         Adds a fault to the network.
@@ -791,7 +1385,8 @@ class Network(BaseModel):
             fault (Optional[str], optional): The name of the fault. Defaults to None.
 
         Returns:
-            pl.DataFrame: A DataFrame containing bus results.
+            pl.DataFrame: A DataFrame containing bus results. Each bus has one row per frequency and
+                          one row with the RMS values, marked by the `RMS` column and a null frequency.
 
         Raises:
             ValueError: If no active fault is set or if results for the specified fault are unavailable.
@@ -804,46 +1399,7 @@ class Network(BaseModel):
         if fault not in self.results:
             raise ValueError(f"No results available for fault '{fault}'.")
 
-        result = self.results[fault]
-        data = []
-        for result_bus in result.buses:
-            # Add frequency-specific data
-            for freq, voltage in result_bus.uepr_freq.items():
-                current = result_bus.ia_freq.get(freq)
-                voltage_abs = abs(complex(voltage.real, voltage.imag))
-                current_abs = abs(complex(current.real, current.imag))
-                voltage_ang = (
-                    np.angle(complex(voltage.real, voltage.imag)) * 180 / np.pi
-                )
-                current_ang = (
-                    np.angle(complex(current.real, current.imag)) * 180 / np.pi
-                )
-                data.append(
-                    {
-                        "bus_name": result_bus.name,
-                        "fault": fault,
-                        "frequency_Hz": freq,
-                        "EPR_V": voltage_abs,
-                        "EPR_degree": voltage_ang,
-                        "I_bus_A": current_abs,
-                        "I_bus_degree": current_ang,
-                    }
-                )
-            # Add RMS values
-            data.append(
-                {
-                    "bus_name": result_bus.name,
-                    "fault": fault,
-                    "frequency_Hz": "RMS",
-                    "EPR_V": result_bus.uepr,
-                    "EPR_degree": None,
-                    "I_bus_A": result_bus.ia,
-                    "I_bus_degree": None,
-                }
-            )
-
-        df = pl.DataFrame(data)
-        return df
+        return _bus_result_frame(fault, self.results[fault])
 
     def res_branches(self, fault: Optional[str] = None) -> pl.DataFrame:
         """
@@ -855,7 +1411,8 @@ class Network(BaseModel):
             fault (Optional[str], optional): The name of the fault. Defaults to None.
 
         Returns:
-            pl.DataFrame: A DataFrame containing branch results.
+            pl.DataFrame: A DataFrame containing branch results. Each branch has one row per frequency and
+                          one row with the RMS current, marked by the `RMS` column and a null frequency.
 
         Raises:
             ValueError: If no active fault is set or if results for the specified fault are unavailable.
@@ -868,38 +1425,332 @@ class Network(BaseModel):
         if fault not in self.results:
             raise ValueError(f"No results available for fault '{fault}'.")
 
-        result = self.results[fault]
-        data = []
-        for result_branch in result.branches:
-            # Add frequency-specific data
-            for freq, current in result_branch.i_s_freq.items():
-                if current:
-                    current_abs = abs(complex(current.real, current.imag))
-                    current_ang = (
-                        np.angle(complex(current.real, current.imag)) * 180 / np.pi
-                    )
-                    data.append(
-                        {
-                            "branch_name": result_branch.name,
-                            "fault": fault,
-                            "frequency_Hz": freq,
-                            "I_branch_A": current_abs,
-                            "I_branch_degree": current_ang,
-                        }
-                    )
-            # Add RMS current
-            data.append(
-                {
-                    "branch_name": result_branch.name,
-                    "fault": fault,
-                    "frequency_Hz": "RMS",
-                    "I_branch_A": result_branch.i_s,
-                    "I_branch_degree": None,
-                }
+        return _branch_result_frame(fault, self.results[fault])
+
+    def results_lazy(
+        self, element: str = "buses", faults: Optional[List[str]] = None
+    ) -> pl.LazyFrame:
+        """
+        Returns the results of all faults as one Polars LazyFrame.
+
+        The frame has the columns of `res_buses` or `res_branches`, one fault after the other. The
+        frame of a fault is only built when the query is collected, and the query is pushed into
+        it: faults excluded by a filter on `fault` are not built at all, only the frequencies kept
+        by a filter on `frequency_Hz` or `RMS` get rows, only the selected magnitude and angle
+        columns are computed, and the filters are applied before the next fault is built. Nothing
+        is kept in memory besides `results`. Stored studies can be queried the same way with
+        `scan_results_arrow`.
+
+        Args:
+            element (str, optional): "buses" or "branches". Defaults to "buses".
+            faults (Optional[List[str]], optional): The names of the faults to include. Defaults to all
+                                                    faults with results.
+
+        Returns:
+            pl.LazyFrame: A LazyFrame over the bus or branch results of the faults.
+
+        Raises:
+            ValueError: If the element kind is unknown or a fault has no results.
+
+        Examples:
+            >>> max_epr = (
+            ...     net.results_lazy()
+            ...     .filter(pl.col("frequency_Hz") == 50)
+            ...     .group_by("bus_name")
+            ...     .agg(pl.col("EPR_V").max())
+            ...     .collect()
+            ... )
+        """
+        if element not in _RESULT_FRAME_BUILDERS:
+            raise ValueError(
+                f"Unknown result element '{element}'. Use 'buses' or 'branches'."
             )
+        if faults is None:
+            faults = list(self.results)
+        for fault in faults:
+            if fault not in self.results:
+                raise ValueError(f"No results available for fault '{fault}'.")
+
+        frequencies = [float(freq) for freq in self.frequencies]
+
+        def read_results(with_columns, predicate, n_rows, batch_size):
+            build_frame = _RESULT_FRAME_BUILDERS[element]
+            selected_faults = faults
+            selected_frequencies = None
+            columns = None
+            if with_columns is not None:
+                columns = set(with_columns)
+            if predicate is not None:
+                if columns is not None:
+                    columns.update(predicate.meta.root_names())
+                # conjuncts on the fault or the frequency select what is built at all
+                for conjunct in _conjuncts(predicate):
+                    roots = set(conjunct.meta.root_names())
+                    if roots == {"fault"}:
+                        selected_faults = (
+                            pl.DataFrame({"fault": selected_faults}, schema={"fault": pl.String})
+                            .filter(conjunct)["fault"]
+                            .to_list()
+                        )
+                    elif roots and roots <= {"frequency_Hz", "RMS"}:
+                        # the RMS rows are always built and filtered with the frame
+                        keys = pl.DataFrame(
+                            {"frequency_Hz": frequencies, "RMS": False},
+                            schema={"frequency_Hz": pl.Float64, "RMS": pl.Boolean},
+                        ).filter(conjunct)["frequency_Hz"]
+                        selected_frequencies = set(keys.to_list()) & (
+                            set(frequencies)
+                            if selected_frequencies is None
+                            else selected_frequencies
+                        )
+
+            # the faults are built one after the other, a spilled result is loaded only for its frame
+            for fault in selected_faults:
+                frame = build_frame(
+                    fault,
+                    self.results[fault],
+                    columns=columns,
+                    frequencies=selected_frequencies,
+                )
+                if predicate is not None:
+                    frame = frame.filter(predicate)
+                if with_columns is not None:
+                    frame = frame.select(with_columns)
+                if n_rows is not None:
+                    frame = frame.head(n_rows)
+                    n_rows -= frame.height
+                yield frame
+                if n_rows == 0:
+                    break
+
+        return register_io_source(read_results, schema=_RESULT_FRAME_SCHEMAS[element])
+
+    def _result_version(self, fault: str) -> object:
+        """
+        Returns an object that identifies the current result of a fault without loading it.
 
-        df = pl.DataFrame(data)
-        return df
+        Args:
+            fault (str): The name of the fault.
+
+        Returns:
+            object: The ResultStore version token, or the Result itself for a plain dictionary.
+        """
+        if isinstance(self.results, ResultStore):
+            return self.results.version(fault)
+        return self.results[fault]
+
+    def update_result_index(self, fault: str) -> ResultSummary:
+        """
+        Updates the worst-case index with the current result of a fault.
+
+        `run_fault` calls this after each fault is solved. The index is also brought up to date by
+        `worst_cases`, so calling it directly is only needed to spread the work over a sweep.
+
+        Args:
+            fault (str): The name of the fault.
+
+        Returns:
+            ResultSummary: The magnitudes of the fault result.
+
+        Raises:
+            ValueError: If results for the fault are unavailable.
+        """
+        if fault not in self.results:
+            raise ValueError(f"No results available for fault '{fault}'.")
+        version = self._result_version(fault)
+        cached = self._result_summaries.get(fault)
+        if cached is not None and cached[0] is version:
+            return cached[1]
+        summary = ResultSummary(self.results[fault], self.frequencies)
+        self._result_summaries[fault] = (version, summary)
+        return summary
+
+    def worst_cases(
+        self,
+        metric: str = "uepr",
+        k: Optional[int] = 50,
+        frequency: Optional[float] = None,
+        threshold: Optional[float] = None,
+        per: Optional[str] = None,
+        faults: Optional[List[str]] = None,
+    ) -> pl.DataFrame:
+        """
+        Returns the largest values of a result metric over all faults.
+
+        The query runs on per-fault summaries of the result magnitudes that are maintained as each
+        fault is solved, and faults whose maximum cannot enter the answer are skipped.
+
+        Args:
+            metric (str, optional): "uepr" (bus EPR), "ia" (bus current) or "i_s" (branch current).
+                                    Defaults to "uepr".
+            k (Optional[int], optional): The maximum number of rows. None returns all rows. Defaults to 50.
+            frequency (Optional[float], optional): The frequency of the values. None uses the RMS values.
+                                                   Defaults to None.
+            threshold (Optional[float], optional): Only values greater than or equal to the threshold are
+                                                   returned, e.g. the permissible touch voltage. Defaults to None.
+            per (Optional[str], optional): None returns every fault and element pair, "fault" the worst
+                                           element of each fault and "element" the worst fault of each
+                                           element. Defaults to None.
+            faults (Optional[List[str]], optional): The names of the faults to consider. Defaults to all
+                                                    faults with results.
+
+        Returns:
+            pl.DataFrame: A DataFrame with the columns `fault`, `bus_name` or `branch_name`, `frequency_Hz`
+                          and `value`, sorted by descending value.
+
+        Raises:
+            ValueError: If the metric or `per` is unknown or a fault has no results.
+
+        Examples:
+            >>> # buses and faults above a permissible touch voltage of 80 V
+            >>> net.worst_cases(metric="uepr", k=None, threshold=80.0)
+            >>> # the worst fault for each bus at 50 Hz
+            >>> net.worst_cases(metric="uepr", k=None, frequency=50, per="element")
+        """
+        if metric not in WORST_CASE_METRICS:
+            raise ValueError(
+                f"Unknown metric '{metric}'. Use one of {list(WORST_CASE_METRICS)}."
+            )
+        if per not in (None, "fault", "element"):
+            raise ValueError(
+                f"Unknown value '{per}' for per. Use 'fault' or 'element'."
+            )
+        if faults is None:
+            faults = list(self.results)
+
+        # drop summaries of results that were removed
+        for fault in [
+            fault for fault in self._result_summaries if fault not in self.results
+        ]:
+            del self._result_summaries[fault]
+
+        summaries = {fault: self.update_result_index(fault) for fault in faults}
+        return query_worst_cases(summaries, metric, k, frequency, threshold, per)
+
+    def memory_report(self) -> pl.DataFrame:
+        """
+        Estimates the memory held by the parts of the network.
+
+        The report has one row per component: the buses, branches, faults, sources and paths, the
+        arrays of the electrical network of the last calculation (`Y_matrices`, `u_vectors`,
+        `i_vectors`, ...), one row per fault result and the cached result DataFrames and worst-case
+        summaries. Arrays are reported with their exact sizes, models with sizes estimated from their
+        counts, so the report is cheap enough to be logged after every fault of a sweep.
+
+        Returns:
+            pl.DataFrame: A DataFrame with the columns `component`, `name` (the fault of a result row,
+                          null otherwise), `count` and `bytes`.
+
+        Examples:
+            >>> report = net.memory_report()
+            >>> report.group_by("component").agg(pl.col("bytes").sum()).sort("bytes", descending=True)
+            >>> total_bytes = report["bytes"].sum()
+        """
+        return network_memory_report(self)
+
+    def reduce(
+        self, keep_buses: List[str], name: Optional[str] = None, tolerance: float = 0.0
+    ) -> "Network":
+        """
+        Builds an equivalent network of some of the buses by eliminating all other buses.
+
+        The other buses are eliminated by Kron reduction (a Schur complement of the admittance
+        matrix per frequency). The equivalent network has the kept buses, the branches between
+        them and the sources and faults at them. The eliminated buses are replaced by a new earth
+        impedance of each kept bus and equivalent branches between the kept buses, with formulas
+        that tabulate their values at the frequencies of the network. For currents injected at the
+        kept buses, the equivalent network has the same bus voltages and currents at the kept
+        buses as this network, but mutual currents induced in eliminated branches are not
+        represented. Large external grids can be reduced once to their boundary buses and
+        attached to the networks of repeated studies.
+
+        Args:
+            keep_buses (List[str]): The names of the kept buses. All buses with sources and faults
+                                    must be kept.
+            name (Optional[str], optional): The name of the equivalent network. Defaults to the
+                                            name of this network with the suffix "_reduced".
+            tolerance (float, optional): Equivalent branches whose admittance is at most
+                                         `tolerance` times the largest equivalent branch admittance
+                                         at all frequencies are left out. Defaults to 0.0.
+
+        Returns:
+            Network: The equivalent network.
+
+        Raises:
+            ValueError: If the kept buses are invalid, if a source or fault is at an eliminated
+                        bus, or if a part of the eliminated buses has no connection to earth.
+
+        Examples:
+            >>> boundary = ["bus1", "bus40"]
+            >>> equivalent = external_grid.reduce(keep_buses=boundary)
+            >>> gi.run_fault(equivalent, "fault1")
+        """
+        from groundinsight.simulation.reduction import reduce_network
+
+        return reduce_network(self, keep_buses, name=name, tolerance=tolerance)
+
+    def reduced_admittance(self, keep_buses: List[str]) -> Dict[float, np.ndarray]:
+        """
+        Computes the admittance matrices of the network seen from some of its buses.
+
+        All other buses are eliminated by Kron reduction, see `reduce`.
+
+        Args:
+            keep_buses (List[str]): The names of the kept buses.
+
+        Returns:
+            Dict[float, np.ndarray]: The dense reduced admittance matrix per frequency, with rows
+                                     and columns in the order of `keep_buses`.
+
+        Raises:
+            ValueError: If the kept buses are invalid, or if a part of the eliminated buses has no
+                        connection to earth.
+        """
+        from groundinsight.simulation.reduction import reduced_admittance
+
+        return reduced_admittance(self, keep_buses)
+
+    def rescale_sources(
+        self,
+        sources: Optional[Dict[str, Union[complex, Dict[float, complex]]]] = None,
+        scalings: Optional[Dict[str, Dict[float, float]]] = None,
+    ) -> List[str]:
+        """
+        Changes source values and fault scalings and updates the results without a new calculation.
+
+        The sources only enter the network equations through the current vector, so the results of
+        a fault are linear combinations of its results per unit current of each source. Faults run
+        with `run_fault(..., store_unit_responses=True)` keep these unit responses, and their
+        results are rebuilt from them for the new source values and scalings in a few
+        milliseconds. The results of other faults are outdated afterwards.
+
+        Args:
+            sources (Optional[Dict[str, Union[complex, Dict[float, complex]]]], optional): A factor per
+                source name that multiplies all its values, or a dictionary of new values per
+                frequency that replaces the values of these frequencies. Defaults to None.
+            scalings (Optional[Dict[str, Dict[float, float]]], optional): The new scalings per fault
+                name. Defaults to None.
+
+        Returns:
+            List[str]: The names of the faults whose results were updated.
+
+        Raises:
+            ValueError: If no unit responses are stored, if the network changed since they were
+                        calculated, or if a source, fault or frequency is unknown.
+
+        Examples:
+            >>> for fault_name in net.faults:
+            ...     gi.run_fault(net, fault_name, store_unit_responses=True)
+            >>> # new short-circuit currents of source1 and a new scaling of fault1
+            >>> net.rescale_sources(
+            ...     sources={"source1": {50: 1200.0, 250: 80.0}},
+            ...     scalings={"fault1": {50: 0.9, 250: 1.0}},
+            ... )
+            >>> net.rescale_sources(sources={"source2": 1.1})  # 10 % more current at all frequencies
+        """
+        from groundinsight.simulation.superposition import rescale_sources
+
+        return rescale_sources(self, sources=sources, scalings=scalings)
 
     def res_all_impedances(self) -> pl.DataFrame:
         """
@@ -32,6 +32,7 @@ from .core_models import (
     Source,
     Path,
     Network,
+    Result,
 )
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -67,9 +68,9 @@ class BusTypeDB(Base):
 
     __tablename__ = "bus_types"
 
-    name = Column(String, primary_key=True)
+    name = Column(String(255), primary_key=True)
     description = Column(Text, nullable=True)
-    system_type = Column(String, nullable=False)
+    system_type = Column(String(255), nullable=False)
     voltage_level = Column(Float, nullable=False)
     impedance_formula = Column(Text, nullable=False)
 
@@ -102,9 +103,9 @@ class BusDB(Base):
 
     __tablename__ = "buses"
 
-    name = Column(String, primary_key=True)
+    name = Column(String(255), primary_key=True)
     description = Column(Text, nullable=True)
-    type_name = Column(String, ForeignKey("bus_types.name"))
+    type_name = Column(String(255), ForeignKey("bus_types.name"), index=True)
     specific_earth_resistance = Column(Float, default=100.0)
     impedance = Column(
         JSON
@@ -161,7 +162,7 @@ class BranchTypeDB(Base):
 
     __tablename__ = "branch_types"
 
-    name = Column(String, primary_key=True)
+    name = Column(String(255), primary_key=True)
     description = Column(Text, nullable=True)
     grounding_conductor = Column(Boolean, nullable=False)
     self_impedance_formula = Column(Text, nullable=False)
@@ -197,12 +198,12 @@ class BranchDB(Base):
 
     __tablename__ = "branches"
 
-    name = Column(String, primary_key=True)
+    name = Column(String(255), primary_key=True)
     description = Column(Text, nullable=True)
-    type_name = Column(String, ForeignKey("branch_types.name"))
+    type_name = Column(String(255), ForeignKey("branch_types.name"), index=True)
     length = Column(Float, nullable=False)
-    from_bus_name = Column(String, ForeignKey("buses.name"))
-    to_bus_name = Column(String, ForeignKey("buses.name"))
+    from_bus_name = Column(String(255), ForeignKey("buses.name"), index=True)
+    to_bus_name = Column(String(255), ForeignKey("buses.name"), index=True)
     self_impedance = Column(JSON)
     mutual_impedance = Column(JSON)
     specific_earth_resistance = Column(Float, default=100.0)
@@ -289,9 +290,9 @@ class FaultDB(Base):
 
     __tablename__ = "faults"
 
-    name = Column(String, primary_key=True)
+    name = Column(String(255), primary_key=True)
     description = Column(Text, nullable=True)
-    bus_name = Column(String, ForeignKey("buses.name"))
+    bus_name = Column(String(255), ForeignKey("buses.name"), index=True)
     scalings = Column(JSON, nullable=False)
     active = Column(Boolean, default=False)
 
@@ -331,9 +332,9 @@ class SourceDB(Base):
 
     __tablename__ = "sources"
 
-    name = Column(String, primary_key=True)
+    name = Column(String(255), primary_key=True)
     description = Column(Text, nullable=True)
-    bus_name = Column(String, ForeignKey("buses.name"))
+    bus_name = Column(String(255), ForeignKey("buses.name"), index=True)
     values = Column(JSON, nullable=False)
 
     bus = relationship("BusDB", backref="sources")
@@ -375,8 +376,14 @@ class SourceDB(Base):
 path_segments = Table(
     "path_segments",
     Base.metadata,
-    Column("path_name", String, ForeignKey("paths.name")),
-    Column("branch_name", String, ForeignKey("branches.name")),
+    Column("path_name", String(255), ForeignKey("paths.name"), primary_key=True),
+    Column(
+        "branch_name",
+        String(255),
+        ForeignKey("branches.name"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 
@@ -390,10 +397,10 @@ class PathDB(Base):
 
     __tablename__ = "paths"
 
-    name = Column(String, primary_key=True)
+    name = Column(String(255), primary_key=True)
     description = Column(Text, nullable=True)
-    source_name = Column(String, ForeignKey("sources.name"))
-    fault_name = Column(String, ForeignKey("faults.name"))
+    source_name = Column(String(255), ForeignKey("sources.name"), index=True)
+    fault_name = Column(String(255), ForeignKey("faults.name"), index=True)
 
     source = relationship("SourceDB", backref="paths")
     fault = relationship("FaultDB", backref="paths")
@@ -423,36 +430,62 @@ class PathDB(Base):
 network_buses = Table(
     "network_buses",
     Base.metadata,
-    Column("network_name", String, ForeignKey("networks.name")),
-    Column("bus_name", String, ForeignKey("buses.name")),
+    Column("network_name", String(255), ForeignKey("networks.name"), primary_key=True),
+    Column(
+        "bus_name", String(255), ForeignKey("buses.name"), primary_key=True, index=True
+    ),
 )
 
 network_branches = Table(
     "network_branches",
     Base.metadata,
-    Column("network_name", String, ForeignKey("networks.name")),
-    Column("branch_name", String, ForeignKey("branches.name")),
+    Column("network_name", String(255), ForeignKey("networks.name"), primary_key=True),
+    Column(
+        "branch_name",
+        String(255),
+        ForeignKey("branches.name"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 network_faults = Table(
     "network_faults",
     Base.metadata,
-    Column("network_name", String, ForeignKey("networks.name")),
-    Column("fault_name", String, ForeignKey("faults.name")),
+    Column("network_name", String(255), ForeignKey("networks.name"), primary_key=True),
+    Column(
+        "fault_name",
+        String(255),
+        ForeignKey("faults.name"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 network_sources = Table(
     "network_sources",
     Base.metadata,
-    Column("network_name", String, ForeignKey("networks.name")),
-    Column("source_name", String, ForeignKey("sources.name")),
+    Column("network_name", String(255), ForeignKey("networks.name"), primary_key=True),
+    Column(
+        "source_name",
+        String(255),
+        ForeignKey("sources.name"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 network_paths = Table(
     "network_paths",
     Base.metadata,
-    Column("network_name", String, ForeignKey("networks.name")),
-    Column("path_name", String, ForeignKey("paths.name")),
+    Column("network_name", String(255), ForeignKey("networks.name"), primary_key=True),
+    Column(
+        "path_name",
+        String(255),
+        ForeignKey("paths.name"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 
@@ -462,15 +495,16 @@ class NetworkDB(Base):
 
     Represents a Network in the database, including its properties and associated components
     such as buses, branches, faults, sources, and paths. It also tracks the active fault within
-    the network.
+    the network and the content hash of the saved network.
     """
 
     __tablename__ = "networks"
 
-    name = Column(String, primary_key=True)
+    name = Column(String(255), primary_key=True)
     description = Column(Text, nullable=True)
     frequencies = Column(PickleType)  # Store list of frequencies
-    active_fault_name = Column(String, ForeignKey("faults.name"), nullable=True)
+    active_fault_name = Column(String(255), ForeignKey("faults.name"), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # Network.content_hash when saved
 
     # Relationships
     buses = relationship("BusDB", secondary=network_buses, backref="networks")
@@ -479,6 +513,9 @@ class NetworkDB(Base):
     sources = relationship("SourceDB", secondary=network_sources, backref="networks")
     paths = relationship("PathDB", secondary=network_paths, backref="networks")
     active_fault = relationship("FaultDB", foreign_keys=[active_fault_name])
+    results = relationship(
+        "ResultDB", back_populates="network", cascade="all, delete-orphan"
+    )
 
     def to_pydantic(self):
         return Network(
@@ -500,4 +537,33 @@ class NetworkDB(Base):
             description=network.description,
             frequencies=network.frequencies,
             active_fault_name=network.active_fault,
+            content_hash=network.content_hash,
+        )
+
+
+class ResultDB(Base):
+    """
+    ResultDB Model.
+
+    Represents the Result of one fault calculation of a Network in the database. The result
+    is stored as a JSON document and is deleted together with its network.
+    """
+
+    __tablename__ = "results"
+
+    network_name = Column(String(255), ForeignKey("networks.name"), primary_key=True)
+    fault_name = Column(String(255), primary_key=True)
+    data = Column(JSON, nullable=False)
+
+    network = relationship("NetworkDB", back_populates="results")
+
+    def to_pydantic(self):
+        return Result.model_validate(self.data)
+
+    @classmethod
+    def from_pydantic(cls, network_name: str, result: Result):
+        return cls(
+            network_name=network_name,
+            fault_name=result.fault,
+            data=result.model_dump(mode="json"),
         )
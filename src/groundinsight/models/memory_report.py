@@ -0,0 +1,275 @@
+# models/memory_report.py
+
+"""
+Memory Report Module.
+
+This module estimates the memory held by the parts of a network: the element models, the paths,
+the matrices, vectors and factorizations of its `ElectricalNetwork`, the fault results and the
+caches built from them. The estimates are computed from element counts and array sizes instead of walking the object
+graph, so a report costs little more than a pass over the paths and can be logged after every
+fault of a sweep.
+
+NumPy and SciPy arrays are reported with their exact buffer sizes. Pydantic models are reported
+with per-object sizes measured with tracemalloc, assuming one value per network frequency.
+"""
+
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import numpy as np
+import polars as pl
+from groundinsight.models.result_store import (
+    _BYTES_PER_VALUE,
+    ResultStore,
+    estimate_result_size,
+    result_size,
+)
+
+if TYPE_CHECKING:
+    from groundinsight.models.core_models import Network
+
+# Approximate memory of the models without their frequency values, including the dictionary entry
+# that holds them in the network, measured with tracemalloc
+_BYTES_PER_BUS = 800
+_BYTES_PER_BRANCH = 1650
+_BYTES_PER_FAULT = 700
+_BYTES_PER_SCALING = 100
+_BYTES_PER_SOURCE = 700
+_BYTES_PER_PATH = 900
+_BYTES_PER_SEGMENT = 8  # a reference to a branch of the network
+_BYTES_PER_MUTUAL_CURRENT = 150
+_BYTES_PER_INDEX = 4  # row indices and permutations of sparse LU factors
+
+# Attributes of an ElectricalNetwork that hold one array per frequency
+ELECTRICAL_NETWORK_ARRAYS = [
+    "Y_matrices",
+    "u_vectors",
+    "i_vectors",
+    "u_vectors_no_mutual",
+    "i_vectors_no_mutual",
+]
+
+Row = Tuple[str, Optional[str], int, int]
+
+
+def array_bytes(value) -> int:
+    """
+    Returns the size of the buffers of a NumPy array or SciPy sparse matrix.
+
+    Args:
+        value: The array or matrix.
+
+    Returns:
+        int: The size in bytes, or 0 for other objects.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    # SciPy sparse matrices in compressed or coordinate format
+    size = 0
+    for attribute in ("data", "indices", "indptr", "row", "col"):
+        buffer = getattr(value, attribute, None)
+        if isinstance(buffer, np.ndarray):
+            size += buffer.nbytes
+    return size
+
+
+def factorization_bytes(lu) -> int:
+    """
+    Returns the approximate size of a sparse LU factorization of a complex matrix.
+
+    Args:
+        lu (scipy.sparse.linalg.SuperLU): The factorization, or a factorization that reports its
+                                          size with `nbytes`, e.g. a `TreeFactorization`.
+
+    Returns:
+        int: The size of the values and indices of the factors and of the permutations in bytes.
+    """
+    if hasattr(lu, "nbytes"):
+        return lu.nbytes
+    n = lu.shape[0]
+    return (
+        lu.nnz * (np.dtype(complex).itemsize + _BYTES_PER_INDEX)
+        + 3 * n * _BYTES_PER_INDEX
+    )
+
+
+def network_memory_report(network: "Network") -> pl.DataFrame:
+    """
+    Estimates the memory held by the parts of a network.
+
+    See `Network.memory_report`.
+
+    Args:
+        network (Network): The network.
+
+    Returns:
+        pl.DataFrame: The report with the columns `component`, `name`, `count` and `bytes`.
+    """
+    n_freq = len(network.frequencies)
+    rows: List[Row] = [
+        (
+            "buses",
+            None,
+            len(network.buses),
+            len(network.buses) * (_BYTES_PER_BUS + n_freq * _BYTES_PER_VALUE),
+        ),
+        (
+            "branches",
+            None,
+            len(network.branches),
+            len(network.branches) * (_BYTES_PER_BRANCH + 2 * n_freq * _BYTES_PER_VALUE),
+        ),
+        (
+            "faults",
+            None,
+            len(network.faults),
+            sum(
+                _BYTES_PER_FAULT + len(fault.scalings) * _BYTES_PER_SCALING
+                for fault in network.faults.values()
+            ),
+        ),
+        (
+            "sources",
+            None,
+            len(network.sources),
+            len(network.sources) * (_BYTES_PER_SOURCE + n_freq * _BYTES_PER_VALUE),
+        ),
+        ("paths", None, len(network.paths), _paths_bytes(network, n_freq)),
+    ]
+
+    electrical_network = network._electrical_network
+    if electrical_network is not None:
+        for attribute in ELECTRICAL_NETWORK_ARRAYS:
+            arrays = getattr(electrical_network, attribute, None) or {}
+            rows.append(
+                (
+                    attribute,
+                    None,
+                    len(arrays),
+                    sum(array_bytes(array) for array in arrays.values()),
+                )
+            )
+        factorizations = getattr(electrical_network, "factorizations", None) or {}
+        rows.append(
+            (
+                "factorizations",
+                None,
+                len(factorizations),
+                sum(factorization_bytes(lu) for lu in factorizations.values()),
+            )
+        )
+        transfer_impedances = getattr(electrical_network, "_transfer_impedances", None)
+        if transfer_impedances is not None:
+            rows.append(
+                (
+                    "transfer_impedances",
+                    None,
+                    len(transfer_impedances),
+                    transfer_impedances.nbytes,
+                )
+            )
+        i_mutuals = getattr(electrical_network, "i_mutuals", None) or {}
+        n_mutuals = sum(len(currents) for currents in i_mutuals.values())
+        rows.append(
+            ("i_mutuals", None, n_mutuals, n_mutuals * _BYTES_PER_MUTUAL_CURRENT)
+        )
+
+    symbolic_analysis = network._symbolic_analysis
+    if symbolic_analysis is not None:
+        rows.append(("symbolic_analysis", None, 1, symbolic_analysis.nbytes))
+
+    rows.extend(_result_rows(network))
+    rows.append(
+        (
+            "unit_responses",
+            None,
+            len(network._unit_responses),
+            sum(response.nbytes for response in network._unit_responses.values()),
+        )
+    )
+
+    summaries = [summary for _, summary in network._result_summaries.values()]
+    rows.append(
+        (
+            "result_summaries",
+            None,
+            len(summaries),
+            sum(
+                sum(array.nbytes for array in summary.values.values())
+                + sum(array.nbytes for array in summary.names.values())
+                for summary in summaries
+            ),
+        )
+    )
+
+    return pl.DataFrame(
+        rows,
+        schema={
+            "component": pl.String,
+            "name": pl.String,
+            "count": pl.Int64,
+            "bytes": pl.Int64,
+        },
+        orient="row",
+    )
+
+
+def _paths_bytes(network: "Network", n_freq: int) -> int:
+    """
+    Estimates the memory of the paths of a network.
+
+    Segments that are the branches of the network only cost a reference. Segments that are copies,
+    e.g. after loading a network from JSON, are counted as full branches.
+
+    Args:
+        network (Network): The network.
+        n_freq (int): The number of frequencies.
+
+    Returns:
+        int: The size in bytes.
+    """
+    branches = network.branches
+    branch_bytes = _BYTES_PER_BRANCH + 2 * n_freq * _BYTES_PER_VALUE
+    size = 0
+    for path in network.paths.values():
+        size += _BYTES_PER_PATH + len(path.segments) * _BYTES_PER_SEGMENT
+        for segment in path.segments:
+            if branches.get(segment.name) is not segment:
+                size += branch_bytes
+    return size
+
+
+def _result_rows(network: "Network") -> List[Row]:
+    """
+    Estimates the memory of the results of a network, one row per fault.
+
+    Results spilled to disk by a `ResultStore` are reported as "spilled_results" with 0 bytes.
+
+    Args:
+        network (Network): The network.
+
+    Returns:
+        List[Row]: The report rows.
+    """
+    results = network.results
+    rows: List[Row] = []
+    if isinstance(results, ResultStore):
+        memory_sizes = results.memory_sizes()
+        for fault in results:
+            if fault in memory_sizes:
+                rows.append(("results", fault, 1, memory_sizes[fault]))
+            else:
+                rows.append(("spilled_results", fault, 1, 0))
+        return rows
+
+    for fault, result in results.items():
+        cached = network._result_summaries.get(fault)
+        if cached is not None and cached[0] is result:
+            # the summary has the element counts, so the result does not have to be walked
+            summary = cached[1]
+            n_freq = len(summary.frequencies)
+            size = result_size(
+                len(summary.names["buses"]), len(summary.names["branches"]), n_freq
+            )
+        else:
+            size = estimate_result_size(result)
+        rows.append(("results", fault, 1, size))
+    return rows
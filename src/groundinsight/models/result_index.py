@@ -0,0 +1,187 @@
+# models/result_index.py
+
+"""
+Result Index Module.
+
+This module condenses the result of a fault into NumPy arrays of magnitudes per element and
+frequency (`ResultSummary`) and answers worst-case queries over the summaries of many faults.
+The summaries are small compared to the `Result` objects, so a network keeps them for every solved
+fault, and questions like "which faults raise the EPR above the permissible touch voltage, and at
+which buses" are answered without scanning the results again. Per-fault maxima allow faults that
+cannot contribute to a top-k or threshold query to be skipped entirely.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import numpy as np
+import polars as pl
+
+if TYPE_CHECKING:
+    from groundinsight.models.core_models import Result
+
+# Metric name -> (result list, name column, RMS attribute, frequency attribute)
+WORST_CASE_METRICS = {
+    "uepr": ("buses", "bus_name", "uepr", "uepr_freq"),
+    "ia": ("buses", "bus_name", "ia", "ia_freq"),
+    "i_s": ("branches", "branch_name", "i_s", "i_s_freq"),
+}
+
+
+class ResultSummary:
+    """
+    The magnitudes of all metrics of one fault result.
+
+    Attributes:
+        frequencies (List[float]): The frequencies of the value columns.
+        names (Dict[str, np.ndarray]): The element names per result list ("buses" or "branches").
+        values (Dict[str, np.ndarray]): Per metric, an array of shape (elements, 1 + frequencies) with
+                                        the RMS value in column 0 and the magnitude per frequency in
+                                        the following columns. Missing values are NaN.
+        maxima (Dict[str, np.ndarray]): Per metric, the maximum of each column over all elements.
+    """
+
+    def __init__(self, result: "Result", frequencies: List[float]):
+        """
+        Summarizes a fault result.
+
+        Args:
+            result (Result): The result to summarize.
+            frequencies (List[float]): The frequencies of the network.
+        """
+        self.frequencies = [float(freq) for freq in frequencies]
+        self.names = {
+            "buses": np.array([bus.name for bus in result.buses], dtype=object),
+            "branches": np.array(
+                [branch.name for branch in result.branches], dtype=object
+            ),
+        }
+        self.values = {}
+        self.maxima = {}
+        for metric, attributes in WORST_CASE_METRICS.items():
+            list_name, _, rms_attribute, freq_attribute = attributes
+            elements = getattr(result, list_name)
+            values = np.full((len(elements), 1 + len(self.frequencies)), np.nan)
+            values[:, 0] = [getattr(element, rms_attribute) for element in elements]
+            for column, freq in enumerate(self.frequencies, start=1):
+                phasors = [
+                    getattr(element, freq_attribute).get(freq) for element in elements
+                ]
+                values[:, column] = [
+                    (
+                        abs(complex(phasor.real, phasor.imag))
+                        if phasor is not None
+                        else np.nan
+                    )
+                    for phasor in phasors
+                ]
+            self.values[metric] = values
+            self.maxima[metric] = np.nanmax(values, axis=0, initial=-np.inf)
+
+    def column(self, frequency: Optional[float]) -> Optional[int]:
+        """
+        Returns the value column of a frequency.
+
+        Args:
+            frequency (Optional[float]): The frequency, or None for the RMS values.
+
+        Returns:
+            Optional[int]: The column index, or None if the frequency was not calculated.
+        """
+        if frequency is None:
+            return 0
+        try:
+            return self.frequencies.index(float(frequency)) + 1
+        except ValueError:
+            return None
+
+
+def query_worst_cases(
+    summaries: Dict[str, ResultSummary],
+    metric: str,
+    k: Optional[int],
+    frequency: Optional[float],
+    threshold: Optional[float],
+    per: Optional[str],
+) -> pl.DataFrame:
+    """
+    Finds the largest values of a metric over the summaries of several faults.
+
+    See `Network.worst_cases` for the meaning of the arguments.
+
+    Args:
+        summaries (Dict[str, ResultSummary]): The result summaries keyed by fault name.
+        metric (str): "uepr", "ia" or "i_s".
+        k (Optional[int]): The maximum number of rows, or None for all rows.
+        frequency (Optional[float]): The frequency, or None for the RMS values.
+        threshold (Optional[float]): The minimum value of the returned rows, or None.
+        per (Optional[str]): None, "fault" or "element".
+
+    Returns:
+        pl.DataFrame: The rows sorted by descending value.
+    """
+    list_name, name_column, _, _ = WORST_CASE_METRICS[metric]
+
+    # faults with the largest maxima first, so the search can stop early
+    candidates: List[Tuple[float, str, np.ndarray, np.ndarray]] = []
+    for fault, summary in summaries.items():
+        column = summary.column(frequency)
+        if column is None:
+            continue
+        fault_max = summary.maxima[metric][column]
+        if threshold is not None and not fault_max >= threshold:
+            continue
+        values = summary.values[metric][:, column]
+        candidates.append((fault_max, fault, summary.names[list_name], values))
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+    faults: List[str] = []
+    names: List[np.ndarray] = []
+    values: List[np.ndarray] = []
+    kth_value = -np.inf
+    n_rows = 0
+    for fault_max, fault, element_names, element_values in candidates:
+        if per != "element" and k is not None and n_rows >= k:
+            # no later fault can beat the k-th best value found so far
+            if fault_max <= kth_value:
+                break
+        mask = ~np.isnan(element_values)
+        if threshold is not None:
+            mask &= element_values >= threshold
+        element_names = element_names[mask]
+        element_values = element_values[mask]
+        if per == "fault":
+            if not len(element_values):
+                continue
+            best = int(np.argmax(element_values))
+            element_names = element_names[best : best + 1]
+            element_values = element_values[best : best + 1]
+        elif per is None and k is not None and len(element_values) > k:
+            top = np.argpartition(element_values, -k)[-k:]
+            element_names = element_names[top]
+            element_values = element_values[top]
+        faults.extend([fault] * len(element_values))
+        names.append(element_names)
+        values.append(element_values)
+        n_rows += len(element_values)
+        if per != "element" and k is not None and n_rows >= k:
+            kth_value = np.partition(np.concatenate(values), -k)[-k]
+
+    frame = pl.DataFrame(
+        {
+            "fault": pl.Series(faults, dtype=pl.String),
+            name_column: pl.Series(
+                np.concatenate(names).tolist() if names else [], dtype=pl.String
+            ),
+            "frequency_Hz": pl.Series(
+                [None if frequency is None else float(frequency)] * len(faults),
+                dtype=pl.Float64,
+            ),
+            "value": pl.Series(
+                np.concatenate(values) if values else [], dtype=pl.Float64
+            ),
+        }
+    ).sort("value", descending=True, maintain_order=True)
+    if per == "element":
+        frame = frame.unique(subset=name_column, keep="first", maintain_order=True)
+    if k is not None:
+        frame = frame.head(k)
+    return frame
@@ -0,0 +1,295 @@
+# models/result_store.py
+
+"""
+Result Store Module.
+
+This module provides `ResultStore`, a dictionary-like container for the fault results of a network
+with a memory budget. When the estimated size of the results held in memory exceeds the budget, the
+least recently used results are pickled to a spill file on disk and removed from memory. Accessing
+an evicted result loads it back transparently, so code working with `network.results[...]` does not
+have to know where a result currently lives. Spilled copies of replaced or deleted results are
+reclaimed by compacting the spill file once they take up more than half of it.
+
+The store is enabled per network with `Network.limit_result_memory`.
+"""
+
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from groundinsight.models.core_models import Result
+
+# Approximate memory of one stored complex value (ComplexNumber instance and its dictionary entry)
+# and of one bus or branch result without its values, measured with tracemalloc
+_BYTES_PER_VALUE = 600
+_BYTES_PER_ELEMENT = 1000
+
+
+def estimate_result_size(result: "Result") -> int:
+    """
+    Estimates the memory held by a Result instance.
+
+    Args:
+        result (Result): The result to estimate.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    n_values = sum(
+        len(result_bus.uepr_freq) + len(result_bus.ia_freq)
+        for result_bus in result.buses
+    )
+    n_values += sum(len(result_branch.i_s_freq) for result_branch in result.branches)
+    n_elements = len(result.buses) + len(result.branches)
+    return n_values * _BYTES_PER_VALUE + n_elements * _BYTES_PER_ELEMENT
+
+
+def result_size(n_buses: int, n_branches: int, n_frequencies: int) -> int:
+    """
+    Estimates the memory of a complete result from its dimensions.
+
+    This gives the same value as `estimate_result_size` for a result with a value for every frequency,
+    without walking its elements.
+
+    Args:
+        n_buses (int): The number of bus results.
+        n_branches (int): The number of branch results.
+        n_frequencies (int): The number of frequencies.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    n_values = (2 * n_buses + n_branches) * n_frequencies
+    return n_values * _BYTES_PER_VALUE + (n_buses + n_branches) * _BYTES_PER_ELEMENT
+
+
+class ResultStore(MutableMapping):
+    """
+    A mapping of fault names to Results that keeps at most `max_bytes` of results in memory.
+
+    Attributes:
+        max_bytes (int): The memory budget for the results held in memory.
+        spill_path (str): The path of the spill file for evicted results.
+        on_evict (Optional[Callable[[str], None]]): Called with the fault name of each evicted result.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        spill_path: Optional[str] = None,
+        on_evict: Optional[Callable[[str], None]] = None,
+        results: Optional[Dict[str, "Result"]] = None,
+    ):
+        """
+        Initializes the result store.
+
+        Args:
+            max_bytes (int): The memory budget in bytes. The most recently used result always stays in
+                             memory, even if it alone exceeds the budget.
+            spill_path (Optional[str], optional): The path of the spill file. Defaults to a temporary file
+                                                  that is removed when the store is closed.
+            on_evict (Optional[Callable[[str], None]], optional): Called with the fault name of each
+                                                                  evicted result. Defaults to None.
+            results (Optional[Dict[str, Result]], optional): Initial results. Defaults to None.
+
+        Raises:
+            ValueError: If max_bytes is not positive.
+        """
+        if max_bytes <= 0:
+            raise ValueError("The memory budget max_bytes must be positive.")
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self._remove_spill_file = spill_path is None
+        if spill_path is None:
+            handle, spill_path = tempfile.mkstemp(
+                prefix="groundinsight_results_", suffix=".spill"
+            )
+            os.close(handle)
+        self.spill_path = spill_path
+        self._spill_file = open(spill_path, "w+b")
+        self._keys: Dict[str, None] = {}  # all fault names in insertion order
+        self._memory: "OrderedDict[str, Tuple[Result, int]]" = OrderedDict()
+        self._spilled: Dict[str, Tuple[int, int]] = {}  # fault name -> (offset, length)
+        self._versions: Dict[str, object] = (
+            {}
+        )  # fault name -> token of the last assignment
+        self._memory_bytes = 0
+        self._dead_bytes = 0  # bytes of stale copies in the spill file
+        for fault_name, result in (results or {}).items():
+            self[fault_name] = result
+
+    @property
+    def memory_bytes(self) -> int:
+        """The estimated size of the results currently held in memory."""
+        return self._memory_bytes
+
+    @property
+    def spill_bytes(self) -> int:
+        """The bytes of the spill file, including stale copies that are not compacted yet."""
+        return sum(length for _, length in self._spilled.values()) + self._dead_bytes
+
+    @property
+    def spilled(self) -> List[str]:
+        """The fault names of the results that are currently only stored in the spill file."""
+        return [key for key in self._keys if key not in self._memory]
+
+    def memory_sizes(self) -> Dict[str, int]:
+        """
+        Returns the estimated sizes of the results currently held in memory.
+
+        Returns:
+            Dict[str, int]: The size in bytes keyed by fault name, least recently used first.
+        """
+        return {fault_name: size for fault_name, (_, size) in self._memory.items()}
+
+    def version(self, fault_name: str) -> object:
+        """
+        Returns a token that changes whenever a new result is assigned to a fault.
+
+        Unlike the result itself, the token is available without loading a spilled result.
+
+        Args:
+            fault_name (str): The fault name.
+
+        Returns:
+            object: A token that is only identical to tokens of the same assignment.
+
+        Raises:
+            KeyError: If the store has no result for the fault.
+        """
+        return self._versions[fault_name]
+
+    def __getitem__(self, fault_name: str) -> "Result":
+        if fault_name in self._memory:
+            self._memory.move_to_end(fault_name)
+            return self._memory[fault_name][0]
+        if fault_name not in self._keys:
+            raise KeyError(fault_name)
+        offset, length = self._spilled[fault_name]
+        self._spill_file.seek(offset)
+        result = pickle.loads(self._spill_file.read(length))
+        self._hold(fault_name, result)
+        return result
+
+    def __setitem__(self, fault_name: str, result: "Result"):
+        if fault_name in self._memory:
+            self._memory_bytes -= self._memory.pop(fault_name)[1]
+        # a new result makes the spilled copy stale
+        self._discard_spilled(fault_name)
+        self._keys[fault_name] = None
+        self._versions[fault_name] = object()
+        self._hold(fault_name, result)
+
+    def __delitem__(self, fault_name: str):
+        if fault_name not in self._keys:
+            raise KeyError(fault_name)
+        del self._keys[fault_name]
+        if fault_name in self._memory:
+            self._memory_bytes -= self._memory.pop(fault_name)[1]
+        self._discard_spilled(fault_name)
+        del self._versions[fault_name]
+
+    def __contains__(self, fault_name) -> bool:
+        return fault_name in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return (
+            f"ResultStore(results={len(self)}, in_memory={len(self._memory)}, "
+            f"memory_bytes={self._memory_bytes}, max_bytes={self.max_bytes})"
+        )
+
+    def _hold(self, fault_name: str, result: "Result"):
+        """
+        Keeps a result in memory and evicts least recently used results until the budget is met.
+
+        Args:
+            fault_name (str): The fault name of the result.
+            result (Result): The result to keep in memory.
+        """
+        size = estimate_result_size(result)
+        self._memory[fault_name] = (result, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            self._evict(next(iter(self._memory)))
+
+    def _evict(self, fault_name: str):
+        """
+        Moves a result from memory to the spill file.
+
+        Results that were loaded from the spill file and not replaced since are not written again.
+
+        Args:
+            fault_name (str): The fault name of the result to evict.
+        """
+        result, size = self._memory.pop(fault_name)
+        self._memory_bytes -= size
+        if fault_name not in self._spilled:
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            offset = self._spill_file.seek(0, os.SEEK_END)
+            self._spill_file.write(data)
+            self._spill_file.flush()
+            self._spilled[fault_name] = (offset, len(data))
+        if self.on_evict is not None:
+            self.on_evict(fault_name)
+
+    def _discard_spilled(self, fault_name: str):
+        """
+        Marks the spilled copy of a result as stale and compacts the spill file if needed.
+
+        Args:
+            fault_name (str): The fault name of the result.
+        """
+        spilled = self._spilled.pop(fault_name, None)
+        if spilled is None:
+            return
+        self._dead_bytes += spilled[1]
+        if self._dead_bytes > self.spill_bytes // 2:
+            self._compact()
+
+    def _compact(self):
+        """
+        Moves the live copies in the spill file to its start and truncates the stale copies.
+
+        The copies are moved in the order of their offsets, so a copy is never overwritten before
+        it was moved itself.
+        """
+        end = 0
+        for fault_name, (offset, length) in sorted(
+            self._spilled.items(), key=lambda item: item[1][0]
+        ):
+            if offset != end:
+                self._spill_file.seek(offset)
+                data = self._spill_file.read(length)
+                self._spill_file.seek(end)
+                self._spill_file.write(data)
+                self._spilled[fault_name] = (end, length)
+            end += length
+        self._spill_file.flush()
+        self._spill_file.truncate(end)
+        self._dead_bytes = 0
+
+    def close(self):
+        """
+        Closes the spill file, removing it if it is a temporary file.
+
+        Spilled results are no longer accessible afterwards.
+        """
+        spill_file = getattr(self, "_spill_file", None)
+        if spill_file is None or spill_file.closed:
+            return
+        spill_file.close()
+        if self._remove_spill_file and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,419 @@
+# network_generators.py
+"""
+Network Generators Module.
+
+This module provides functions that create synthetic networks of common topologies for testing and
+benchmarking: meshed grids, trees, rings and chains of parallel branches, each with one or several
+sources. The specific earth resistances and branch lengths are drawn from uniform distributions
+with a seed, so a generator returns the same network for the same arguments.
+
+The networks are built with `Network.add_buses` and `Network.add_branches`, which evaluate the
+impedance formulas of all elements of a type in one vectorized call, so networks with a million
+buses are generated in seconds instead of hours.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .models.core_models import (
+    Network,
+    Bus,
+    BusType,
+    Branch,
+    BranchType,
+    ComplexNumber,
+    Fault,
+    Source,
+    _gc_paused,
+)
+
+
+def create_grid_network(
+    name: str,
+    frequencies: List,
+    rows: int,
+    columns: int,
+    bus_type: BusType,
+    branch_type: BranchType,
+    rho_range: Tuple[float, float] = (100.0, 100.0),
+    length_range: Tuple[float, float] = (1.0, 1.0),
+    number_sources: int = 1,
+    source_values: Optional[Dict] = None,
+    seed: Optional[int] = None,
+    description: str = None,
+) -> Network:
+    """
+    Create a meshed grid network of rows x columns buses.
+
+    Each bus is connected to its right and lower neighbour. The fault is placed at the corner
+    opposite to the first bus.
+
+    Args:
+        name (str): The name of the network.
+        frequencies (List[float]): A list of frequencies (in Hz) to be used in network calculations.
+        rows (int): The number of bus rows.
+        columns (int): The number of bus columns.
+        bus_type (BusType): The type to assign to each bus.
+        branch_type (BranchType): The type to assign to each branch.
+        rho_range (Tuple[float, float], optional): The range of the specific earth resistances of the buses.
+                                                   Defaults to (100.0, 100.0).
+        length_range (Tuple[float, float], optional): The range of the branch lengths. Defaults to (1.0, 1.0).
+        number_sources (int, optional): The number of sources, spread evenly over the buses. Defaults to 1.
+        source_values (Optional[Dict], optional): The current of each source per frequency.
+                                                  Defaults to 1000 A at every frequency.
+        seed (Optional[int], optional): The seed of the random numbers. Defaults to None.
+        description (Optional[str], optional): A brief description of the network. Defaults to None.
+
+    Returns:
+        Network: The network with buses, branches, sources and the fault "fault1", without paths.
+
+    Raises:
+        ValueError: If the grid has fewer than two buses.
+
+    Examples:
+        >>> import groundinsight as gi
+        >>> network = gi.create_grid_network(name="Grid", frequencies=[50, 250], rows=100, columns=100, bus_type=bus_type, branch_type=branch_type, rho_range=(50.0, 500.0), seed=1)
+        >>> print(len(network.buses), len(network.branches))
+        10000 19800
+    """
+    number_buses = rows * columns
+    index = np.arange(number_buses).reshape(rows, columns)
+    connections = np.concatenate(
+        [
+            np.stack([index[:, :-1].ravel(), index[:, 1:].ravel()], axis=1),
+            np.stack([index[:-1, :].ravel(), index[1:, :].ravel()], axis=1),
+        ]
+    )
+    return _build_network(
+        name,
+        frequencies,
+        number_buses,
+        connections,
+        bus_type,
+        branch_type,
+        rho_range,
+        length_range,
+        number_sources,
+        source_values,
+        number_buses - 1,
+        seed,
+        description,
+    )
+
+
+def create_tree_network(
+    name: str,
+    frequencies: List,
+    number_buses: int,
+    bus_type: BusType,
+    branch_type: BranchType,
+    branching: int = 2,
+    rho_range: Tuple[float, float] = (100.0, 100.0),
+    length_range: Tuple[float, float] = (1.0, 1.0),
+    number_sources: int = 1,
+    source_values: Optional[Dict] = None,
+    seed: Optional[int] = None,
+    description: str = None,
+) -> Network:
+    """
+    Create a radial tree network in which every bus feeds up to `branching` buses.
+
+    The buses are numbered level by level starting at the root "bus1". The fault is placed at the
+    last bus, a leaf on the deepest level. A branching of 1 creates a chain.
+
+    Args:
+        name (str): The name of the network.
+        frequencies (List[float]): A list of frequencies (in Hz) to be used in network calculations.
+        number_buses (int): The total number of buses.
+        bus_type (BusType): The type to assign to each bus.
+        branch_type (BranchType): The type to assign to each branch.
+        branching (int, optional): The number of child buses per bus. Defaults to 2.
+        rho_range (Tuple[float, float], optional): The range of the specific earth resistances of the buses.
+                                                   Defaults to (100.0, 100.0).
+        length_range (Tuple[float, float], optional): The range of the branch lengths. Defaults to (1.0, 1.0).
+        number_sources (int, optional): The number of sources, spread evenly over the buses. Defaults to 1.
+        source_values (Optional[Dict], optional): The current of each source per frequency.
+                                                  Defaults to 1000 A at every frequency.
+        seed (Optional[int], optional): The seed of the random numbers. Defaults to None.
+        description (Optional[str], optional): A brief description of the network. Defaults to None.
+
+    Returns:
+        Network: The network with buses, branches, sources and the fault "fault1", without paths.
+
+    Raises:
+        ValueError: If the network has fewer than two buses or branching is smaller than 1.
+    """
+    if branching < 1:
+        raise ValueError("The branching of a tree network must be at least 1.")
+    children = np.arange(1, max(number_buses, 1))
+    connections = np.stack([(children - 1) // branching, children], axis=1)
+    return _build_network(
+        name,
+        frequencies,
+        number_buses,
+        connections,
+        bus_type,
+        branch_type,
+        rho_range,
+        length_range,
+        number_sources,
+        source_values,
+        number_buses - 1,
+        seed,
+        description,
+    )
+
+
+def create_ring_network(
+    name: str,
+    frequencies: List,
+    number_buses: int,
+    bus_type: BusType,
+    branch_type: BranchType,
+    rho_range: Tuple[float, float] = (100.0, 100.0),
+    length_range: Tuple[float, float] = (1.0, 1.0),
+    number_sources: int = 1,
+    source_values: Optional[Dict] = None,
+    seed: Optional[int] = None,
+    description: str = None,
+) -> Network:
+    """
+    Create a ring network in which the buses form a closed loop.
+
+    The fault is placed at the bus opposite to the first bus.
+
+    Args:
+        name (str): The name of the network.
+        frequencies (List[float]): A list of frequencies (in Hz) to be used in network calculations.
+        number_buses (int): The total number of buses.
+        bus_type (BusType): The type to assign to each bus.
+        branch_type (BranchType): The type to assign to each branch.
+        rho_range (Tuple[float, float], optional): The range of the specific earth resistances of the buses.
+                                                   Defaults to (100.0, 100.0).
+        length_range (Tuple[float, float], optional): The range of the branch lengths. Defaults to (1.0, 1.0).
+        number_sources (int, optional): The number of sources, spread evenly over the buses. Defaults to 1.
+        source_values (Optional[Dict], optional): The current of each source per frequency.
+                                                  Defaults to 1000 A at every frequency.
+        seed (Optional[int], optional): The seed of the random numbers. Defaults to None.
+        description (Optional[str], optional): A brief description of the network. Defaults to None.
+
+    Returns:
+        Network: The network with buses, branches, sources and the fault "fault1", without paths.
+
+    Raises:
+        ValueError: If the ring has fewer than three buses.
+    """
+    if number_buses < 3:
+        raise ValueError("A ring network needs at least three buses.")
+    buses = np.arange(number_buses)
+    connections = np.stack([buses, (buses + 1) % number_buses], axis=1)
+    return _build_network(
+        name,
+        frequencies,
+        number_buses,
+        connections,
+        bus_type,
+        branch_type,
+        rho_range,
+        length_range,
+        number_sources,
+        source_values,
+        number_buses // 2,
+        seed,
+        description,
+    )
+
+
+def create_parallel_network(
+    name: str,
+    frequencies: List,
+    number_buses: int,
+    bus_type: BusType,
+    branch_type: BranchType,
+    parallel_branches: int = 2,
+    rho_range: Tuple[float, float] = (100.0, 100.0),
+    length_range: Tuple[float, float] = (1.0, 1.0),
+    number_sources: int = 1,
+    source_values: Optional[Dict] = None,
+    seed: Optional[int] = None,
+    description: str = None,
+) -> Network:
+    """
+    Create a chain of buses in which consecutive buses are connected by a bundle of parallel branches.
+
+    The fault is placed at the last bus of the chain.
+
+    Args:
+        name (str): The name of the network.
+        frequencies (List[float]): A list of frequencies (in Hz) to be used in network calculations.
+        number_buses (int): The total number of buses.
+        bus_type (BusType): The type to assign to each bus.
+        branch_type (BranchType): The type to assign to each branch.
+        parallel_branches (int, optional): The number of branches between consecutive buses. Defaults to 2.
+        rho_range (Tuple[float, float], optional): The range of the specific earth resistances of the buses.
+                                                   Defaults to (100.0, 100.0).
+        length_range (Tuple[float, float], optional): The range of the branch lengths. Defaults to (1.0, 1.0).
+        number_sources (int, optional): The number of sources, spread evenly over the buses. Defaults to 1.
+        source_values (Optional[Dict], optional): The current of each source per frequency.
+                                                  Defaults to 1000 A at every frequency.
+        seed (Optional[int], optional): The seed of the random numbers. Defaults to None.
+        description (Optional[str], optional): A brief description of the network. Defaults to None.
+
+    Returns:
+        Network: The network with buses, branches, sources and the fault "fault1", without paths.
+
+    Raises:
+        ValueError: If the network has fewer than two buses or parallel_branches is smaller than 1.
+    """
+    if parallel_branches < 1:
+        raise ValueError("A parallel network needs at least one branch per bundle.")
+    chain = np.arange(max(number_buses - 1, 0))
+    connections = np.repeat(
+        np.stack([chain, chain + 1], axis=1), parallel_branches, axis=0
+    )
+    return _build_network(
+        name,
+        frequencies,
+        number_buses,
+        connections,
+        bus_type,
+        branch_type,
+        rho_range,
+        length_range,
+        number_sources,
+        source_values,
+        number_buses - 1,
+        seed,
+        description,
+    )
+
+
+def _build_network(
+    name: str,
+    frequencies: List,
+    number_buses: int,
+    connections: np.ndarray,
+    bus_type: BusType,
+    branch_type: BranchType,
+    rho_range: Tuple[float, float],
+    length_range: Tuple[float, float],
+    number_sources: int,
+    source_values: Optional[Dict],
+    fault_index: int,
+    seed: Optional[int],
+    description: Optional[str],
+) -> Network:
+    """
+    Build a network from the bus indices of its branches.
+
+    The buses are named "bus1" to "busN" and the branches "branch1" to "branchM" in the order of
+    `connections`. The specific earth resistance of a branch is the mean of those of its buses.
+
+    Args:
+        name (str): The name of the network.
+        frequencies (List[float]): The frequencies of the network.
+        number_buses (int): The number of buses.
+        connections (np.ndarray): The zero-based (from, to) bus indices of the branches.
+        bus_type (BusType): The type of the buses.
+        branch_type (BranchType): The type of the branches.
+        rho_range (Tuple[float, float]): The range of the specific earth resistances.
+        length_range (Tuple[float, float]): The range of the branch lengths.
+        number_sources (int): The number of sources.
+        source_values (Optional[Dict]): The current of each source per frequency.
+        fault_index (int): The zero-based index of the fault bus.
+        seed (Optional[int]): The seed of the random numbers.
+        description (Optional[str]): The description of the network.
+
+    Returns:
+        Network: The generated network.
+
+    Raises:
+        ValueError: If the arguments do not describe a valid network.
+    """
+    if number_buses < 2:
+        raise ValueError("A generated network needs at least two buses.")
+    if not 1 <= number_sources <= number_buses:
+        raise ValueError(
+            f"number_sources must be between 1 and the number of buses ({number_buses})."
+        )
+    _check_range("rho_range", rho_range)
+    _check_range("length_range", length_range)
+
+    net = Network(name=name, description=description, frequencies=frequencies)
+    rng = np.random.default_rng(seed)
+    rho = rng.uniform(rho_range[0], rho_range[1], number_buses)
+    lengths = rng.uniform(length_range[0], length_range[1], len(connections))
+    branch_rho = (rho[connections[:, 0]] + rho[connections[:, 1]]) / 2
+
+    bus_names = [f"bus{index}" for index in range(1, number_buses + 1)]
+    # the arguments are valid by construction, so the models are built without validation
+    with _gc_paused():
+        net.add_buses(
+            [
+                Bus.model_construct(
+                    name=bus_name,
+                    type=bus_type,
+                    impedance={},
+                    specific_earth_resistance=bus_rho,
+                )
+                for bus_name, bus_rho in zip(bus_names, rho.tolist())
+            ]
+        )
+        net.add_branches(
+            [
+                Branch.model_construct(
+                    name=f"branch{index}",
+                    type=branch_type,
+                    length=length,
+                    from_bus=bus_names[from_index],
+                    to_bus=bus_names[to_index],
+                    self_impedance={},
+                    mutual_impedance={},
+                    specific_earth_resistance=rho_value,
+                )
+                for index, (from_index, to_index), length, rho_value in zip(
+                    range(1, len(connections) + 1),
+                    connections.tolist(),
+                    lengths.tolist(),
+                    branch_rho.tolist(),
+                )
+            ]
+        )
+
+    if source_values is None:
+        source_values = {
+            freq: ComplexNumber(real=1000.0, imag=0.0) for freq in frequencies
+        }
+    source_indices = np.unique(
+        np.linspace(0, number_buses, number_sources, endpoint=False).astype(int)
+    )
+    for source_index in source_indices.tolist():
+        net.add_source(
+            Source(
+                name=f"source{source_index + 1}",
+                bus=bus_names[source_index],
+                values=source_values,
+            )
+        )
+    net.add_fault(
+        Fault(
+            name="fault1",
+            bus=bus_names[fault_index],
+            scalings={freq: 1.0 for freq in frequencies},
+        )
+    )
+    return net
+
+
+def _check_range(argument: str, value_range: Sequence[float]):
+    """
+    Check that a range of random values has a lower bound that is not above its upper bound.
+
+    Args:
+        argument (str): The name of the argument for the error message.
+        value_range (Sequence[float]): The (low, high) range.
+
+    Raises:
+        ValueError: If the range is invalid.
+    """
+    if len(value_range) != 2 or value_range[0] > value_range[1]:
+        raise ValueError(f"{argument} must be a (low, high) pair with low <= high.")
@@ -10,6 +10,7 @@ calculations and updates.
 """
 
 from .models.core_models import Network, Bus, BusType, Branch, BranchType, Fault, Source
+from .profiling import stage
 from typing import Optional, List, Dict
 
 
@@ -286,7 +287,9 @@ def create_paths(network: Network):
     network.define_paths()
 
 
-def build_electrical_network(network: Network):
+def build_electrical_network(
+    network: Network, solver: str = "auto", solver_options: Optional[Dict] = None
+):
     """
     Build the electrical network from the physical network and attach it to the Network object.
 
@@ -295,6 +298,16 @@ def build_electrical_network(network: Network):
 
     Args:
         network (Network): The network instance for which the electrical network is to be built.
+        solver (str, optional): The solver of the network equations: "auto", "lu", "symmetric",
+                                "tree" or "krylov". "auto" solves radial networks with a
+                                linear-time tree sweep where it is faster than sparse LU, and
+                                meshed networks of 100 buses or more with "symmetric".
+                                "symmetric" halves the LU fill-in of meshed networks with a
+                                symmetric ordering. "krylov" solves very large meshed networks
+                                iteratively with little memory. Defaults to "auto".
+        solver_options (Optional[Dict], optional): The options of the "krylov" solver, e.g.
+                                                   {"method": "gmres", "rtol": 1e-8, "maxiter": 500}.
+                                                   See `ElectricalNetwork`. Defaults to None.
 
     Raises:
         ImportError: If the `ElectricalNetwork` class cannot be imported.
@@ -309,10 +322,18 @@ def build_electrical_network(network: Network):
     """
     from groundinsight.electrical_network import ElectricalNetwork
 
-    network.electrical_network = ElectricalNetwork(network)
+    network.electrical_network = ElectricalNetwork(
+        network, solver=solver, solver_options=solver_options
+    )
 
 
-def run_fault(network: Network, fault_name: str):
+def run_fault(
+    network: Network,
+    fault_name: str,
+    solver: str = "auto",
+    store_unit_responses: bool = False,
+    solver_options: Optional[Dict] = None,
+):
     """
     Execute fault calculations, including solving the network and computing branch currents.
 
@@ -320,12 +341,28 @@ def run_fault(network: Network, fault_name: str):
     computes branch currents, reduction factors, and grounding impedance. The results are stored within the
     network's results object.
 
+    The stages of the calculation are reported to an active `StageProfiler`.
+
     Args:
         network (Network): The network instance on which the fault calculations are to be performed.
         fault_name (str): The name of the fault to activate and run calculations for.
+        solver (str, optional): The solver of the network equations: "auto", "lu", "symmetric",
+                                "tree" or "krylov". See `build_electrical_network`. Defaults to
+                                "auto".
+        store_unit_responses (bool, optional): Whether to keep the results per unit current of each
+                                               source, so `Network.rescale_sources` can update the
+                                               result for new source values without a new
+                                               calculation. Defaults to False.
+        solver_options (Optional[Dict], optional): The options of the "krylov" solver. The
+                                                   convergence is reported in the `convergence`
+                                                   of the result. Frequencies that do not converge
+                                                   are solved with sparse LU, or raise a
+                                                   RuntimeError with {"on_failure": "raise"}.
+                                                   Defaults to None.
 
     Raises:
-        ValueError: If the specified fault does not exist in the network.
+        ValueError: If the specified fault does not exist in the network, if a solver option is
+                    unknown, or if the tree solver is requested for a meshed network.
         RuntimeError: If there is an error during network calculations.
 
     Examples:
@@ -339,29 +376,52 @@ def run_fault(network: Network, fault_name: str):
         >>> gi.run_fault(network, fault_name="Fault1")
     """
 
-    # Set the active fault
-    network.set_active_fault(fault_name)
+    with stage("run_fault", fault=fault_name):
+        # Set the active fault
+        network.set_active_fault(fault_name)
+
+        # Check if there are paths in the network if not run create_path
+        if network.paths == {}:
+            with stage("paths"):
+                create_paths(network)
+
+        # build the electrical network from the physical network
+        with stage("build"):
+            build_electrical_network(
+                network, solver=solver, solver_options=solver_options
+            )
+
+        # Solve the network
+        with stage("solve"):
+            network.electrical_network.solve_network()
 
-    # Check if there are paths in the network if not run create_path
-    if network.paths == {}:
-        create_paths(network)
+        # Compute branch currents
+        with stage("branch_currents"):
+            network.electrical_network.compute_branch_currents()
 
-    # build the electrical network from the physical network
-    build_electrical_network(network)
+        # Compute reduction factors
+        with stage("reduction_factors"):
+            network.electrical_network.compute_reduction_factors()
 
-    # Solve the network
-    network.electrical_network.solve_network()
+        # Compute grounding impedance
+        with stage("grounding_impedance"):
+            network.electrical_network.compute_grounding_impedance()
 
-    # Compute branch currents
-    network.electrical_network.compute_branch_currents()
+        # Results are stored in net.results within the ElectricalNetwork methods
 
-    # Compute reduction factors
-    network.electrical_network.compute_reduction_factors()
+        if store_unit_responses:
+            from groundinsight.simulation.superposition import UnitResponses
 
-    # Compute grounding impedance
-    network.electrical_network.compute_grounding_impedance()
+            with stage("unit_responses"):
+                network._unit_responses[fault_name] = (
+                    UnitResponses.from_electrical_network(network.electrical_network)
+                )
+        else:
+            network._unit_responses.pop(fault_name, None)
 
-    # Results are stored in net.results within the ElectricalNetwork methods
+        # Keep the worst-case index up to date
+        with stage("result_index"):
+            network.update_result_index(fault_name)
 
 
 def create_network_assistant(
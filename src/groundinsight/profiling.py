@@ -0,0 +1,199 @@
+# profiling.py
+"""
+Profiling Module.
+
+This module records where the time of a fault calculation goes. `run_fault` and the
+`ElectricalNetwork` mark their stages (paths, build, solve, branch currents, reduction factors,
+grounding impedance) and the per-frequency steps inside them with `stage`. While a
+`StageProfiler` is active, each stage records its wall time, its number of calls and optionally
+its peak memory, per fault and frequency. Without an active profiler, `stage` returns a shared
+no-op context manager, so the instrumentation can stay in place in production.
+
+Examples:
+    >>> import groundinsight as gi
+    >>> with gi.StageProfiler() as profiler:
+    ...     gi.run_fault(network=net, fault_name="fault1")
+    >>> profiler.to_frame()
+"""
+
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional, Tuple
+import polars as pl
+
+# The profilers that are currently recording, innermost last
+_active_profilers: List["StageProfiler"] = []
+
+_NULL_STAGE = nullcontext()
+
+
+def stage(name: str, frequency: Optional[float] = None, fault: Optional[str] = None):
+    """
+    Mark a stage of a calculation for the active profilers.
+
+    Args:
+        name (str): The name of the stage. Steps inside a stage are named "<stage>.<step>".
+        frequency (Optional[float], optional): The frequency the stage works on. Defaults to None.
+        fault (Optional[str], optional): The fault the stage works on. Defaults to the fault of the
+                                         enclosing stage.
+
+    Returns:
+        ContextManager: A context manager that records the stage, or a no-op context manager if no
+                        profiler is active.
+    """
+    if not _active_profilers:
+        return _NULL_STAGE
+    return _Stage(name, frequency, fault)
+
+
+class _Stage:
+    """A recorded stage, see `stage`."""
+
+    __slots__ = ("name", "frequency", "fault", "start", "start_memory", "peak_memory")
+
+    def __init__(self, name: str, frequency: Optional[float], fault: Optional[str]):
+        self.name = name
+        self.frequency = None if frequency is None else float(frequency)
+        self.fault = fault
+
+    def __enter__(self):
+        for profiler in _active_profilers:
+            profiler._enter(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall_time = time.perf_counter() - self.start
+        for profiler in _active_profilers:
+            profiler._exit(self, wall_time)
+        return False
+
+
+class StageProfiler:
+    """
+    Records wall time, call counts and peak memory of the stages of fault calculations.
+
+    The profiler is used as a context manager around the calculations. The records are aggregated
+    per fault, stage and frequency and returned as a Polars DataFrame by `to_frame`. Each single
+    stage run can also be passed to a callback, e.g. to write structured logs.
+
+    Attributes:
+        memory (bool): Whether the peak memory of the stages is traced.
+        callback (Optional[Callable[[Dict], None]]): Called with the record of each finished stage.
+    """
+
+    def __init__(
+        self,
+        memory: bool = False,
+        callback: Optional[Callable[[Dict], None]] = None,
+    ):
+        """
+        Initializes the profiler.
+
+        Args:
+            memory (bool, optional): Whether to trace the peak memory of each stage with tracemalloc.
+                                     Tracing slows down the calculation considerably. Defaults to False.
+            callback (Optional[Callable[[Dict], None]], optional): Called with a dictionary with the keys
+                                                                   "fault", "stage", "frequency_Hz",
+                                                                   "wall_time_s" and "peak_memory_bytes"
+                                                                   after each stage. Defaults to None.
+        """
+        self.memory = memory
+        self.callback = callback
+        # (fault, stage, frequency) -> [calls, wall time, peak memory]
+        self._records: Dict[Tuple[Optional[str], str, Optional[float]], list] = {}
+        self._stack: List[_Stage] = []
+        self._started_tracing = False
+
+    def __enter__(self) -> "StageProfiler":
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _active_profilers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _active_profilers.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._stack.clear()
+        return False
+
+    def _enter(self, current: _Stage):
+        if current.fault is None and self._stack:
+            current.fault = self._stack[-1].fault
+        if self.memory:
+            memory, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # keep the peak of the enclosing stage before the counter is reset
+                parent = self._stack[-1]
+                parent.peak_memory = max(parent.peak_memory, peak)
+            tracemalloc.reset_peak()
+            current.start_memory = memory
+            current.peak_memory = memory
+        self._stack.append(current)
+
+    def _exit(self, current: _Stage, wall_time: float):
+        if not self._stack or self._stack[-1] is not current:
+            # the stage started before the profiler was entered
+            return
+        self._stack.pop()
+        peak_memory = None
+        if self.memory:
+            peak = max(current.peak_memory, tracemalloc.get_traced_memory()[1])
+            peak_memory = peak - current.start_memory
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak_memory = max(parent.peak_memory, peak)
+        key = (current.fault, current.name, current.frequency)
+        record = self._records.get(key)
+        if record is None:
+            self._records[key] = [1, wall_time, peak_memory]
+        else:
+            record[0] += 1
+            record[1] += wall_time
+            if peak_memory is not None:
+                record[2] = max(record[2] or 0, peak_memory)
+        if self.callback is not None:
+            self.callback(
+                {
+                    "fault": current.fault,
+                    "stage": current.name,
+                    "frequency_Hz": current.frequency,
+                    "wall_time_s": wall_time,
+                    "peak_memory_bytes": peak_memory,
+                }
+            )
+
+    def reset(self):
+        """Discards all records."""
+        self._records.clear()
+
+    def to_frame(self) -> pl.DataFrame:
+        """
+        Returns the records as a Polars DataFrame.
+
+        Returns:
+            pl.DataFrame: One row per fault, stage and frequency with the columns `fault`, `stage`,
+                          `frequency_Hz` (null for stages that cover all frequencies), `calls`,
+                          `wall_time_s` (summed over all calls) and `peak_memory_bytes` (the largest
+                          increase of the traced memory during a call, null without memory tracing).
+        """
+        keys = list(self._records)
+        values = list(self._records.values())
+        return pl.DataFrame(
+            {
+                "fault": pl.Series([key[0] for key in keys], dtype=pl.String),
+                "stage": pl.Series([key[1] for key in keys], dtype=pl.String),
+                "frequency_Hz": pl.Series([key[2] for key in keys], dtype=pl.Float64),
+                "calls": pl.Series([value[0] for value in values], dtype=pl.Int64),
+                "wall_time_s": pl.Series(
+                    [value[1] for value in values], dtype=pl.Float64
+                ),
+                "peak_memory_bytes": pl.Series(
+                    [value[2] for value in values], dtype=pl.Int64
+                ),
+            }
+        )
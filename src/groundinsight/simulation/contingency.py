@@ -0,0 +1,381 @@
+# simulation/contingency.py
+
+"""
+Contingency Analysis Module.
+
+This module evaluates many single-element changes of a solved network without rebuilding and
+refactorizing the admittance matrix for each of them. Removing or changing the impedance of a
+branch between buses a and b changes Y by the rank-1 term dy * e * e^T with e = e_a - e_b, and
+changes the current vector only through the mutual current of the branch, which is injected along
+the same vector e. Changing the earth impedance of bus a is the rank-1 term dy * e_a * e_a^T. With
+w = Y^-1 * e from the factorization of the base case, the Sherman-Morrison formula gives the bus
+voltages of the changed network as
+
+    u' = u + w * (di - dy * (e^T u + di * e^T w) / (1 + dy * e^T w))
+
+where di is the change of the mutual current. The columns w of many contingencies are computed
+with one multi-column solve per frequency, so a full N-1 sweep costs about as much as solving the
+base case once per element, without any new factorization.
+
+The paths of the base case and the parallel coefficients of the branches are kept: the mutual
+current of a removed branch is dropped, but the mutual currents of the remaining branches are not
+redistributed.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import polars as pl
+from groundinsight.models.core_models import Network
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+class ContingencyAnalysis:
+    """
+    Evaluates outages and impedance changes of single buses and branches for one fault.
+
+    The base case is calculated with `run_fault` when the analysis is created. All contingency
+    results are derived from its bus voltages and the cached LU factorizations of its admittance
+    matrices.
+
+    Attributes:
+        network (Network): The network of the base case.
+        fault_name (str): The fault of the base case.
+        chunk_size (int): The number of contingencies solved together per frequency.
+    """
+
+    def __init__(
+        self, network: Network, fault_name: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        """
+        Calculates the base case of the contingency analysis.
+
+        Args:
+            network (Network): The network to analyse.
+            fault_name (str): The name of the fault.
+            chunk_size (int, optional): The number of contingencies solved together per frequency.
+                                        Larger chunks are faster but need n_buses * chunk_size complex
+                                        values of memory. Defaults to 256.
+
+        Raises:
+            ValueError: If the fault does not exist in the network.
+        """
+        from groundinsight.network_operations import run_fault
+
+        if fault_name not in network.faults:
+            raise ValueError(
+                f"Fault '{fault_name}' does not exist in the network '{network.name}'."
+            )
+        run_fault(network, fault_name)
+        self.network = network
+        self.fault_name = fault_name
+        self.chunk_size = chunk_size
+        self.electrical_network = network.electrical_network
+        self.frequencies = list(network.frequencies)
+        self.bus_names = list(self.electrical_network.bus_indices)
+        self.fault_bus_index = self.electrical_network.bus_indices[
+            network.faults[fault_name].bus
+        ]
+
+    def branch_outages(self, branches: Optional[Iterable[str]] = None) -> pl.DataFrame:
+        """
+        Evaluates the outage of each of the given branches on its own (N-1).
+
+        Args:
+            branches (Optional[Iterable[str]], optional): The names of the branches. Defaults to all branches.
+
+        Returns:
+            pl.DataFrame: The EPR results per branch, see `_sweep`.
+
+        Raises:
+            ValueError: If a branch does not exist in the network.
+        """
+        names = list(self.network.branches if branches is None else branches)
+        n_freq = len(self.frequencies)
+        new_y = np.zeros((len(names), n_freq), dtype=complex)
+        new_i = np.zeros((len(names), n_freq), dtype=complex)
+        return self._branch_sweep(names, new_y, new_i)
+
+    def branch_modifications(
+        self,
+        self_impedances: Dict[str, Dict[float, complex]],
+        mutual_impedances: Optional[Dict[str, Dict[float, complex]]] = None,
+    ) -> pl.DataFrame:
+        """
+        Evaluates new impedances of branches, each branch on its own.
+
+        Args:
+            self_impedances (Dict[str, Dict[float, complex]]): The new self impedance per frequency keyed by
+                                                               branch name. Missing frequencies keep
+                                                               their base values.
+            mutual_impedances (Optional[Dict[str, Dict[float, complex]]], optional): The new mutual impedance
+                per frequency keyed by branch name. Defaults to the base values.
+
+        Returns:
+            pl.DataFrame: The EPR results per branch, see `_sweep`.
+
+        Raises:
+            ValueError: If a branch does not exist in the network.
+        """
+        mutual_impedances = mutual_impedances or {}
+        names = list(self_impedances)
+        n_freq = len(self.frequencies)
+        new_y = np.zeros((len(names), n_freq), dtype=complex)
+        new_i = np.zeros((len(names), n_freq), dtype=complex)
+        for row, name in enumerate(names):
+            branch = self._branch(name)
+            if not branch.type.grounding_conductor:
+                # a branch without grounding conductor does not carry current
+                continue
+            for column, freq in enumerate(self.frequencies):
+                z_self = complex(
+                    self_impedances[name].get(freq, branch.self_impedance.get(freq))
+                )
+                z_mutual = complex(
+                    mutual_impedances.get(name, {}).get(
+                        freq, branch.mutual_impedance.get(freq)
+                    )
+                )
+                coupling = self.electrical_network.mutual_couplings[freq].get(name, 0)
+                new_y[row, column] = 1 / z_self
+                new_i[row, column] = coupling * z_mutual / z_self
+        return self._branch_sweep(names, new_y, new_i)
+
+    def bus_outages(self, buses: Optional[Iterable[str]] = None) -> pl.DataFrame:
+        """
+        Evaluates the loss of the earth connection of each of the given buses on its own.
+
+        Args:
+            buses (Optional[Iterable[str]], optional): The names of the buses. Defaults to all buses.
+
+        Returns:
+            pl.DataFrame: The EPR results per bus, see `_sweep`.
+
+        Raises:
+            ValueError: If a bus does not exist in the network.
+        """
+        names = list(self.network.buses if buses is None else buses)
+        new_y = np.zeros((len(names), len(self.frequencies)), dtype=complex)
+        return self._bus_sweep(names, new_y)
+
+    def bus_modifications(
+        self, impedances: Dict[str, Dict[float, complex]]
+    ) -> pl.DataFrame:
+        """
+        Evaluates new earth impedances of buses, each bus on its own.
+
+        Args:
+            impedances (Dict[str, Dict[float, complex]]): The new impedance per frequency keyed by bus name.
+                                                          Missing frequencies keep their base values.
+
+        Returns:
+            pl.DataFrame: The EPR results per bus, see `_sweep`.
+
+        Raises:
+            ValueError: If a bus does not exist in the network.
+        """
+        names = list(impedances)
+        new_y = np.zeros((len(names), len(self.frequencies)), dtype=complex)
+        for row, name in enumerate(names):
+            bus = self._bus(name)
+            for column, freq in enumerate(self.frequencies):
+                new_y[row, column] = 1 / complex(
+                    impedances[name].get(freq, bus.impedance.get(freq))
+                )
+        return self._bus_sweep(names, new_y)
+
+    def _branch(self, name: str):
+        if name not in self.network.branches:
+            raise ValueError(
+                f"Branch '{name}' does not exist in the network '{self.network.name}'."
+            )
+        return self.network.branches[name]
+
+    def _bus(self, name: str):
+        if name not in self.network.buses:
+            raise ValueError(
+                f"Bus '{name}' does not exist in the network '{self.network.name}'."
+            )
+        return self.network.buses[name]
+
+    def _branch_sweep(
+        self, names: List[str], new_y: np.ndarray, new_i: np.ndarray
+    ) -> pl.DataFrame:
+        """
+        Evaluates branch contingencies given the new admittances and mutual currents.
+
+        Args:
+            names (List[str]): The branch names.
+            new_y (np.ndarray): The new admittances of shape (branches, frequencies).
+            new_i (np.ndarray): The new mutual currents of shape (branches, frequencies).
+
+        Returns:
+            pl.DataFrame: The EPR results per branch.
+        """
+        bus_indices = self.electrical_network.bus_indices
+        from_index = np.empty(len(names), dtype=np.int64)
+        to_index = np.empty(len(names), dtype=np.int64)
+        old_y = np.zeros_like(new_y)
+        old_i = np.zeros_like(new_i)
+        for row, name in enumerate(names):
+            branch = self._branch(name)
+            from_index[row] = bus_indices[branch.from_bus]
+            to_index[row] = bus_indices[branch.to_bus]
+            if not branch.type.grounding_conductor:
+                continue
+            for column, freq in enumerate(self.frequencies):
+                impedance = branch.self_impedance.get(freq)
+                if impedance:
+                    old_y[row, column] = 1 / complex(impedance.real, impedance.imag)
+                old_i[row, column] = self.electrical_network.i_mutuals[freq].get(
+                    name, 0
+                )
+        return self._sweep(
+            "branch", names, from_index, to_index, new_y - old_y, new_i - old_i
+        )
+
+    def _bus_sweep(self, names: List[str], new_y: np.ndarray) -> pl.DataFrame:
+        """
+        Evaluates bus contingencies given the new earth admittances.
+
+        Args:
+            names (List[str]): The bus names.
+            new_y (np.ndarray): The new admittances of shape (buses, frequencies).
+
+        Returns:
+            pl.DataFrame: The EPR results per bus.
+        """
+        bus_indices = self.electrical_network.bus_indices
+        index = np.empty(len(names), dtype=np.int64)
+        old_y = np.zeros_like(new_y)
+        for row, name in enumerate(names):
+            bus = self._bus(name)
+            index[row] = bus_indices[name]
+            for column, freq in enumerate(self.frequencies):
+                impedance = bus.impedance.get(freq)
+                if impedance:
+                    old_y[row, column] = 1 / complex(impedance.real, impedance.imag)
+        return self._sweep(
+            "bus", names, index, None, new_y - old_y, np.zeros_like(new_y)
+        )
+
+    def _sweep(
+        self,
+        element_type: str,
+        names: List[str],
+        from_index: np.ndarray,
+        to_index: Optional[np.ndarray],
+        delta_y: np.ndarray,
+        delta_i: np.ndarray,
+    ) -> pl.DataFrame:
+        """
+        Applies rank-1 updates to the base case, one per contingency.
+
+        Args:
+            element_type (str): "branch" or "bus".
+            names (List[str]): The names of the changed elements.
+            from_index (np.ndarray): The bus index of the first end of each change.
+            to_index (Optional[np.ndarray]): The bus index of the second end of each change, or None for
+                                             changes between a bus and earth.
+            delta_y (np.ndarray): The admittance changes of shape (contingencies, frequencies).
+            delta_i (np.ndarray): The changes of the injected currents along the same bus pairs.
+
+        Returns:
+            pl.DataFrame: Per contingency one row per frequency and one RMS row (null frequency) with
+                          the columns `element_type`, `element`, `frequency_Hz`, `RMS`, `EPR_V` (the
+                          EPR at the fault bus), `EPR_max_V` and `EPR_max_bus` (the highest EPR of all
+                          buses and its bus). Contingencies that leave a part of the network without
+                          earth connection have NaN values.
+        """
+        n_cont = len(names)
+        n_freq = len(self.frequencies)
+        n_bus = len(self.bus_names)
+        fault_index = self.fault_bus_index
+        epr = np.zeros((n_cont, n_freq + 1))
+        epr_max = np.zeros((n_cont, n_freq + 1))
+        epr_max_bus = np.zeros((n_cont, n_freq + 1), dtype=np.int64)
+
+        for start in range(0, n_cont, self.chunk_size):
+            stop = min(start + self.chunk_size, n_cont)
+            columns = np.arange(stop - start)
+            rows_a = from_index[start:stop]
+            rows_b = None if to_index is None else to_index[start:stop]
+            squares = np.zeros((n_bus, stop - start))
+            for f, freq in enumerate(self.frequencies):
+                u = self.electrical_network.u_vectors[freq]
+                lu = self.electrical_network.factorizations[freq]
+                rhs = np.zeros((n_bus, stop - start), dtype=complex)
+                rhs[rows_a, columns] = 1
+                if rows_b is not None:
+                    rhs[rows_b, columns] -= 1
+                w = lu.solve(rhs)
+                # e^T w and e^T u for the vector e of each contingency
+                g = w[rows_a, columns]
+                s = u[rows_a]
+                if rows_b is not None:
+                    g = g - w[rows_b, columns]
+                    s = s - u[rows_b]
+                dy = delta_y[start:stop, f]
+                di = delta_i[start:stop, f]
+                s = s + di * g
+                denominator = 1 + dy * g
+                # the update is singular if the change isolates a part of the network from earth
+                singular = np.abs(denominator) <= 1e-12 * np.maximum(1, np.abs(dy * g))
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    c = di - dy * s / denominator
+                c[singular] = np.nan
+                voltages = np.abs(u[:, np.newaxis] + w * c[np.newaxis, :])
+                squares += voltages**2
+                self._store(epr, epr_max, epr_max_bus, voltages, start, stop, f + 1)
+            self._store(epr, epr_max, epr_max_bus, np.sqrt(squares), start, stop, 0)
+
+        return self._frame(element_type, names, epr, epr_max, epr_max_bus)
+
+    def _store(self, epr, epr_max, epr_max_bus, voltages, start, stop, column):
+        """Stores the EPR at the fault bus and the highest EPR of a chunk of contingencies."""
+        epr[start:stop, column] = voltages[self.fault_bus_index]
+        with np.errstate(invalid="ignore"):
+            highest = np.argmax(np.nan_to_num(voltages, nan=-1.0), axis=0)
+        epr_max_bus[start:stop, column] = highest
+        epr_max[start:stop, column] = voltages[highest, np.arange(voltages.shape[1])]
+        # contingencies with a singular update are NaN at every bus
+        singular = np.isnan(voltages).any(axis=0)
+        epr_max[start:stop, column][singular] = np.nan
+
+    def _frame(
+        self,
+        element_type: str,
+        names: List[str],
+        epr: np.ndarray,
+        epr_max: np.ndarray,
+        epr_max_bus: np.ndarray,
+    ) -> pl.DataFrame:
+        """Builds the result frame with the frequency rows of each contingency before its RMS row."""
+        n_cont = len(names)
+        n_rows = len(self.frequencies) + 1
+        # move the RMS column behind the frequency columns
+        order = list(range(1, n_rows)) + [0]
+        bus_names = np.array(self.bus_names, dtype=object)
+        frequencies = np.array(self.frequencies + [np.nan])
+        return pl.DataFrame(
+            {
+                "element_type": pl.Series(
+                    [element_type] * (n_cont * n_rows), dtype=pl.String
+                ),
+                "element": pl.Series(
+                    np.repeat(np.array(names, dtype=object), n_rows).tolist(),
+                    dtype=pl.String,
+                ),
+                "frequency_Hz": pl.Series(
+                    np.tile(frequencies, n_cont), dtype=pl.Float64, nan_to_null=True
+                ),
+                "RMS": pl.Series(
+                    np.tile(np.arange(n_rows) == n_rows - 1, n_cont), dtype=pl.Boolean
+                ),
+                "EPR_V": pl.Series(epr[:, order].ravel(), dtype=pl.Float64),
+                "EPR_max_V": pl.Series(epr_max[:, order].ravel(), dtype=pl.Float64),
+                "EPR_max_bus": pl.Series(
+                    bus_names[epr_max_bus[:, order].ravel()].tolist(), dtype=pl.String
+                ),
+            }
+        )
@@ -0,0 +1,208 @@
+# simulation/krylov.py
+
+"""
+Krylov Solver Module.
+
+A sparse LU factorization of the admittance matrix of a large meshed network fills in many of the
+zero elements, so its memory grows much faster than the number of buses. This module solves the
+admittance equations Y * u = i iteratively with BiCGSTAB or GMRES instead. The iterations are
+preconditioned with an incomplete LU factorization of Y that drops small elements, so the memory
+stays close to a small multiple of the nonzeros of Y. The solution of the previous frequency is
+a good starting point for the next one, and the number of iterations and the residual of each
+solve are recorded, so the convergence can be checked in the results. A solve that does not reach
+the tolerance is repeated with a sparse LU factorization, or raises an error on request.
+"""
+
+from typing import Optional
+import numpy as np
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import LinearOperator, bicgstab, gmres, spilu, splu
+
+# The Krylov methods of `KrylovSolver`
+KRYLOV_METHODS = ("gmres", "bicgstab")
+# What `KrylovSolver` does when a solve does not reach the tolerance
+KRYLOV_FAILURE_ACTIONS = ("lu", "raise")
+# The options of `KrylovSolver`, e.g. passed as `solver_options` of an `ElectricalNetwork`
+KRYLOV_OPTIONS = ("method", "rtol", "maxiter", "drop_tol", "fill_factor", "on_failure")
+
+_BYTES_PER_INDEX = 4  # row indices and permutations of the incomplete factors
+
+
+class KrylovSolver:
+    """
+    Iterative solution of the equations of one admittance matrix with an ILU preconditioner.
+
+    A `KrylovSolver` can be used in place of a sparse LU factorization: `solve` accepts one or
+    several right-hand sides.
+
+    Attributes:
+        matrix (csc_matrix): The admittance matrix.
+        method (str): The Krylov method, "gmres" or "bicgstab".
+        rtol (float): The relative tolerance of the residual ||Y * u - i|| / ||i||.
+        maxiter (int): The maximum number of iterations per right-hand side.
+        on_failure (str): "lu" or "raise", see `__init__`.
+        iterations (int): The number of iterations of all solves so far.
+        residual (float): The largest relative residual of the iterations of all solves so far.
+        converged (bool): Whether the iterations of all solves so far reached the tolerance.
+        fallbacks (int): The number of solves that were repeated with sparse LU.
+    """
+
+    def __init__(
+        self,
+        matrix,
+        method: str = "gmres",
+        rtol: float = 1e-10,
+        maxiter: int = 1000,
+        drop_tol: float = 1e-2,
+        fill_factor: float = 10.0,
+        on_failure: str = "lu",
+    ):
+        """
+        Computes the preconditioner of a matrix.
+
+        Args:
+            matrix: The sparse admittance matrix.
+            method (str, optional): "gmres" or "bicgstab". BiCGSTAB needs less work per iteration,
+                                    but can break down with a coarse preconditioner. Defaults to
+                                    "gmres".
+            rtol (float, optional): The relative tolerance of the residual. Defaults to 1e-10.
+            maxiter (int, optional): The maximum number of iterations per right-hand side, of
+                                     restart cycles for GMRES. Defaults to 1000.
+            drop_tol (float, optional): Elements of the incomplete factors below this tolerance
+                                        are dropped. Smaller values need more memory and fewer
+                                        iterations. Defaults to 1e-2.
+            fill_factor (float, optional): The maximum ratio of the nonzeros of the incomplete
+                                           factors to the nonzeros of the matrix. Defaults to 10.
+            on_failure (str, optional): "lu" solves a right-hand side whose iterations do not reach
+                                        the tolerance again with a sparse LU factorization of the
+                                        matrix, which is computed once and kept. "raise" raises a
+                                        RuntimeError instead. Defaults to "lu".
+
+        Raises:
+            ValueError: If the method or the failure action is unknown or a parameter is not
+                        positive.
+            RuntimeError: If the matrix is singular.
+        """
+        if method not in KRYLOV_METHODS:
+            raise ValueError(
+                f"Unknown Krylov method '{method}'. Choose one of {', '.join(KRYLOV_METHODS)}."
+            )
+        if on_failure not in KRYLOV_FAILURE_ACTIONS:
+            raise ValueError(
+                f"Unknown failure action '{on_failure}'. Choose one of "
+                f"{', '.join(KRYLOV_FAILURE_ACTIONS)}."
+            )
+        if rtol <= 0 or maxiter <= 0:
+            raise ValueError("rtol and maxiter must be positive.")
+        self.matrix = csc_matrix(matrix)
+        self.method = method
+        self.rtol = rtol
+        self.maxiter = maxiter
+        self.on_failure = on_failure
+        self.iterations = 0
+        self.residual = 0.0
+        self.converged = True
+        self.fallbacks = 0
+        self._lu = None  # sparse LU factorization for the solves that do not converge
+        self._ilu = spilu(self.matrix, drop_tol=drop_tol, fill_factor=fill_factor)
+        self._preconditioner = LinearOperator(
+            self.matrix.shape, matvec=self._ilu.solve, dtype=complex
+        )
+
+    @property
+    def shape(self):
+        """The shape of the matrix."""
+        return self.matrix.shape
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate size of the incomplete factors, and of the LU factors if any, in bytes."""
+        nnz = self._ilu.nnz + (0 if self._lu is None else self._lu.nnz)
+        return (
+            nnz * (np.dtype(complex).itemsize + _BYTES_PER_INDEX)
+            + 3 * self.shape[0] * _BYTES_PER_INDEX
+        )
+
+    def solve(self, rhs: np.ndarray, x0: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Solves Y * u = rhs iteratively.
+
+        Args:
+            rhs (np.ndarray): The right-hand side of shape (buses,) or (buses, columns).
+            x0 (Optional[np.ndarray], optional): The starting point with the shape of `rhs`, e.g.
+                                                 the solution at the previous frequency. Defaults
+                                                 to zero.
+
+        Returns:
+            np.ndarray: The solution with the shape of `rhs`. If the tolerance was not reached,
+                        `converged` is False and the solution of the sparse LU factorization is
+                        returned.
+
+        Raises:
+            RuntimeError: If the tolerance was not reached and `on_failure` is "raise".
+        """
+        rhs = np.asarray(rhs, dtype=complex)
+        if rhs.ndim == 2:
+            solution = np.empty_like(rhs)
+            for k in range(rhs.shape[1]):
+                solution[:, k] = self.solve(rhs[:, k], None if x0 is None else x0[:, k])
+            return solution
+
+        norm = np.linalg.norm(rhs)
+        if norm == 0:
+            return np.zeros_like(rhs)
+        iterations = 0
+
+        def count(_):
+            nonlocal iterations
+            iterations += 1
+
+        # a breakdown of BiCGSTAB shows up as a non-finite residual instead of warnings
+        with np.errstate(all="ignore"):
+            solution, info = self._iterate(rhs, x0, count)
+            residual = float(np.linalg.norm(self.matrix @ solution - rhs) / norm)
+        # a breakdown is handled like an iteration that does not reach the tolerance
+        if info < 0 or not np.isfinite(residual):
+            info = 1
+        if not np.isfinite(residual):
+            residual = np.inf
+        self.iterations += iterations
+        self.residual = max(self.residual, residual)
+        if info == 0:
+            return solution
+
+        self.converged = False
+        if self.on_failure == "raise":
+            raise RuntimeError(
+                f"The {self.method} solver did not converge: relative residual {residual:.3g} "
+                f"after {iterations} iterations."
+            )
+        if self._lu is None:
+            self._lu = splu(self.matrix)
+        self.fallbacks += 1
+        return self._lu.solve(rhs)
+
+    def _iterate(self, rhs: np.ndarray, x0: Optional[np.ndarray], callback):
+        """Runs the Krylov method and returns the last iterate and the SciPy status."""
+        if self.method == "gmres":
+            return gmres(
+                self.matrix,
+                rhs,
+                x0=x0,
+                rtol=self.rtol,
+                atol=0.0,
+                maxiter=self.maxiter,
+                M=self._preconditioner,
+                callback=callback,
+                callback_type="pr_norm",
+            )
+        return bicgstab(
+            self.matrix,
+            rhs,
+            x0=x0,
+            rtol=self.rtol,
+            atol=0.0,
+            maxiter=self.maxiter,
+            M=self._preconditioner,
+            callback=callback,
+        )
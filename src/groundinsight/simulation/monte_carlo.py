@@ -0,0 +1,576 @@
+# simulation/monte_carlo.py
+
+"""
+Monte Carlo Module.
+
+The specific earth resistance of the soil is rarely known precisely. This module draws samples of
+the resistivity of every bus and branch and collects the distribution of the EPR of all buses and
+of the reduction factor of one fault. The samples are processed in batches:
+
+- the impedance formulas of the types are evaluated for all samples, elements and frequencies of a
+  batch at once with `compute_impedance_array`,
+- the admittances are scattered into the values of the sparsity pattern of the base case with one
+  sparse product, and the mutual currents are injected with the incidence matrix of the branches,
+- radial networks are factorized and solved for all samples and frequencies of a batch with one
+  sweep of the tree solver, meshed networks with one numeric factorization per sample and frequency
+  that reuses the symbolic analysis of the base case,
+- the statistics are updated with each batch, with the percentiles estimated by the P-square
+  algorithm, so the memory does not grow with the number of samples.
+
+The paths, parallel coefficients and mutual couplings of the base case are kept. The impedances of
+the samples are evaluated from the formulas of the bus and branch types, so impedances that were
+set by hand are replaced by their formulas.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+import polars as pl
+from scipy.sparse import csc_matrix, csr_matrix
+from groundinsight.models.core_models import Network
+from groundinsight.simulation.symbolic import SymbolicAnalysis
+from groundinsight.simulation.tree_solver import TreeFactorization
+from groundinsight.utils.impedance_calculator import compute_impedance_array
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_PERCENTILES = (5.0, 50.0, 95.0)
+
+# The signs of the elements (from, to), (to, from), (from, from) and (to, to) of a branch in Y
+_BRANCH_SIGNS = np.array([-1.0, -1.0, 1.0, 1.0])
+
+
+class StreamingStatistics:
+    """
+    The running mean, standard deviation, extremes and percentiles of many series of samples.
+
+    The percentiles are estimated with the P-square algorithm of Jain and Chlamtac, which keeps
+    five markers per series and percentile instead of the samples. The markers of all series are
+    updated together.
+
+    Attributes:
+        num_series (int): The number of series.
+        percentiles (Tuple[float, ...]): The percentiles in percent.
+        count (int): The number of samples so far.
+        mean (np.ndarray): The mean of each series.
+        minimum (np.ndarray): The smallest sample of each series.
+        maximum (np.ndarray): The largest sample of each series.
+    """
+
+    def __init__(
+        self, num_series: int, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ):
+        """
+        Initializes the statistics without samples.
+
+        Args:
+            num_series (int): The number of series.
+            percentiles (Sequence[float], optional): The percentiles in percent, between 0 and 100
+                                                     exclusive. Defaults to (5, 50, 95).
+
+        Raises:
+            ValueError: If a percentile is not between 0 and 100.
+        """
+        if any(not 0 < percentile < 100 for percentile in percentiles):
+            raise ValueError("The percentiles must be between 0 and 100.")
+        self.num_series = num_series
+        self.percentiles = tuple(float(percentile) for percentile in percentiles)
+        self.count = 0
+        self.mean = np.zeros(num_series)
+        self.minimum = np.full(num_series, np.inf)
+        self.maximum = np.full(num_series, -np.inf)
+        self._m2 = np.zeros(num_series)
+        self._first = np.empty((5, num_series))
+        p = np.array(self.percentiles)[:, np.newaxis, np.newaxis] / 100
+        self._increments = np.concatenate(
+            [np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)], axis=2
+        )
+        self._initial_positions = 1 + np.concatenate(
+            [np.zeros_like(p), 2 * p, 4 * p, 2 + 2 * p, 4 * np.ones_like(p)], axis=2
+        )
+        self._heights: Optional[np.ndarray] = None
+        self._positions: Optional[np.ndarray] = None
+        self._desired: Optional[np.ndarray] = None
+
+    @property
+    def std(self) -> np.ndarray:
+        """The sample standard deviation of each series, zero for fewer than two samples."""
+        if self.count < 2:
+            return np.zeros(self.num_series)
+        return np.sqrt(self._m2 / (self.count - 1))
+
+    def update(self, values: np.ndarray):
+        """
+        Adds samples.
+
+        Args:
+            values (np.ndarray): The samples of shape (samples, series).
+        """
+        values = np.asarray(values, dtype=float).reshape(-1, self.num_series)
+        if len(values) == 0:
+            return
+        batch_mean = values.mean(axis=0)
+        batch_m2 = ((values - batch_mean) ** 2).sum(axis=0)
+        total = self.count + len(values)
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * len(values) / total
+        self._m2 = self._m2 + batch_m2 + delta**2 * self.count * len(values) / total
+        self.minimum = np.minimum(self.minimum, values.min(axis=0))
+        self.maximum = np.maximum(self.maximum, values.max(axis=0))
+
+        for row in values:
+            if self.count < 5:
+                self._first[self.count] = row
+                if self.count == 4:
+                    self._start_markers()
+            else:
+                self._add(row)
+            self.count += 1
+
+    def percentile_values(self) -> np.ndarray:
+        """
+        Returns the estimated percentiles.
+
+        Returns:
+            np.ndarray: The percentiles of shape (percentiles, series), exact for up to five
+                        samples and NaN without samples.
+        """
+        if self.count == 0:
+            return np.full((len(self.percentiles), self.num_series), np.nan)
+        if self.count < 5:
+            return np.percentile(self._first[: self.count], self.percentiles, axis=0)
+        return self._heights[:, :, 2].copy()
+
+    def _start_markers(self):
+        """Places the markers at the first five samples."""
+        n_percentiles = len(self.percentiles)
+        heights = np.sort(self._first, axis=0).T
+        self._heights = np.repeat(heights[np.newaxis], n_percentiles, axis=0)
+        self._positions = np.broadcast_to(
+            np.arange(1.0, 6.0), self._heights.shape
+        ).copy()
+        self._desired = self._initial_positions.copy()
+
+    def _add(self, value: np.ndarray):
+        """Moves the markers of all series and percentiles for one sample."""
+        q, n = self._heights, self._positions
+        cell = (value[:, np.newaxis] >= q[:, :, 1:4]).sum(axis=2)
+        q[:, :, 0] = np.minimum(q[:, :, 0], value)
+        q[:, :, 4] = np.maximum(q[:, :, 4], value)
+        n += np.arange(5) > cell[:, :, np.newaxis]
+        self._desired += self._increments
+        for i in (1, 2, 3):
+            offset = self._desired[:, :, i] - n[:, :, i]
+            up = (offset >= 1) & (n[:, :, i + 1] - n[:, :, i] > 1)
+            down = (offset <= -1) & (n[:, :, i - 1] - n[:, :, i] < -1)
+            move = up | down
+            if not move.any():
+                continue
+            step = np.where(up, 1.0, -1.0)
+            q_low, q_mid, q_high = q[:, :, i - 1], q[:, :, i], q[:, :, i + 1]
+            n_low, n_mid, n_high = n[:, :, i - 1], n[:, :, i], n[:, :, i + 1]
+            parabolic = q_mid + step / (n_high - n_low) * (
+                (n_mid - n_low + step) * (q_high - q_mid) / (n_high - n_mid)
+                + (n_high - n_mid - step) * (q_mid - q_low) / (n_mid - n_low)
+            )
+            linear = q_mid + step * (np.where(up, q_high, q_low) - q_mid) / (
+                np.where(up, n_high, n_low) - n_mid
+            )
+            inside = (q_low < parabolic) & (parabolic < q_high)
+            q[:, :, i] = np.where(move, np.where(inside, parabolic, linear), q_mid)
+            n[:, :, i] += np.where(move, step, 0.0)
+
+
+class MonteCarloAnalysis:
+    """
+    Samples the specific earth resistance of all buses and branches for one fault.
+
+    The base case is calculated with `run_fault` when the analysis is created. `run` can be called
+    several times; the statistics cover all samples drawn so far.
+
+    Attributes:
+        network (Network): The network of the base case.
+        fault_name (str): The fault of the base case.
+        sigma (float): The standard deviation of the logarithm of the resistivities.
+        batch_size (int): The number of samples solved together.
+        n_samples (int): The number of samples so far.
+    """
+
+    def __init__(
+        self,
+        network: Network,
+        fault_name: str,
+        sigma: float = 0.3,
+        sampler: Optional[
+            Callable[[np.random.Generator, np.ndarray, int], np.ndarray]
+        ] = None,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        seed: Optional[int] = None,
+    ):
+        """
+        Calculates the base case of the Monte Carlo analysis.
+
+        Args:
+            network (Network): The network to analyse.
+            fault_name (str): The name of the fault.
+            sigma (float, optional): The resistivities are lognormally distributed around their
+                                     values in the network, which are the medians, with this
+                                     standard deviation of their logarithm. Defaults to 0.3.
+            sampler (Optional[Callable], optional): Draws the resistivities instead, called as
+                sampler(rng, nominal, size) with the random generator, the resistivities of the
+                buses followed by the branches and the number of samples, and returning an array of
+                shape (size, len(nominal)). Defaults to independent lognormal samples.
+            percentiles (Sequence[float], optional): The percentiles of the statistics in percent.
+                                                     Defaults to (5, 50, 95).
+            batch_size (int, optional): The number of samples solved together. Larger batches are
+                                        faster but need memory for the admittances of all
+                                        samples, elements and frequencies. Defaults to 32.
+            seed (Optional[int], optional): The seed of the random generator. Defaults to None.
+
+        Raises:
+            ValueError: If the fault does not exist in the network, or a parameter is out of range.
+        """
+        from groundinsight.network_operations import run_fault
+
+        if fault_name not in network.faults:
+            raise ValueError(
+                f"Fault '{fault_name}' does not exist in the network '{network.name}'."
+            )
+        if sigma < 0 or batch_size <= 0:
+            raise ValueError(
+                "sigma must not be negative and batch_size must be positive."
+            )
+        run_fault(network, fault_name)
+        self.network = network
+        self.fault_name = fault_name
+        self.sigma = sigma
+        self.batch_size = batch_size
+        self.n_samples = 0
+        self._sampler = sampler
+        self._rng = np.random.default_rng(seed)
+        self.electrical_network = network.electrical_network
+        self.frequencies = list(network.frequencies)
+        self.bus_names = list(self.electrical_network.bus_indices)
+        self.fault_bus_index = self.electrical_network.bus_indices[
+            network.faults[fault_name].bus
+        ]
+        self._prepare()
+        self._epr = StreamingStatistics(
+            len(self.bus_names) * (len(self.frequencies) + 1), percentiles
+        )
+        self._reduction_factor = StreamingStatistics(len(self.frequencies), percentiles)
+
+    def run(self, n_samples: int) -> pl.DataFrame:
+        """
+        Draws and solves samples and adds them to the statistics.
+
+        Args:
+            n_samples (int): The number of samples.
+
+        Returns:
+            pl.DataFrame: The EPR statistics of all samples so far, see `epr_statistics`.
+
+        Raises:
+            ValueError: If the sampler returns an array of the wrong shape.
+            RuntimeError: If the admittance matrix of a sample is singular.
+        """
+        for start in range(0, n_samples, self.batch_size):
+            size = min(self.batch_size, n_samples - start)
+            rho = self._sample(size)
+            voltages = self._solve(rho)
+            epr = np.abs(voltages[:, :, :, 0])
+            rms = np.sqrt(np.sum(epr**2, axis=2, keepdims=True))
+            self._epr.update(
+                np.concatenate([epr, rms], axis=2).transpose(1, 0, 2).reshape(size, -1)
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                reduction_factor = np.abs(
+                    voltages[self.fault_bus_index, :, :, 0]
+                ) / np.abs(voltages[self.fault_bus_index, :, :, 1])
+            self._reduction_factor.update(reduction_factor)
+            self.n_samples += size
+        return self.epr_statistics()
+
+    def epr_statistics(self) -> pl.DataFrame:
+        """
+        Returns the statistics of the EPR of all buses.
+
+        Returns:
+            pl.DataFrame: Per bus one row per frequency and one RMS row (null frequency) with the
+                          columns `bus_name`, `fault`, `frequency_Hz`, `RMS`, `samples`,
+                          `EPR_mean_V`, `EPR_std_V`, `EPR_min_V`, `EPR_max_V` and one column
+                          `EPR_p<percentile>_V` per percentile, e.g. `EPR_p95_V`.
+
+        Raises:
+            RuntimeError: If no samples have been drawn yet.
+        """
+        n_rows = len(self.frequencies) + 1
+        frequencies = np.array(self.frequencies + [np.nan])
+        columns = {
+            "bus_name": pl.Series(
+                np.repeat(np.array(self.bus_names, dtype=object), n_rows).tolist(),
+                dtype=pl.String,
+            ),
+            "fault": pl.Series(
+                [self.fault_name] * (len(self.bus_names) * n_rows), dtype=pl.String
+            ),
+            "frequency_Hz": pl.Series(
+                np.tile(frequencies, len(self.bus_names)),
+                dtype=pl.Float64,
+                nan_to_null=True,
+            ),
+            "RMS": pl.Series(
+                np.tile(np.arange(n_rows) == n_rows - 1, len(self.bus_names)),
+                dtype=pl.Boolean,
+            ),
+        }
+        columns.update(self._statistics_columns(self._epr, "EPR", "_V"))
+        return pl.DataFrame(columns)
+
+    def reduction_factor_statistics(self) -> pl.DataFrame:
+        """
+        Returns the statistics of the reduction factor of the fault.
+
+        Returns:
+            pl.DataFrame: One row per frequency with the columns `fault`, `frequency_Hz`,
+                          `samples`, `RF_mean`, `RF_std`, `RF_min`, `RF_max` and one column
+                          `RF_p<percentile>` per percentile. Samples without EPR without mutual
+                          currents have no reduction factor and make the statistics NaN.
+
+        Raises:
+            RuntimeError: If no samples have been drawn yet.
+        """
+        columns = {
+            "fault": pl.Series(
+                [self.fault_name] * len(self.frequencies), dtype=pl.String
+            ),
+            "frequency_Hz": pl.Series(self.frequencies, dtype=pl.Float64),
+        }
+        columns.update(self._statistics_columns(self._reduction_factor, "RF", ""))
+        return pl.DataFrame(columns)
+
+    def _statistics_columns(
+        self, statistics: StreamingStatistics, prefix: str, unit: str
+    ) -> Dict[str, pl.Series]:
+        """Returns the columns of the statistics of all series."""
+        if statistics.count == 0:
+            raise RuntimeError("No samples have been drawn yet, call run first.")
+        columns = {
+            "samples": pl.Series(
+                np.full(statistics.num_series, statistics.count), dtype=pl.Int64
+            ),
+            f"{prefix}_mean{unit}": pl.Series(statistics.mean, dtype=pl.Float64),
+            f"{prefix}_std{unit}": pl.Series(statistics.std, dtype=pl.Float64),
+            f"{prefix}_min{unit}": pl.Series(statistics.minimum, dtype=pl.Float64),
+            f"{prefix}_max{unit}": pl.Series(statistics.maximum, dtype=pl.Float64),
+        }
+        for percentile, values in zip(
+            statistics.percentiles, statistics.percentile_values()
+        ):
+            columns[f"{prefix}_p{percentile:g}{unit}"] = pl.Series(
+                values, dtype=pl.Float64
+            )
+        return columns
+
+    def _prepare(self):
+        """Collects the data of the base case that all samples share."""
+        from groundinsight.electrical_network import admittance_entries
+
+        network = self.network
+        electrical_network = self.electrical_network
+        buses = list(network.buses.values())
+        branches = list(network.branches.values())
+        self._nominal = np.array(
+            [bus.specific_earth_resistance for bus in buses]
+            + [branch.specific_earth_resistance for branch in branches]
+        )
+        self._lengths = np.array([branch.length for branch in branches])
+        self._bus_formulas = _formula_groups(buses, "impedance_formula")
+        self._self_formulas = _formula_groups(branches, "self_impedance_formula")
+        self._mutual_formulas = _formula_groups(branches, "mutual_impedance_formula")
+        self._conducting = np.array(
+            [branch.type.grounding_conductor for branch in branches], dtype=bool
+        )
+        self._couplings = np.array(
+            [
+                [
+                    electrical_network.mutual_couplings[freq].get(branch.name, 0)
+                    for freq in self.frequencies
+                ]
+                for branch in branches
+            ],
+            dtype=complex,
+        ).reshape(len(branches), len(self.frequencies))
+        self._currents = np.stack(
+            [electrical_network.i_vectors_no_mutual[freq] for freq in self.frequencies],
+            axis=1,
+        )
+
+        num_buses = len(self.bus_names)
+        bus_indices = electrical_network.bus_indices
+        from_index = np.array([bus_indices[branch.from_bus] for branch in branches])
+        to_index = np.array([bus_indices[branch.to_bus] for branch in branches])
+        self._incidence = csr_matrix(
+            (
+                np.concatenate([np.ones(len(branches)), -np.ones(len(branches))]),
+                (
+                    np.concatenate([from_index, to_index]),
+                    np.tile(np.arange(len(branches)), 2),
+                ),
+            ),
+            shape=(num_buses, len(branches)),
+        )
+
+        # the elements of the pattern of the base case; elements outside of it are always zero
+        analysis = electrical_network.symbolic_analysis
+        if analysis is None:
+            pattern = sum(
+                abs(matrix) for matrix in electrical_network.Y_matrices.values()
+            )
+            analysis = SymbolicAnalysis(csc_matrix(pattern))
+        self._analysis = analysis
+        columns = np.repeat(np.arange(num_buses), np.diff(analysis.indptr))
+        keys = columns.astype(np.int64) * num_buses + analysis.indices
+        rows, cols = admittance_entries(network, bus_indices)
+        entries = cols.astype(np.int64) * num_buses + rows
+        slots = np.minimum(np.searchsorted(keys, entries), len(keys) - 1)
+        inside = keys[slots] == entries
+        self._scatter = csr_matrix(
+            (np.ones(inside.sum()), (slots[inside], np.flatnonzero(inside))),
+            shape=(len(keys), len(entries)),
+        )
+
+        topology = analysis.tree_topology()
+        if topology is not None and not topology.is_efficient(
+            self.batch_size * len(self.frequencies)
+        ):
+            topology = None
+        self._topology = topology
+        if topology is not None:
+            buses_with_parent = np.flatnonzero(topology.parent >= 0)
+            self._diagonal_slots = np.searchsorted(
+                keys, np.arange(num_buses, dtype=np.int64) * (num_buses + 1)
+            )
+            self._buses_with_parent = buses_with_parent
+            self._parent_slots = np.searchsorted(
+                keys,
+                topology.parent[buses_with_parent].astype(np.int64) * num_buses
+                + buses_with_parent,
+            )
+
+    def _sample(self, size: int) -> np.ndarray:
+        """Draws the resistivities of the buses and branches of a batch of samples."""
+        if self._sampler is None:
+            return self._nominal * np.exp(
+                self.sigma * self._rng.standard_normal((size, len(self._nominal)))
+            )
+        rho = np.asarray(
+            self._sampler(self._rng, self._nominal.copy(), size), dtype=float
+        )
+        if rho.shape != (size, len(self._nominal)):
+            raise ValueError(
+                f"The sampler returned an array of shape {rho.shape} instead of "
+                f"{(size, len(self._nominal))}."
+            )
+        return rho
+
+    def _solve(self, rho: np.ndarray) -> np.ndarray:
+        """
+        Solves the samples of a batch with and without mutual currents.
+
+        Args:
+            rho (np.ndarray): The resistivities of shape (samples, buses + branches).
+
+        Returns:
+            np.ndarray: The bus voltages of shape (buses, samples, frequencies, 2), with and
+                        without mutual currents along the last axis.
+        """
+        size = len(rho)
+        n_freq = len(self.frequencies)
+        num_buses = len(self.bus_names)
+        rho_buses, rho_branches = rho[:, :num_buses], rho[:, num_buses:]
+        y_bus = _admittances(self._impedances(self._bus_formulas, rho_buses))
+        y_self = _admittances(
+            self._impedances(self._self_formulas, rho_branches, self._lengths)
+        )
+        y_self[:, ~self._conducting] = 0
+        z_mutual = self._impedances(self._mutual_formulas, rho_branches, self._lengths)
+        with np.errstate(invalid="ignore"):
+            i_mutual = np.where(y_self != 0, self._couplings * z_mutual * y_self, 0)
+
+        # the elements of Y per sample and frequency in the order of `admittance_entries`
+        entries = np.concatenate(
+            [
+                y_bus.transpose(0, 2, 1),
+                (
+                    y_self.transpose(0, 2, 1)[:, :, :, np.newaxis] * _BRANCH_SIGNS
+                ).reshape(size, n_freq, -1),
+            ],
+            axis=2,
+        ).reshape(size * n_freq, -1)
+        values = self._scatter @ entries.T
+
+        currents = np.empty((num_buses, size * n_freq, 2), dtype=complex)
+        currents[:, :, 1] = np.tile(self._currents, (1, size))
+        currents[:, :, 0] = currents[:, :, 1] + self._incidence @ i_mutual.transpose(
+            1, 0, 2
+        ).reshape(-1, size * n_freq)
+
+        if self._topology is not None:
+            couplings = np.zeros((num_buses, size * n_freq), dtype=complex)
+            couplings[self._buses_with_parent] = values[self._parent_slots]
+            factorization = TreeFactorization.from_values(
+                self._topology, values[self._diagonal_slots], couplings
+            )
+            voltages = factorization.solve(currents)
+        else:
+            analysis = self._analysis
+            voltages = np.empty_like(currents)
+            # one contiguous row of values per matrix
+            values = np.ascontiguousarray(values.T)
+            for column in range(size * n_freq):
+                matrix = csc_matrix(
+                    (values[column], analysis.indices, analysis.indptr),
+                    shape=(num_buses, num_buses),
+                )
+                voltages[:, column] = analysis.factorize(matrix).solve(
+                    currents[:, column]
+                )
+        return voltages.reshape(num_buses, size, n_freq, 2)
+
+    def _impedances(
+        self,
+        groups: Dict[str, np.ndarray],
+        rho: np.ndarray,
+        lengths: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Evaluates the impedance formulas of a batch, of shape (samples, elements, frequencies)."""
+        size, n_elements = rho.shape
+        impedances = np.empty((size, n_elements, len(self.frequencies)), dtype=complex)
+        for formula, index in groups.items():
+            params = {"rho": rho[:, index].ravel()}
+            if lengths is not None:
+                params["l"] = np.tile(lengths[index], size)
+            impedances[:, index] = compute_impedance_array(
+                formula, self.frequencies, params
+            ).reshape(size, len(index), -1)
+        return impedances
+
+
+def _formula_groups(elements: List, formula_field: str) -> Dict[str, np.ndarray]:
+    """Returns the positions of buses or branches keyed by an impedance formula of their type."""
+    groups = {}
+    for position, element in enumerate(elements):
+        groups.setdefault(getattr(element.type, formula_field), []).append(position)
+    return {formula: np.array(positions) for formula, positions in groups.items()}
+
+
+def _admittances(impedances: np.ndarray) -> np.ndarray:
+    """Returns the admittances of impedances, zero for infinite or zero impedances."""
+    admittances = np.zeros_like(impedances)
+    np.divide(
+        1,
+        impedances,
+        out=admittances,
+        where=np.isfinite(impedances) & (impedances != 0),
+    )
+    return admittances
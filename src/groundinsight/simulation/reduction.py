@@ -0,0 +1,342 @@
+# simulation/reduction.py
+
+"""
+Network Reduction Module.
+
+This module eliminates buses from a network by Kron reduction. With the kept buses K and the
+eliminated buses E, the admittance matrix seen from the kept buses is the Schur complement
+
+    Y_red = Y_KK - Y_KE * Y_EE^-1 * Y_EK
+
+computed per frequency from a sparse LU factorization of Y_EE. For currents injected at the kept
+buses, Y_red gives the same bus voltages at the kept buses as the full network, so a large external
+grid can be replaced by a few boundary buses.
+
+The equivalent network keeps the kept buses, the branches between them and the sources and faults
+at them. The eliminated part becomes a new earth impedance of each kept bus and equivalent branches
+between the kept buses. Their values are stored as impedance formulas that tabulate the value per
+frequency, so an equivalent can be saved, loaded and attached to other networks with the same
+frequencies like any other elements. Mutual currents that sources would induce in the eliminated
+branches are not represented.
+
+The equivalent branches connect every pair of kept buses, so the paths between the sources and
+faults are not searched over them. The equivalent gets the paths of the network restricted to the
+kept branches, or the paths over the kept branches if the network has no paths.
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import splu
+from groundinsight.electrical_network import admittance_matrices
+from groundinsight.models.core_models import (
+    Branch,
+    BranchType,
+    Bus,
+    BusType,
+    Fault,
+    Network,
+    Path,
+)
+from groundinsight.pathfinder import PathFinder
+
+
+def kron_reduce(matrix, keep: np.ndarray) -> np.ndarray:
+    """
+    Eliminates all rows and columns of a sparse admittance matrix except the kept ones.
+
+    Args:
+        matrix: The sparse admittance matrix.
+        keep (np.ndarray): The indices of the kept rows and columns, in the order of the result.
+
+    Returns:
+        np.ndarray: The dense Schur complement of shape (len(keep), len(keep)).
+
+    Raises:
+        RuntimeError: If the matrix of the eliminated buses is singular.
+    """
+    matrix = csr_matrix(matrix)
+    eliminated = np.setdiff1d(np.arange(matrix.shape[0]), keep)
+    kept_rows = matrix[keep]
+    Y_KK = kept_rows[:, keep].toarray()
+    if not len(eliminated):
+        return Y_KK
+    eliminated_rows = matrix[eliminated]
+    Y_EE = eliminated_rows[:, eliminated].tocsc()
+    Y_EK = eliminated_rows[:, keep].toarray()
+    Y_KE = kept_rows[:, eliminated]
+    return Y_KK - Y_KE @ splu(Y_EE).solve(Y_EK)
+
+
+def reduced_admittance(
+    network: Network, keep_buses: List[str]
+) -> Dict[float, np.ndarray]:
+    """
+    Computes the admittance matrices of a network seen from some of its buses.
+
+    See `Network.reduced_admittance`.
+
+    Args:
+        network (Network): The network.
+        keep_buses (List[str]): The names of the kept buses.
+
+    Returns:
+        Dict[float, np.ndarray]: The dense reduced admittance matrix per frequency, with rows and
+                                 columns in the order of `keep_buses`.
+
+    Raises:
+        ValueError: If the kept buses are invalid, or if a part of the eliminated buses has no
+                    connection to earth.
+    """
+    bus_indices = {name: idx for idx, name in enumerate(network.buses)}
+    keep = np.array(
+        [bus_indices[name] for name in _check_keep_buses(network, keep_buses)]
+    )
+    reduced = {}
+    for freq, matrix in admittance_matrices(network, bus_indices).items():
+        try:
+            reduced[freq] = kron_reduce(matrix, keep)
+        except RuntimeError as e:
+            raise ValueError(
+                f"The eliminated buses of network '{network.name}' cannot be reduced at {freq} Hz, "
+                f"a part of them has no connection to earth: {e}"
+            )
+    return reduced
+
+
+def reduce_network(
+    network: Network,
+    keep_buses: List[str],
+    name: Optional[str] = None,
+    tolerance: float = 0.0,
+) -> Network:
+    """
+    Builds an equivalent network of the kept buses of a network.
+
+    See `Network.reduce`.
+
+    Args:
+        network (Network): The network.
+        keep_buses (List[str]): The names of the kept buses.
+        name (Optional[str], optional): The name of the equivalent network. Defaults to the name of
+                                        the network with the suffix "_reduced".
+        tolerance (float, optional): Equivalent branches whose admittance is at most `tolerance`
+                                     times the largest equivalent branch admittance at all
+                                     frequencies are left out. Defaults to 0.0.
+
+    Returns:
+        Network: The equivalent network.
+
+    Raises:
+        ValueError: If the kept buses are invalid, if a source or fault is at an eliminated bus, or
+                    if the network cannot be reduced.
+    """
+    keep_buses = _check_keep_buses(network, keep_buses)
+    kept = set(keep_buses)
+    for element in list(network.sources.values()) + list(network.faults.values()):
+        if element.bus not in kept:
+            raise ValueError(
+                f"'{element.name}' is at bus '{element.bus}', which is not kept. Keep all buses "
+                f"with sources and faults."
+            )
+    name = name or f"{network.name}_reduced"
+    frequencies = network.frequencies
+    reduced = reduced_admittance(network, keep_buses)
+
+    equivalent = Network(
+        name=name,
+        description=f"Kron reduction of network '{network.name}' to {len(keep_buses)} buses",
+        frequencies=frequencies,
+    )
+    # the rows of the Laplacian of the branches sum to zero, so the row sums of the reduced matrix
+    # are the earth admittances of the kept buses
+    for k, bus_name in enumerate(keep_buses):
+        bus = network.buses[bus_name]
+        admittances = [reduced[freq][k].sum() for freq in frequencies]
+        if not all(np.isfinite(admittances)) or any(y == 0 for y in admittances):
+            raise ValueError(f"The bus '{bus_name}' has no connection to earth.")
+        bus_type = BusType(
+            name=f"{name}.{bus_name}",
+            description=f"Earth impedance of bus '{bus_name}' including the eliminated buses",
+            system_type=bus.type.system_type,
+            voltage_level=bus.type.voltage_level,
+            impedance_formula=_tabulated_formula(
+                frequencies, [1 / y for y in admittances]
+            ),
+        )
+        equivalent.add_bus(
+            Bus(
+                name=bus_name,
+                description=bus.description,
+                type=bus_type,
+                impedance={},
+                specific_earth_resistance=bus.specific_earth_resistance,
+            )
+        )
+
+    # the branches between kept buses are kept, with the parallel coefficients they get in the
+    # network, so equivalent branches in parallel to them do not change their mutual currents
+    groups: Dict[tuple, List[Branch]] = {}
+    for branch in network.branches.values():
+        if branch.from_bus in kept and branch.to_bus in kept:
+            groups.setdefault((branch.from_bus, branch.to_bus), []).append(branch)
+    for group in groups.values():
+        for branch in group:
+            copy = branch.model_copy(deep=True)
+            if copy.parallel_coefficient is None:
+                copy.parallel_coefficient = 1.0 / len(group)
+            equivalent.add_branch(copy)
+
+    for source in network.sources.values():
+        equivalent.add_source(source.model_copy(deep=True))
+    for fault in network.faults.values():
+        equivalent.add_fault(
+            Fault(
+                name=fault.name,
+                description=fault.description,
+                bus=fault.bus,
+                scalings=dict(fault.scalings),
+            )
+        )
+    # the paths are defined before the equivalent branches are added
+    _add_equivalent_paths(network, equivalent)
+
+    # the eliminated buses couple the kept buses like branches with the admittance -Y_red[i, j]
+    # less the admittance of the kept branches between them
+    kept_matrices = admittance_matrices(
+        equivalent, {bus_name: k for k, bus_name in enumerate(keep_buses)}
+    )
+    upper = np.triu_indices(len(keep_buses), k=1)
+    admittances = np.array(
+        [
+            -(reduced[freq] - kept_matrices[freq].toarray())[upper]
+            for freq in frequencies
+        ]
+    ).T
+    magnitudes = np.abs(admittances).max(axis=1, initial=0.0)
+    threshold = tolerance * magnitudes.max(initial=0.0)
+    for i, j, values, magnitude in zip(*upper, admittances, magnitudes):
+        if magnitude == 0 or magnitude <= threshold:
+            continue
+        from_bus, to_bus = keep_buses[i], keep_buses[j]
+        branch_type = BranchType(
+            name=f"{name}.{from_bus}-{to_bus}",
+            description=f"Coupling of buses '{from_bus}' and '{to_bus}' through the eliminated buses",
+            grounding_conductor=True,
+            self_impedance_formula=_tabulated_formula(frequencies, 1 / values),
+            mutual_impedance_formula="0",
+        )
+        equivalent.add_branch(
+            Branch(
+                name=f"{from_bus}-{to_bus}_equivalent",
+                type=branch_type,
+                length=1.0,
+                from_bus=from_bus,
+                to_bus=to_bus,
+                self_impedance={},
+                mutual_impedance={},
+                parallel_coefficient=0.0 if (from_bus, to_bus) in groups else 1.0,
+            )
+        )
+    return equivalent
+
+
+def _add_equivalent_paths(network: Network, equivalent: Network):
+    """
+    Adds the paths between the sources and faults of an equivalent network over its kept branches.
+
+    The paths of the network are restricted to the kept branches. If the network has no paths,
+    they are searched over the kept branches of the equivalent. A source and fault without a path
+    over the kept branches get a path without segments, so `run_fault` does not search the
+    equivalent network again.
+
+    Args:
+        network (Network): The reduced network.
+        equivalent (Network): The equivalent network with its buses, kept branches, sources and
+                              faults, but without the equivalent branches.
+    """
+    if network.paths:
+        candidates = [
+            (path.source, path.fault, [segment.name for segment in path.segments])
+            for path in network.paths.values()
+        ]
+    else:
+        pathfinder = PathFinder(equivalent)
+        candidates = [
+            (source_name, fault_name, [segment.name for segment in path.segments])
+            for source_name, source in equivalent.sources.items()
+            for fault_name, fault in equivalent.faults.items()
+            for path in pathfinder.find_paths(source.bus, fault.bus)
+        ]
+    # paths restricted to the kept branches, with the paths left without segments last
+    restricted = [
+        (
+            source_name,
+            fault_name,
+            [
+                equivalent.branches[branch_name]
+                for branch_name in segment_names
+                if branch_name in equivalent.branches
+            ],
+        )
+        for source_name, fault_name, segment_names in candidates
+    ]
+    restricted.sort(key=lambda candidate: not candidate[2])
+    restricted += [
+        (source_name, fault_name, [])
+        for source_name in equivalent.sources
+        for fault_name in equivalent.faults
+    ]
+
+    connected = set()
+    seen_paths = set()
+    for source_name, fault_name, segments in restricted:
+        signature = (source_name, fault_name, tuple(branch.name for branch in segments))
+        # paths without segments are only kept for sources and faults without another path
+        if signature in seen_paths or (
+            not segments and (source_name, fault_name) in connected
+        ):
+            continue
+        seen_paths.add(signature)
+        connected.add((source_name, fault_name))
+        equivalent.add_path(
+            Path(
+                name=f"path_{len(seen_paths)}",
+                description=f"Path from {source_name} to {fault_name}",
+                source=source_name,
+                fault=fault_name,
+                segments=segments,
+            )
+        )
+
+
+def _check_keep_buses(network: Network, keep_buses: List[str]) -> List[str]:
+    """
+    Validates the kept buses of a reduction.
+
+    Returns:
+        List[str]: The kept buses.
+
+    Raises:
+        ValueError: If no bus is kept, a bus is kept twice or is not in the network.
+    """
+    keep_buses = list(keep_buses)
+    if not keep_buses:
+        raise ValueError("At least one bus must be kept.")
+    if len(set(keep_buses)) != len(keep_buses):
+        raise ValueError("The kept buses contain duplicates.")
+    missing = [bus for bus in keep_buses if bus not in network.buses]
+    if missing:
+        raise ValueError(
+            f"The buses {missing} are not in the network '{network.name}'."
+        )
+    return keep_buses
+
+
+def _tabulated_formula(frequencies: List[float], values) -> str:
+    """Returns an impedance formula that evaluates to the given value at each frequency."""
+    cases = []
+    for freq, value in zip(frequencies, values):
+        value = complex(value)
+        cases.append(f"(({value.real!r} + {value.imag!r}*j), Eq(f, {float(freq)!r}))")
+    return f"Piecewise({', '.join(cases)})"
@@ -0,0 +1,295 @@
+# simulation/sensitivity.py
+
+"""
+Sensitivity Analysis Module.
+
+This module computes the derivatives of the EPR at the fault bus and of the reduction factor with
+respect to the impedances of all buses and branches of a solved network, without perturbing and
+solving the network once per element. The EPR is u_f = e_f^T u with Y * u = i, so a change of an
+impedance Z changes it by
+
+    du_f / dZ = lambda^T * (dI / dZ - dY / dZ * u)
+
+with the adjoint vector lambda = Y^-T * e_f. The admittance matrix is symmetric, so lambda is the
+column of the fault bus of Z = Y^-1: one solve per frequency with the factorization of the base
+case covers all elements. The earth impedance of bus k enters Y as 1 / Z on the diagonal, the self
+impedance of a branch between buses a and b as 1 / Z along e = e_a - e_b and, like its mutual
+impedance, through the mutual current coupling * Z_mutual / Z_self injected along e. The reduction
+factor is |u_f| / |u0_f|, where u0 is solved without the mutual currents, so its derivatives follow
+from those of both EPRs.
+
+The EPR is analytic in the impedances, so its derivative is a complex number. The magnitudes are
+not: their change for a complex impedance change dZ is Re(g * dZ) with the gradient g. The relative
+sensitivities are the changes for a proportional change Z -> (1 + eps) * Z, e.g. of the soil
+resistivity, and allow to rank elements with different impedances.
+"""
+
+from typing import Iterable, List, Optional
+import numpy as np
+import polars as pl
+from groundinsight.models.core_models import Network
+
+
+class SensitivityAnalysis:
+    """
+    Computes the sensitivities of the EPR and the reduction factor of one fault to all impedances.
+
+    The base case is calculated with `run_fault` when the analysis is created. The adjoint vectors
+    are the columns of the fault bus of the transfer impedance cache of the electrical network.
+
+    Attributes:
+        network (Network): The network of the base case.
+        fault_name (str): The fault of the base case.
+    """
+
+    def __init__(self, network: Network, fault_name: str):
+        """
+        Calculates the base case of the sensitivity analysis.
+
+        Args:
+            network (Network): The network to analyse.
+            fault_name (str): The name of the fault.
+
+        Raises:
+            ValueError: If the fault does not exist in the network.
+        """
+        from groundinsight.network_operations import run_fault
+
+        if fault_name not in network.faults:
+            raise ValueError(
+                f"Fault '{fault_name}' does not exist in the network '{network.name}'."
+            )
+        run_fault(network, fault_name)
+        self.network = network
+        self.fault_name = fault_name
+        self.electrical_network = network.electrical_network
+        self.frequencies = list(network.frequencies)
+        self.fault_bus = network.faults[fault_name].bus
+        self.fault_bus_index = self.electrical_network.bus_indices[self.fault_bus]
+
+    def impedance_sensitivities(
+        self,
+        buses: Optional[Iterable[str]] = None,
+        branches: Optional[Iterable[str]] = None,
+    ) -> pl.DataFrame:
+        """
+        Computes the sensitivities to the earth impedances of buses and the impedances of branches.
+
+        Args:
+            buses (Optional[Iterable[str]], optional): The names of the buses. Defaults to all buses.
+            branches (Optional[Iterable[str]], optional): The names of the branches. Defaults to all
+                                                          branches.
+
+        Returns:
+            pl.DataFrame: Per impedance one row per frequency and one RMS row (null frequency) with
+                          the columns `element_type` ("bus" or "branch"), `element`, `impedance`
+                          ("impedance", "self_impedance" or "mutual_impedance"), `frequency_Hz`,
+                          `RMS`, `dEPR_dZ_real` and `dEPR_dZ_imag` (the derivative of the EPR
+                          phasor at the fault bus in V/Ohm), `EPR_sensitivity` (the relative change
+                          of the EPR magnitude per relative change of Z, of the RMS EPR in the RMS
+                          row), `dRF_dZ_real` and `dRF_dZ_imag` (the gradient of the reduction
+                          factor in 1/Ohm) and `RF_sensitivity` (the change of the reduction factor
+                          per relative change of Z). Branches without grounding conductor and
+                          missing impedances have zero sensitivities. The derivatives are null in
+                          the RMS rows, the reduction factor columns also where it is undefined.
+
+        Raises:
+            ValueError: If a bus or branch does not exist in the network.
+
+        Examples:
+            >>> analysis = SensitivityAnalysis(network, "fault1")
+            >>> frame = analysis.impedance_sensitivities()
+            >>> frame.filter(pl.col("RMS")).sort("EPR_sensitivity").head(5)
+        """
+        bus_names = list(self.network.buses if buses is None else buses)
+        branch_names = list(self.network.branches if branches is None else branches)
+        for name in bus_names:
+            if name not in self.network.buses:
+                raise ValueError(
+                    f"Bus '{name}' does not exist in the network '{self.network.name}'."
+                )
+        for name in branch_names:
+            if name not in self.network.branches:
+                raise ValueError(
+                    f"Branch '{name}' does not exist in the network '{self.network.name}'."
+                )
+
+        electrical_network = self.electrical_network
+        bus_indices = electrical_network.bus_indices
+        bus_index = np.array([bus_indices[name] for name in bus_names], dtype=np.int64)
+        branch_list = [self.network.branches[name] for name in branch_names]
+        from_index = np.array(
+            [bus_indices[branch.from_bus] for branch in branch_list], dtype=np.int64
+        )
+        to_index = np.array(
+            [bus_indices[branch.to_bus] for branch in branch_list], dtype=np.int64
+        )
+        n_freq = len(self.frequencies)
+        # impedances in the order buses, branch self impedances, branch mutual impedances
+        n_elements = len(bus_names) + 2 * len(branch_names)
+        impedances = np.zeros((n_elements, n_freq), dtype=complex)
+        depr = np.zeros((n_elements, n_freq), dtype=complex)
+        depr0 = np.zeros((n_elements, n_freq), dtype=complex)
+        epr = np.zeros(n_freq, dtype=complex)
+        epr0 = np.zeros(n_freq, dtype=complex)
+        n_bus = len(bus_names)
+        self_rows = slice(n_bus, n_bus + len(branch_names))
+        mutual_rows = slice(n_bus + len(branch_names), n_elements)
+
+        for f, freq in enumerate(self.frequencies):
+            adjoint = electrical_network.transfer_impedances.column(
+                self.fault_bus, freq
+            )
+            u = electrical_network.u_vectors[freq]
+            u0 = electrical_network.u_vectors_no_mutual[freq]
+            epr[f] = u[self.fault_bus_index]
+            epr0[f] = u0[self.fault_bus_index]
+
+            z_bus = np.array(
+                [
+                    _impedance(self.network.buses[name].impedance, freq)
+                    for name in bus_names
+                ],
+                dtype=complex,
+            )
+            y_bus = _inverse(z_bus)
+            impedances[:n_bus, f] = z_bus
+            depr[:n_bus, f] = adjoint[bus_index] * u[bus_index] * y_bus**2
+            depr0[:n_bus, f] = adjoint[bus_index] * u0[bus_index] * y_bus**2
+
+            i_mutuals = electrical_network.i_mutuals.get(freq, {})
+            couplings = electrical_network.mutual_couplings.get(freq, {})
+            z_self = np.array(
+                [_impedance(branch.self_impedance, freq) for branch in branch_list],
+                dtype=complex,
+            )
+            z_mutual = np.array(
+                [_impedance(branch.mutual_impedance, freq) for branch in branch_list],
+                dtype=complex,
+            )
+            conducting = np.array(
+                [branch.type.grounding_conductor for branch in branch_list], dtype=bool
+            )
+            y_self = np.where(conducting, _inverse(z_self), 0)
+            i_mutual = np.array(
+                [i_mutuals.get(name, 0) for name in branch_names], dtype=complex
+            )
+            coupling = np.array(
+                [couplings.get(name, 0) for name in branch_names], dtype=complex
+            )
+            adjoint_drop = adjoint[from_index] - adjoint[to_index]
+            impedances[self_rows, f] = z_self
+            impedances[mutual_rows, f] = z_mutual
+            depr[self_rows, f] = adjoint_drop * (
+                y_self**2 * (u[from_index] - u[to_index]) - i_mutual * y_self
+            )
+            depr0[self_rows, f] = (
+                adjoint_drop * y_self**2 * (u0[from_index] - u0[to_index])
+            )
+            depr[mutual_rows, f] = adjoint_drop * coupling * y_self
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            epr_sensitivity = np.real(impedances * depr / epr)
+            reduction_factor = np.abs(epr) / np.abs(epr0)
+            drf = reduction_factor * (depr / epr - depr0 / epr0)
+        epr_sensitivity[:, epr == 0] = 0.0
+        squares = np.abs(epr) ** 2
+        total = squares.sum()
+        rms_sensitivity = (
+            epr_sensitivity @ squares / total if total > 0 else np.zeros(n_elements)
+        )
+        return self._frame(
+            bus_names,
+            branch_names,
+            depr,
+            epr_sensitivity,
+            rms_sensitivity,
+            drf,
+            np.real(impedances * drf),
+        )
+
+    def _frame(
+        self,
+        bus_names: List[str],
+        branch_names: List[str],
+        depr: np.ndarray,
+        epr_sensitivity: np.ndarray,
+        rms_sensitivity: np.ndarray,
+        drf: np.ndarray,
+        rf_sensitivity: np.ndarray,
+    ) -> pl.DataFrame:
+        """Builds the result frame with the frequency rows of each impedance before its RMS row."""
+        n_rows = len(self.frequencies) + 1
+        element_types = ["bus"] * len(bus_names) + ["branch"] * 2 * len(branch_names)
+        elements = bus_names + branch_names + branch_names
+        kinds = (
+            ["impedance"] * len(bus_names)
+            + ["self_impedance"] * len(branch_names)
+            + ["mutual_impedance"] * len(branch_names)
+        )
+        # per element the self impedance rows before the mutual impedance rows
+        order = np.arange(len(elements))
+        n_bus, n_branch = len(bus_names), len(branch_names)
+        order[n_bus:] = (
+            n_bus
+            + np.stack(
+                [np.arange(n_branch), n_branch + np.arange(n_branch)], axis=1
+            ).ravel()
+        )
+
+        def rows(values: np.ndarray, rms: Optional[np.ndarray] = None) -> np.ndarray:
+            rms = np.full(len(values), np.nan) if rms is None else rms
+            return np.column_stack([values[order], rms[order]]).ravel()
+
+        def repeat(values: List[str]) -> List[str]:
+            return np.repeat(np.array(values, dtype=object)[order], n_rows).tolist()
+
+        n_impedances = len(elements)
+        frequencies = np.array(self.frequencies + [np.nan])
+        return pl.DataFrame(
+            {
+                "element_type": pl.Series(repeat(element_types), dtype=pl.String),
+                "element": pl.Series(repeat(elements), dtype=pl.String),
+                "impedance": pl.Series(repeat(kinds), dtype=pl.String),
+                "frequency_Hz": pl.Series(
+                    np.tile(frequencies, n_impedances),
+                    dtype=pl.Float64,
+                    nan_to_null=True,
+                ),
+                "RMS": pl.Series(
+                    np.tile(np.arange(n_rows) == n_rows - 1, n_impedances),
+                    dtype=pl.Boolean,
+                ),
+                "dEPR_dZ_real": pl.Series(
+                    rows(depr.real), dtype=pl.Float64, nan_to_null=True
+                ),
+                "dEPR_dZ_imag": pl.Series(
+                    rows(depr.imag), dtype=pl.Float64, nan_to_null=True
+                ),
+                "EPR_sensitivity": pl.Series(
+                    rows(epr_sensitivity, rms_sensitivity), dtype=pl.Float64
+                ),
+                "dRF_dZ_real": pl.Series(
+                    rows(drf.real), dtype=pl.Float64, nan_to_null=True
+                ),
+                "dRF_dZ_imag": pl.Series(
+                    rows(drf.imag), dtype=pl.Float64, nan_to_null=True
+                ),
+                "RF_sensitivity": pl.Series(
+                    rows(rf_sensitivity), dtype=pl.Float64, nan_to_null=True
+                ),
+            }
+        )
+
+
+def _impedance(values, freq: float) -> complex:
+    """Returns the impedance at a frequency, zero if it is missing."""
+    value = values.get(freq)
+    return complex(value.real, value.imag) if value else 0j
+
+
+def _inverse(impedances: np.ndarray) -> np.ndarray:
+    """Returns the admittances of impedances, zero for missing (zero) impedances."""
+    admittances = np.zeros_like(impedances)
+    np.divide(1, impedances, out=admittances, where=impedances != 0)
+    return admittances
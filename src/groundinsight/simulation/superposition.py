@@ -0,0 +1,416 @@
+# simulation/superposition.py
+
+"""
+Superposition Module.
+
+The source currents of a fault enter the admittance equations Y * u = i only through the right-hand
+side: each source injects its current at its bus, the fault bus draws the sum of them, and the
+mutual currents induced in the branches of the paths of a source are proportional to its current.
+The bus voltages and branch currents are therefore linear combinations of the responses to a unit
+current of each source,
+
+    u = sum_s I_s * u_s,    i_branch = sum_s I_s * i_branch_s
+
+with I_s = scaling * value of source s at each frequency. This module stores the unit responses of a
+fault when it is calculated and rebuilds its result for new source values or fault scalings, e.g.
+from an updated short-circuit study, with a few matrix products instead of a new calculation. The
+reduction factor and the grounding impedance follow from the combined voltages of the fault bus
+with and without mutual currents.
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+import numpy as np
+from groundinsight.models.core_models import (
+    ComplexNumber,
+    Network,
+    Result,
+    ResultBranch,
+    ResultBus,
+    ResultGroundingImpedance,
+    ResultReductionFactor,
+    _complex_dicts,
+    _gc_paused,
+)
+
+if TYPE_CHECKING:
+    from groundinsight.electrical_network import ElectricalNetwork
+
+
+class UnitResponses:
+    """
+    The results of a fault per unit current of each of its sources.
+
+    Sources without a path to the fault do not contribute to the results and are left out. The
+    arrays have the frequencies as their first axis and the sources as their last axis.
+
+    Attributes:
+        fault_name (str): The name of the fault.
+        fault_bus (str): The bus of the fault.
+        frequencies (List[float]): The frequencies of the network.
+        sources (List[str]): The names of the sources with a path to the fault.
+        bus_names (List[str]): The names of the buses in the order of the arrays.
+        branch_names (List[str]): The names of the branches in the order of the arrays.
+        voltages (np.ndarray): The bus voltages of shape (frequencies, buses, sources).
+        fault_voltages_no_mutual (np.ndarray): The voltages of the fault bus without mutual currents
+                                               of shape (frequencies, sources).
+        branch_currents (np.ndarray): The branch currents of shape (frequencies, branches, sources).
+        bus_impedances (np.ndarray): The earth impedances of the buses of shape (frequencies, buses).
+        network_hash (str): The content hash of the network the responses are valid for.
+    """
+
+    def __init__(
+        self,
+        fault_name: str,
+        fault_bus: str,
+        frequencies: List[float],
+        sources: List[str],
+        bus_names: List[str],
+        branch_names: List[str],
+        voltages: np.ndarray,
+        fault_voltages_no_mutual: np.ndarray,
+        branch_currents: np.ndarray,
+        bus_impedances: np.ndarray,
+        network_hash: str,
+    ):
+        self.fault_name = fault_name
+        self.fault_bus = fault_bus
+        self.frequencies = frequencies
+        self.sources = sources
+        self.bus_names = bus_names
+        self.branch_names = branch_names
+        self.voltages = voltages
+        self.fault_voltages_no_mutual = fault_voltages_no_mutual
+        self.branch_currents = branch_currents
+        self.bus_impedances = bus_impedances
+        self.network_hash = network_hash
+
+    @classmethod
+    def from_electrical_network(
+        cls, electrical_network: "ElectricalNetwork"
+    ) -> "UnitResponses":
+        """
+        Computes the unit responses of the active fault of a solved electrical network.
+
+        The unit right-hand sides of all sources are solved together per frequency with the
+        factorizations of the admittance matrices, so no new factorization is needed.
+
+        Args:
+            electrical_network (ElectricalNetwork): The electrical network after `solve_network`.
+
+        Returns:
+            UnitResponses: The unit responses of the active fault.
+        """
+        network = electrical_network.network
+        fault_name = network.active_fault
+        fault_bus = network.faults[fault_name].bus
+        frequencies = list(network.frequencies)
+        bus_indices = electrical_network.bus_indices
+        fault_idx = bus_indices[fault_bus]
+        branch_names = list(network.branches)
+        branch_indices = {name: k for k, name in enumerate(branch_names)}
+        paths_from_sources = electrical_network._get_paths_from_sources_to_fault()
+        sources = [name for name, branches in paths_from_sources.items() if branches]
+
+        n_freq, n_buses, n_branches = (
+            len(frequencies),
+            len(bus_indices),
+            len(branch_names),
+        )
+        injections = np.zeros((n_freq, n_buses, len(sources)), dtype=complex)
+        mutual_currents = np.zeros((n_freq, n_branches, len(sources)), dtype=complex)
+        for s, source_name in enumerate(sources):
+            source_idx = bus_indices[network.sources[source_name].bus]
+            injections[:, source_idx, s] += 1
+            injections[:, fault_idx, s] -= 1
+        injections_no_mutual = injections.copy()
+
+        # the mutual currents of a unit source current, with the signs of `_add_mutual_currents`
+        for s, source_name in enumerate(sources):
+            source_idx = bus_indices[network.sources[source_name].bus]
+            for branch_name in paths_from_sources[source_name]:
+                branch = network.branches.get(branch_name)
+                if branch is None or not branch.type.grounding_conductor:
+                    continue
+                from_idx = bus_indices[branch.from_bus]
+                to_idx = bus_indices[branch.to_bus]
+                sign = 1 if source_idx > min(from_idx, to_idx) else -1
+                b = branch_indices[branch_name]
+                for k, freq in enumerate(frequencies):
+                    Z_self = branch.self_impedance.get(freq)
+                    Z_mutual = branch.mutual_impedance.get(freq)
+                    if Z_self and Z_mutual:
+                        i_mut = (
+                            sign
+                            * branch.parallel_coefficient
+                            * complex(Z_mutual)
+                            / complex(Z_self)
+                        )
+                        injections[k, from_idx, s] += i_mut
+                        injections[k, to_idx, s] -= i_mut
+                        mutual_currents[k, b, s] += i_mut
+
+        from_indices = np.array(
+            [bus_indices[branch.from_bus] for branch in network.branches.values()],
+            dtype=np.int64,
+        )
+        to_indices = np.array(
+            [bus_indices[branch.to_bus] for branch in network.branches.values()],
+            dtype=np.int64,
+        )
+        branch_admittances = np.zeros((n_freq, n_branches), dtype=complex)
+        bus_impedances = np.empty((n_freq, n_buses), dtype=complex)
+        for k, freq in enumerate(frequencies):
+            for b, branch in enumerate(network.branches.values()):
+                impedance = branch.self_impedance.get(freq)
+                if impedance and branch.type.grounding_conductor:
+                    branch_admittances[k, b] = 1 / complex(impedance)
+            for bus_name, idx in bus_indices.items():
+                bus_impedances[k, idx] = complex(
+                    network.buses[bus_name].impedance[freq]
+                )
+
+        if not electrical_network.factorizations:
+            electrical_network._factorize()
+        voltages = np.empty_like(injections)
+        fault_voltages_no_mutual = np.empty((n_freq, len(sources)), dtype=complex)
+        for k, freq in enumerate(frequencies):
+            factorization = electrical_network.factorizations[freq]
+            voltages[k] = factorization.solve(injections[k])
+            fault_voltages_no_mutual[k] = factorization.solve(injections_no_mutual[k])[
+                fault_idx
+            ]
+        branch_currents = (
+            voltages[:, to_indices] - voltages[:, from_indices]
+        ) * branch_admittances[:, :, None] + mutual_currents
+
+        bus_names = [None] * n_buses
+        for bus_name, idx in bus_indices.items():
+            bus_names[idx] = bus_name
+        return cls(
+            fault_name=fault_name,
+            fault_bus=fault_bus,
+            frequencies=frequencies,
+            sources=sources,
+            bus_names=bus_names,
+            branch_names=branch_names,
+            voltages=voltages,
+            fault_voltages_no_mutual=fault_voltages_no_mutual,
+            branch_currents=branch_currents,
+            bus_impedances=bus_impedances,
+            network_hash=electrical_network.network_hash,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the arrays in bytes."""
+        return (
+            self.voltages.nbytes
+            + self.fault_voltages_no_mutual.nbytes
+            + self.branch_currents.nbytes
+            + self.bus_impedances.nbytes
+        )
+
+    def source_currents(self, network: Network) -> np.ndarray:
+        """
+        Returns the currents of the sources for the fault, their values times the fault scalings.
+
+        Args:
+            network (Network): The network with the current source values and fault scalings.
+
+        Returns:
+            np.ndarray: The source currents of shape (frequencies, sources).
+        """
+        scalings = network.faults[self.fault_name].scalings
+        currents = np.zeros((len(self.frequencies), len(self.sources)), dtype=complex)
+        for s, source_name in enumerate(self.sources):
+            values = network.sources[source_name].values
+            for k, freq in enumerate(self.frequencies):
+                value = values.get(freq)
+                if value is not None:
+                    currents[k, s] = scalings.get(freq, 1) * complex(value)
+        return currents
+
+    def result(self, network: Network, network_hash: Optional[str] = None) -> Result:
+        """
+        Combines the unit responses into the result of the fault for the current source values.
+
+        Args:
+            network (Network): The network with the current source values and fault scalings.
+            network_hash (Optional[str], optional): The content hash of the network, if it is
+                                                    already known. Defaults to None.
+
+        Returns:
+            Result: The result of the fault, in the format of `run_fault`.
+        """
+        currents = self.source_currents(network)
+        voltages = np.matmul(self.voltages, currents[:, :, None])[:, :, 0].T
+        branch_currents = np.matmul(self.branch_currents, currents[:, :, None])[
+            :, :, 0
+        ].T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bus_currents = voltages / self.bus_impedances.T
+        bus_currents[self.bus_impedances.T == 0] = 0
+
+        fault_idx = self.bus_names.index(self.fault_bus)
+        fault_voltages = voltages[fault_idx]
+        fault_voltages_no_mutual = (self.fault_voltages_no_mutual * currents).sum(
+            axis=1
+        )
+        total_currents = currents.sum(axis=1)
+        reduction_factors = {}
+        grounding_impedances = {}
+        for k, freq in enumerate(self.frequencies):
+            magnitude_without = abs(fault_voltages_no_mutual[k])
+            reduction_factor = (
+                abs(fault_voltages[k]) / magnitude_without
+                if magnitude_without != 0
+                else None
+            )
+            reduction_factors[freq] = reduction_factor
+            if not reduction_factor or total_currents[k] == 0:
+                grounding_impedances[freq] = None
+                continue
+            impedance = fault_voltages[k] / (reduction_factor * -total_currents[k])
+            grounding_impedances[freq] = ComplexNumber(
+                real=impedance.real, imag=impedance.imag
+            )
+
+        uepr = np.sqrt((np.abs(voltages) ** 2).sum(axis=1)).tolist()
+        ia = np.sqrt((np.abs(bus_currents) ** 2).sum(axis=1)).tolist()
+        i_s = np.sqrt((np.abs(branch_currents) ** 2).sum(axis=1)).tolist()
+        uepr_freq = _complex_dicts(voltages, self.frequencies)
+        ia_freq = _complex_dicts(bus_currents, self.frequencies)
+        i_s_freq = _complex_dicts(branch_currents, self.frequencies)
+        with _gc_paused():
+            buses = [
+                ResultBus.model_construct(
+                    name=name,
+                    uepr=uepr[idx],
+                    ia=ia[idx],
+                    uepr_freq=uepr_freq[idx],
+                    ia_freq=ia_freq[idx],
+                )
+                for idx, name in enumerate(self.bus_names)
+            ]
+            branches = [
+                ResultBranch.model_construct(
+                    name=name, i_s=i_s[b], i_s_freq=i_s_freq[b]
+                )
+                for b, name in enumerate(self.branch_names)
+            ]
+        return Result(
+            buses=buses,
+            branches=branches,
+            reduction_factor=ResultReductionFactor(
+                fault_bus=self.fault_bus, value=reduction_factors
+            ),
+            grounding_impedance=ResultGroundingImpedance(
+                fault_bus=self.fault_bus, value=grounding_impedances
+            ),
+            fault=self.fault_name,
+            network_hash=network_hash or network.content_hash,
+        )
+
+
+def rescale_sources(
+    network: Network,
+    sources: Optional[Dict[str, Union[complex, Dict[float, complex]]]] = None,
+    scalings: Optional[Dict[str, Dict[float, float]]] = None,
+) -> List[str]:
+    """
+    Changes source values and fault scalings and updates the results from the unit responses.
+
+    See `Network.rescale_sources`.
+
+    Args:
+        network (Network): The network.
+        sources (Optional[Dict[str, Union[complex, Dict[float, complex]]]], optional): A factor per
+            source name that multiplies all its values, or a dictionary of new values per frequency.
+            Defaults to None.
+        scalings (Optional[Dict[str, Dict[float, float]]], optional): The new scalings per fault name.
+            Defaults to None.
+
+    Returns:
+        List[str]: The names of the faults whose results were updated.
+
+    Raises:
+        ValueError: If no unit responses are stored, if the network changed since they were
+                    calculated, or if a source, fault or frequency is unknown.
+    """
+    sources = sources or {}
+    scalings = scalings or {}
+    responses = network._unit_responses
+    if not responses:
+        raise ValueError(
+            f"No unit responses are stored in the network '{network.name}'. Run the faults with "
+            f"run_fault(..., store_unit_responses=True) first."
+        )
+    content_hash = network.content_hash
+    outdated = [
+        fault
+        for fault, response in responses.items()
+        if response.network_hash != content_hash
+    ]
+    if outdated:
+        raise ValueError(
+            f"The network changed since the unit responses of the faults {outdated} were "
+            f"calculated. Run them again with run_fault."
+        )
+
+    frequencies = set(float(freq) for freq in network.frequencies)
+    new_values = {}
+    for source_name, change in sources.items():
+        source = network.sources.get(source_name)
+        if source is None:
+            raise ValueError(
+                f"Source '{source_name}' does not exist in the network '{network.name}'."
+            )
+        if isinstance(change, dict):
+            values = dict(source.values)
+            for freq, value in change.items():
+                freq = _check_frequency(freq, frequencies)
+                values[freq] = ComplexNumber.model_validate(value)
+        else:
+            factor = complex(change)
+            values = {
+                freq: ComplexNumber.model_validate(complex(value) * factor)
+                for freq, value in source.values.items()
+            }
+        new_values[source_name] = values
+    new_scalings = {}
+    for fault_name, fault_scalings in scalings.items():
+        if fault_name not in network.faults:
+            raise ValueError(
+                f"Fault '{fault_name}' does not exist in the network '{network.name}'."
+            )
+        new_scalings[fault_name] = {
+            _check_frequency(freq, frequencies): float(value)
+            for freq, value in fault_scalings.items()
+        }
+
+    for source_name, values in new_values.items():
+        network.sources[source_name].values = values
+    for fault_name, fault_scalings in new_scalings.items():
+        network.faults[fault_name].scalings = fault_scalings
+
+    content_hash = network.content_hash
+    for fault_name, response in responses.items():
+        response.network_hash = content_hash
+        network.results[fault_name] = response.result(network, content_hash)
+        network.update_result_index(fault_name)
+
+    outdated = [fault for fault in network.results if fault not in responses]
+    if outdated and (new_values or new_scalings):
+        print(
+            f"The results of the faults {outdated} have no unit responses and are outdated. "
+            f"Run them again with run_fault."
+        )
+    return list(responses)
+
+
+def _check_frequency(freq, frequencies) -> float:
+    """Returns a frequency as float, raising a ValueError if it is not in the frequencies."""
+    freq = float(freq)
+    if freq not in frequencies:
+        raise ValueError(f"Frequency {freq} Hz is not a frequency of the network.")
+    return freq
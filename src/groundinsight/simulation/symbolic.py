@@ -0,0 +1,140 @@
+# simulation/symbolic.py
+
+"""
+Symbolic Analysis Module.
+
+The admittance matrices of a network have the same sparsity pattern at every frequency and for
+every fault, only their values change. The steps of a factorization that depend on the pattern
+alone, the detection of a tree topology, the fill-reducing ordering and the permutation of the
+matrix into elimination order, are therefore done once per pattern by a `SymbolicAnalysis`. It is
+kept with the network, so a fault sweep or a harmonic study with many frequencies only repeats the
+numeric factorization.
+
+The permutation is stored as a gather index into the values of the matrix, so a permuted matrix is
+assembled with one indexing operation instead of sorting its elements again.
+"""
+
+from typing import Optional
+import numpy as np
+from scipy.sparse import csc_matrix
+from groundinsight.simulation.symmetric import SymmetricFactorization
+from groundinsight.simulation.tree_solver import TreeTopology
+
+
+class SymbolicAnalysis:
+    """
+    The pattern-dependent parts of the factorization of admittance matrices with one pattern.
+
+    The tree topology and the ordering are computed on first use.
+
+    Attributes:
+        num_buses (int): The number of buses.
+        indptr (np.ndarray): The column pointers of the CSC pattern.
+        indices (np.ndarray): The row indices of the CSC pattern.
+        ordering (Optional[np.ndarray]): The buses in elimination order of the symmetric
+                                         factorization, None until the first factorization.
+    """
+
+    def __init__(self, matrix):
+        """
+        Initializes the analysis of the pattern of a matrix.
+
+        Args:
+            matrix: A sparse admittance matrix in canonical CSC format.
+        """
+        self.num_buses = matrix.shape[0]
+        self.indptr = matrix.indptr.copy()
+        self.indices = matrix.indices.copy()
+        self.ordering: Optional[np.ndarray] = None
+        self._tree_topology: Optional[TreeTopology] = None
+        self._tree_detected = False
+        self._gather: Optional[np.ndarray] = None
+        self._permuted_indptr: Optional[np.ndarray] = None
+        self._permuted_indices: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the pattern, the ordering and the permutation in bytes."""
+        arrays = (
+            self.indptr,
+            self.indices,
+            self.ordering,
+            self._gather,
+            self._permuted_indptr,
+            self._permuted_indices,
+        )
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def matches(self, matrix) -> bool:
+        """
+        Checks whether a matrix has the pattern of the analysis.
+
+        Args:
+            matrix: A sparse admittance matrix in canonical CSC format.
+
+        Returns:
+            bool: True if the shape, the column pointers and the row indices are equal.
+        """
+        return (
+            matrix.shape == (self.num_buses, self.num_buses)
+            and np.array_equal(matrix.indptr, self.indptr)
+            and np.array_equal(matrix.indices, self.indices)
+        )
+
+    def tree_topology(self) -> Optional[TreeTopology]:
+        """
+        Returns the tree topology of the pattern, see `TreeTopology.from_matrices`.
+
+        Returns:
+            Optional[TreeTopology]: The topology, or None if the buses are connected by a mesh.
+        """
+        if not self._tree_detected:
+            pattern = csc_matrix(
+                (np.ones(len(self.indices)), self.indices, self.indptr),
+                shape=(self.num_buses, self.num_buses),
+            )
+            self._tree_topology = TreeTopology.from_matrices([pattern], self.num_buses)
+            self._tree_detected = True
+        return self._tree_topology
+
+    def factorize(self, matrix) -> SymmetricFactorization:
+        """
+        Factorizes a matrix with the pattern of the analysis with a symmetric ordering.
+
+        The first call computes the ordering from the matrix, later calls reuse it. If the first
+        matrix needed off-diagonal pivots, it has no symmetric ordering and the next call orders
+        its matrix anew.
+
+        Args:
+            matrix: A sparse admittance matrix with the pattern of the analysis.
+
+        Returns:
+            SymmetricFactorization: The factorization.
+
+        Raises:
+            RuntimeError: If the matrix is singular.
+        """
+        if self.ordering is None:
+            factorization = SymmetricFactorization.factorize(matrix)
+            if factorization.ordering is not None:
+                self._set_ordering(factorization.ordering)
+            return factorization
+        permuted = csc_matrix(
+            (matrix.data[self._gather], self._permuted_indices, self._permuted_indptr),
+            shape=matrix.shape,
+        )
+        return SymmetricFactorization.from_permuted(self.ordering, permuted)
+
+    def _set_ordering(self, ordering: np.ndarray):
+        """Stores an ordering and the gather index of the matrices permuted with it."""
+        position = np.empty(self.num_buses, dtype=np.int64)
+        position[ordering] = np.arange(self.num_buses)
+        columns = np.repeat(np.arange(self.num_buses), np.diff(self.indptr))
+        rows = position[self.indices]
+        columns = position[columns]
+        self._gather = np.lexsort((rows, columns))
+        self._permuted_indices = rows[self._gather].astype(self.indices.dtype)
+        self._permuted_indptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(columns, minlength=self.num_buses))]
+        ).astype(self.indptr.dtype)
+        self.ordering = ordering
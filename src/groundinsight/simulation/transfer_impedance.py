@@ -0,0 +1,213 @@
+# simulation/transfer_impedance.py
+
+"""
+Transfer Impedance Module.
+
+The bus voltages of a network are linear in the injected currents, u = Z * i with the bus
+impedance matrix Z = Y^-1. Column k of Z holds the voltages of all buses for a unit current
+injected at bus k, so the EPR of any combination of injections is a combination of columns of Z.
+This module computes the columns on demand from the factorizations of an `ElectricalNetwork` and
+keeps the most recently used ones under a memory limit, so repeated what-if queries are answered
+with a dictionary lookup instead of a solve.
+"""
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    from groundinsight.electrical_network import ElectricalNetwork
+
+DEFAULT_MAX_BYTES = 64 * 1024**2
+
+
+class TransferImpedanceCache:
+    """
+    Columns of the bus impedance matrix Z = Y^-1 of an electrical network, computed on demand.
+
+    The columns are computed from the factorizations of the admittance matrices and kept in least
+    recently used order while their size stays within `max_bytes`. The admittance matrices are
+    symmetric, so Z[i, k] = Z[k, i] and a cached column also answers the queries of its row.
+
+    Attributes:
+        electrical_network (ElectricalNetwork): The electrical network.
+        hits (int): The number of columns found in the cache.
+        misses (int): The number of columns that had to be computed.
+    """
+
+    def __init__(
+        self,
+        electrical_network: "ElectricalNetwork",
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initializes an empty cache.
+
+        Args:
+            electrical_network (ElectricalNetwork): The electrical network.
+            max_bytes (Optional[int], optional): The memory limit of the cached columns in bytes, or
+                                                 None for no limit. Defaults to 64 MiB.
+        """
+        self.electrical_network = electrical_network
+        self._max_bytes = max_bytes
+        self._columns: "OrderedDict[Tuple[int, float], np.ndarray]" = OrderedDict()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        """The memory limit of the cached columns in bytes, or None for no limit."""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: Optional[int]):
+        self._max_bytes = value
+        self._evict()
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the cached columns in bytes."""
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def clear(self):
+        """Discards all cached columns."""
+        self._columns.clear()
+        self._nbytes = 0
+
+    def column(self, bus: str, frequency: float) -> np.ndarray:
+        """
+        Returns the voltages of all buses for a unit current injected at a bus.
+
+        Args:
+            bus (str): The name of the bus with the injection.
+            frequency (float): The frequency.
+
+        Returns:
+            np.ndarray: The read-only column of Z, with the buses in the order of `bus_indices` of
+                        the electrical network.
+
+        Raises:
+            ValueError: If the bus or frequency is not in the network.
+        """
+        return self.columns([bus], frequency)[:, 0]
+
+    def columns(self, buses: List[str], frequency: float) -> np.ndarray:
+        """
+        Returns the columns of Z of several buses. Missing columns are solved together.
+
+        Args:
+            buses (List[str]): The names of the buses with the injections.
+            frequency (float): The frequency.
+
+        Returns:
+            np.ndarray: The columns of Z of shape (buses of the network, len(buses)).
+
+        Raises:
+            ValueError: If a bus or the frequency is not in the network.
+        """
+        frequency = self._check_frequency(frequency)
+        indices = [self._bus_index(bus) for bus in buses]
+        found: Dict[int, np.ndarray] = {}
+        missing = []
+        for index in dict.fromkeys(indices):
+            key = (index, frequency)
+            column = self._columns.get(key)
+            if column is None:
+                missing.append(index)
+            else:
+                self._columns.move_to_end(key)
+                found[index] = column
+        self.hits += len(found)
+        self.misses += len(missing)
+
+        if missing:
+            electrical_network = self.electrical_network
+            if frequency not in electrical_network.factorizations:
+                electrical_network._factorize()
+            rhs = np.zeros((electrical_network.num_buses, len(missing)), dtype=complex)
+            rhs[missing, np.arange(len(missing))] = 1
+            solution = electrical_network.factorizations[frequency].solve(rhs)
+            for position, index in enumerate(missing):
+                column = np.ascontiguousarray(solution[:, position])
+                column.setflags(write=False)
+                found[index] = column
+                self._columns[(index, frequency)] = column
+                self._nbytes += column.nbytes
+            self._evict()
+
+        return np.stack([found[index] for index in indices], axis=1)
+
+    def impedance(self, bus: str, injection_bus: str, frequency: float) -> complex:
+        """
+        Returns the transfer impedance Z[bus, injection_bus], the voltage at a bus for a unit
+        current injected at another bus.
+
+        Args:
+            bus (str): The name of the bus of the voltage.
+            injection_bus (str): The name of the bus with the injection.
+            frequency (float): The frequency.
+
+        Returns:
+            complex: The transfer impedance in Ohm.
+
+        Raises:
+            ValueError: If a bus or the frequency is not in the network.
+        """
+        frequency = self._check_frequency(frequency)
+        i = self._bus_index(bus)
+        k = self._bus_index(injection_bus)
+        for row, column in ((i, k), (k, i)):
+            cached = self._columns.get((column, frequency))
+            if cached is not None:
+                self._columns.move_to_end((column, frequency))
+                self.hits += 1
+                return complex(cached[row])
+        return complex(self.column(injection_bus, frequency)[i])
+
+    def voltages(self, injections: Dict[str, complex], frequency: float) -> np.ndarray:
+        """
+        Returns the voltages of all buses for currents injected at some buses.
+
+        Args:
+            injections (Dict[str, complex]): The injected currents per bus name in A.
+            frequency (float): The frequency.
+
+        Returns:
+            np.ndarray: The voltages of all buses in the order of `bus_indices` of the electrical
+                        network.
+
+        Raises:
+            ValueError: If a bus or the frequency is not in the network.
+        """
+        buses = list(injections)
+        currents = np.array([injections[bus] for bus in buses], dtype=complex)
+        return self.columns(buses, frequency) @ currents
+
+    def _bus_index(self, bus: str) -> int:
+        index = self.electrical_network.bus_indices.get(bus)
+        if index is None:
+            raise ValueError(
+                f"Bus '{bus}' is not in the network '{self.electrical_network.network.name}'."
+            )
+        return index
+
+    def _check_frequency(self, frequency: float) -> float:
+        frequency = float(frequency)
+        if frequency not in self.electrical_network.Y_matrices:
+            raise ValueError(
+                f"Frequency {frequency} Hz is not a frequency of the network "
+                f"'{self.electrical_network.network.name}'."
+            )
+        return frequency
+
+    def _evict(self):
+        """Discards the least recently used columns until the cache fits into its limit."""
+        if self._max_bytes is None:
+            return
+        while self._columns and self._nbytes > self._max_bytes:
+            _, column = self._columns.popitem(last=False)
+            self._nbytes -= column.nbytes
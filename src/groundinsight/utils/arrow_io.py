@@ -0,0 +1,719 @@
+# utils/arrow_io.py
+
+"""
+Arrow Study Format Module.
+
+This module stores a `Network` with its results as a directory of uncompressed Arrow IPC files
+written with Polars. Every element type is a table with one row per element, and every
+frequency-dependent quantity (impedances, source values, scalings and results) is a long table
+with one row per element and frequency and separate real and imaginary columns. A small
+`network.json` file holds the network attributes and the bus and branch types.
+
+Because the files are uncompressed, they can be memory-mapped: `scan_network_arrow` opens all
+tables as lazy frames without reading them, and only the columns and rows touched by a query are
+read from disk. `load_network_from_arrow` rebuilds the complete `Network` without re-validating
+every value through Pydantic.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+import polars as pl
+from groundinsight.models.core_models import (
+    BusType,
+    BranchType,
+    Bus,
+    Branch,
+    ComplexNumber,
+    Fault,
+    Source,
+    Path as NetworkPath,
+    Network,
+    Result,
+    ResultBus,
+    ResultBranch,
+    ResultReductionFactor,
+    ResultGroundingImpedance,
+)
+
+FORMAT_VERSION = 1
+METADATA_FILE = "network.json"
+
+# Table name -> column schema of every Arrow file of the format
+TABLE_SCHEMAS = {
+    "buses": {
+        "name": pl.String,
+        "description": pl.String,
+        "type": pl.String,
+        "specific_earth_resistance": pl.Float64,
+    },
+    "bus_impedances": {
+        "bus": pl.String,
+        "frequency": pl.Float64,
+        "real": pl.Float64,
+        "imag": pl.Float64,
+    },
+    "branches": {
+        "name": pl.String,
+        "description": pl.String,
+        "type": pl.String,
+        "length": pl.Float64,
+        "from_bus": pl.String,
+        "to_bus": pl.String,
+        "specific_earth_resistance": pl.Float64,
+        "parallel_coefficient": pl.Float64,
+    },
+    "branch_impedances": {
+        "branch": pl.String,
+        "frequency": pl.Float64,
+        "self_real": pl.Float64,
+        "self_imag": pl.Float64,
+        "mutual_real": pl.Float64,
+        "mutual_imag": pl.Float64,
+    },
+    "faults": {
+        "name": pl.String,
+        "description": pl.String,
+        "bus": pl.String,
+        "active": pl.Boolean,
+    },
+    "fault_scalings": {
+        "fault": pl.String,
+        "frequency": pl.Float64,
+        "scaling": pl.Float64,
+    },
+    "sources": {
+        "name": pl.String,
+        "description": pl.String,
+        "bus": pl.String,
+    },
+    "source_values": {
+        "source": pl.String,
+        "frequency": pl.Float64,
+        "real": pl.Float64,
+        "imag": pl.Float64,
+    },
+    "paths": {
+        "name": pl.String,
+        "description": pl.String,
+        "source": pl.String,
+        "fault": pl.String,
+    },
+    "path_segments": {
+        "path": pl.String,
+        "position": pl.Int64,
+        "branch": pl.String,
+    },
+    "results": {
+        "fault": pl.String,
+        "network_hash": pl.String,
+        "reduction_factor_bus": pl.String,
+        "grounding_impedance_bus": pl.String,
+    },
+    "result_impedances": {
+        "fault": pl.String,
+        "frequency": pl.Float64,
+        "reduction_factor": pl.Float64,
+        "grounding_impedance_real": pl.Float64,
+        "grounding_impedance_imag": pl.Float64,
+    },
+    "result_buses": {
+        "fault": pl.String,
+        "bus": pl.String,
+        "uepr": pl.Float64,
+        "ia": pl.Float64,
+    },
+    "result_bus_values": {
+        "fault": pl.String,
+        "bus": pl.String,
+        "frequency": pl.Float64,
+        "uepr_real": pl.Float64,
+        "uepr_imag": pl.Float64,
+        "ia_real": pl.Float64,
+        "ia_imag": pl.Float64,
+    },
+    "result_branches": {
+        "fault": pl.String,
+        "branch": pl.String,
+        "i_s": pl.Float64,
+    },
+    "result_branch_values": {
+        "fault": pl.String,
+        "branch": pl.String,
+        "frequency": pl.Float64,
+        "i_s_real": pl.Float64,
+        "i_s_imag": pl.Float64,
+    },
+}
+
+
+def save_network_to_arrow(network: Network, path: str):
+    """
+    Save a Network instance with its results as an Arrow study directory.
+
+    The directory is created if necessary. Existing files of the format are replaced.
+
+    Args:
+        network (Network): The Network instance to save.
+        path (str): The directory where the Arrow files are written.
+
+    Raises:
+        IOError: If there is an error writing the files.
+
+    Examples:
+        >>> import groundinsight as gi
+        >>> gi.save_network_to_arrow(network=net, path="study_arrow")
+        >>> net = gi.load_network_from_arrow(path="study_arrow")
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    tables = {
+        name: {column: [] for column in schema}
+        for name, schema in TABLE_SCHEMAS.items()
+    }
+    bus_types = {}
+    branch_types = {}
+
+    for bus in network.buses.values():
+        bus_types[bus.type.name] = bus.type.model_dump()
+        _append(
+            tables["buses"],
+            bus.name,
+            bus.description,
+            bus.type.name,
+            bus.specific_earth_resistance,
+        )
+        for freq, imp in bus.impedance.items():
+            _append(tables["bus_impedances"], bus.name, freq, imp.real, imp.imag)
+
+    for branch in network.branches.values():
+        branch_types[branch.type.name] = branch.type.model_dump()
+        _append(
+            tables["branches"],
+            branch.name,
+            branch.description,
+            branch.type.name,
+            branch.length,
+            branch.from_bus,
+            branch.to_bus,
+            branch.specific_earth_resistance,
+            branch.parallel_coefficient,
+        )
+        frequencies = list(branch.self_impedance.keys()) + [
+            freq
+            for freq in branch.mutual_impedance
+            if freq not in branch.self_impedance
+        ]
+        for freq in frequencies:
+            self_imp = branch.self_impedance.get(freq)
+            mutual_imp = branch.mutual_impedance.get(freq)
+            _append(
+                tables["branch_impedances"],
+                branch.name,
+                freq,
+                *_split_complex(self_imp),
+                *_split_complex(mutual_imp),
+            )
+
+    for fault in network.faults.values():
+        _append(
+            tables["faults"], fault.name, fault.description, fault.bus, fault.active
+        )
+        for freq, scaling in fault.scalings.items():
+            _append(tables["fault_scalings"], fault.name, freq, scaling)
+
+    for source in network.sources.values():
+        _append(tables["sources"], source.name, source.description, source.bus)
+        for freq, value in source.values.items():
+            _append(tables["source_values"], source.name, freq, value.real, value.imag)
+
+    for path_element in network.paths.values():
+        _append(
+            tables["paths"],
+            path_element.name,
+            path_element.description,
+            path_element.source,
+            path_element.fault,
+        )
+        for position, branch in enumerate(path_element.segments):
+            _append(tables["path_segments"], path_element.name, position, branch.name)
+
+    for fault_name, result in network.results.items():
+        reduction_factor = result.reduction_factor
+        grounding_impedance = result.grounding_impedance
+        _append(
+            tables["results"],
+            fault_name,
+            result.network_hash,
+            reduction_factor.fault_bus if reduction_factor else None,
+            grounding_impedance.fault_bus if grounding_impedance else None,
+        )
+        frequencies = list(reduction_factor.value.keys()) if reduction_factor else []
+        if grounding_impedance:
+            frequencies += [
+                freq for freq in grounding_impedance.value if freq not in frequencies
+            ]
+        for freq in frequencies:
+            rf = reduction_factor.value.get(freq) if reduction_factor else None
+            gi = grounding_impedance.value.get(freq) if grounding_impedance else None
+            _append(
+                tables["result_impedances"], fault_name, freq, rf, *_split_complex(gi)
+            )
+        for result_bus in result.buses:
+            _append(
+                tables["result_buses"],
+                fault_name,
+                result_bus.name,
+                result_bus.uepr,
+                result_bus.ia,
+            )
+            for freq, voltage in result_bus.uepr_freq.items():
+                current = result_bus.ia_freq.get(freq)
+                _append(
+                    tables["result_bus_values"],
+                    fault_name,
+                    result_bus.name,
+                    freq,
+                    *_split_complex(voltage),
+                    *_split_complex(current),
+                )
+        for result_branch in result.branches:
+            _append(
+                tables["result_branches"],
+                fault_name,
+                result_branch.name,
+                result_branch.i_s,
+            )
+            for freq, current in result_branch.i_s_freq.items():
+                _append(
+                    tables["result_branch_values"],
+                    fault_name,
+                    result_branch.name,
+                    freq,
+                    *_split_complex(current),
+                )
+
+    for name, columns in tables.items():
+        frame = pl.DataFrame(columns, schema=TABLE_SCHEMAS[name])
+        # uncompressed files can be memory-mapped when loading
+        frame.write_ipc(path / f"{name}.arrow", compression="uncompressed")
+
+    metadata = {
+        "format_version": FORMAT_VERSION,
+        "name": network.name,
+        "description": network.description,
+        "frequencies": network.frequencies,
+        "active_fault": network.active_fault,
+        "content_hash": network.content_hash,
+        "bus_types": list(bus_types.values()),
+        "branch_types": list(branch_types.values()),
+    }
+    with (path / METADATA_FILE).open("w") as f:
+        json.dump(metadata, f, indent=4)
+
+
+def scan_network_arrow(path: str) -> Dict[str, pl.LazyFrame]:
+    """
+    Open all tables of an Arrow study directory as memory-mapped lazy frames.
+
+    Nothing is read until a frame is collected, and then only the columns and rows needed by
+    the query. The available tables are the keys of `TABLE_SCHEMAS`.
+
+    Args:
+        path (str): The directory of the Arrow study.
+
+    Returns:
+        Dict[str, pl.LazyFrame]: A dictionary of lazy frames keyed by their table names.
+
+    Raises:
+        FileNotFoundError: If the directory is not an Arrow study.
+
+    Examples:
+        >>> import groundinsight as gi
+        >>> import polars as pl
+        >>> tables = gi.scan_network_arrow("study_arrow")
+        >>> tables["result_buses"].group_by("bus").agg(pl.col("uepr").max()).collect()
+    """
+    path = Path(path)
+    _read_metadata(path)
+    return {name: pl.scan_ipc(path / f"{name}.arrow") for name in TABLE_SCHEMAS}
+
+
+def scan_results_arrow(path: str, element: str = "buses") -> pl.LazyFrame:
+    """
+    Open the bus or branch results of all faults of an Arrow study as one lazy frame.
+
+    The frame has the columns of `Network.res_buses` or `Network.res_branches`, with the RMS rows
+    after the frequency rows. Filters and column selections are pushed down into the Arrow scans.
+
+    Args:
+        path (str): The directory of the Arrow study.
+        element (str, optional): "buses" or "branches". Defaults to "buses".
+
+    Returns:
+        pl.LazyFrame: A LazyFrame over the stored bus or branch results.
+
+    Raises:
+        FileNotFoundError: If the directory is not an Arrow study.
+        ValueError: If the element kind is unknown.
+
+    Examples:
+        >>> import groundinsight as gi
+        >>> import polars as pl
+        >>> max_epr = (
+        ...     gi.scan_results_arrow("study_arrow")
+        ...     .filter(pl.col("frequency_Hz") == 50)
+        ...     .group_by("bus_name")
+        ...     .agg(pl.col("EPR_V").max())
+        ...     .collect()
+        ... )
+    """
+    if element not in ("buses", "branches"):
+        raise ValueError(
+            f"Unknown result element '{element}'. Use 'buses' or 'branches'."
+        )
+    tables = scan_network_arrow(path)
+
+    if element == "buses":
+        name_column = "bus_name"
+        values = tables["result_bus_values"].rename({"bus": name_column})
+        rms = tables["result_buses"].rename({"bus": name_column})
+        phasors = {
+            ("EPR_V", "EPR_degree"): ("uepr_real", "uepr_imag", "uepr"),
+            ("I_bus_A", "I_bus_degree"): ("ia_real", "ia_imag", "ia"),
+        }
+    else:
+        name_column = "branch_name"
+        values = tables["result_branch_values"].rename({"branch": name_column})
+        rms = tables["result_branches"].rename({"branch": name_column})
+        phasors = {("I_branch_A", "I_branch_degree"): ("i_s_real", "i_s_imag", "i_s")}
+
+    value_columns = []
+    rms_columns = []
+    for (magnitude_column, angle_column), (real, imag, rms_column) in phasors.items():
+        value_columns += [
+            (pl.col(real) ** 2 + pl.col(imag) ** 2).sqrt().alias(magnitude_column),
+            pl.arctan2(pl.col(imag), pl.col(real)).degrees().alias(angle_column),
+        ]
+        rms_columns += [
+            pl.col(rms_column).alias(magnitude_column),
+            pl.lit(None, dtype=pl.Float64).alias(angle_column),
+        ]
+
+    return pl.concat(
+        [
+            values.select(
+                name_column,
+                "fault",
+                pl.col("frequency").alias("frequency_Hz"),
+                pl.lit(False).alias("RMS"),
+                *value_columns,
+            ),
+            rms.select(
+                name_column,
+                "fault",
+                pl.lit(None, dtype=pl.Float64).alias("frequency_Hz"),
+                pl.lit(True).alias("RMS"),
+                *rms_columns,
+            ),
+        ],
+        how="vertical",
+    )
+
+
+def load_network_from_arrow(path: str, memory_map: bool = True) -> Network:
+    """
+    Load a Network instance with its results from an Arrow study directory.
+
+    The stored values were validated when the network was saved, so the elements are rebuilt
+    without running the Pydantic validators again.
+
+    Args:
+        path (str): The directory of the Arrow study.
+        memory_map (bool, optional): Whether to memory-map the Arrow files instead of reading them
+                                     into memory. Defaults to True.
+
+    Returns:
+        Network: The loaded Network instance.
+
+    Raises:
+        FileNotFoundError: If the directory is not an Arrow study.
+        ValueError: If the study was written with an unsupported format version.
+    """
+    path = Path(path)
+    metadata = _read_metadata(path)
+    tables = {
+        # Polars memory-maps uncompressed local files, reading the bytes first copies them
+        name: pl.read_ipc(
+            path / f"{name}.arrow"
+            if memory_map
+            else (path / f"{name}.arrow").read_bytes()
+        )
+        for name in TABLE_SCHEMAS
+    }
+
+    bus_types = {
+        data["name"]: BusType.model_construct(**data) for data in metadata["bus_types"]
+    }
+    branch_types = {
+        data["name"]: BranchType.model_construct(**data)
+        for data in metadata["branch_types"]
+    }
+
+    bus_impedances = _group_complex(tables["bus_impedances"], "bus", "real", "imag")
+    buses = {}
+    for name, description, type_name, rho in tables["buses"].iter_rows():
+        buses[name] = Bus.model_construct(
+            name=name,
+            description=description,
+            type=bus_types[type_name],
+            impedance=bus_impedances.get(name, {}),
+            specific_earth_resistance=rho,
+        )
+
+    branch_impedances = tables["branch_impedances"]
+    self_impedances = _group_complex(
+        branch_impedances, "branch", "self_real", "self_imag"
+    )
+    mutual_impedances = _group_complex(
+        branch_impedances, "branch", "mutual_real", "mutual_imag"
+    )
+    branches = {}
+    for row in tables["branches"].iter_rows(named=True):
+        branches[row["name"]] = Branch.model_construct(
+            name=row["name"],
+            description=row["description"],
+            type=branch_types[row["type"]],
+            length=row["length"],
+            from_bus=row["from_bus"],
+            to_bus=row["to_bus"],
+            self_impedance=self_impedances.get(row["name"], {}),
+            mutual_impedance=mutual_impedances.get(row["name"], {}),
+            specific_earth_resistance=row["specific_earth_resistance"],
+            parallel_coefficient=row["parallel_coefficient"],
+        )
+
+    scalings = {}
+    for fault_name, freq, scaling in tables["fault_scalings"].iter_rows():
+        scalings.setdefault(fault_name, {})[freq] = scaling
+    faults = {}
+    for name, description, bus, active in tables["faults"].iter_rows():
+        fault = Fault.model_construct(
+            name=name, description=description, bus=bus, scalings=scalings.get(name, {})
+        )
+        fault._set_active(active)
+        faults[name] = fault
+
+    source_values = _group_complex(tables["source_values"], "source", "real", "imag")
+    sources = {
+        name: Source.model_construct(
+            name=name,
+            description=description,
+            bus=bus,
+            values=source_values.get(name, {}),
+        )
+        for name, description, bus in tables["sources"].iter_rows()
+    }
+
+    segments = {}
+    for path_name, _, branch_name in (
+        tables["path_segments"].sort(["path", "position"]).iter_rows()
+    ):
+        segments.setdefault(path_name, []).append(branches[branch_name])
+    paths = {
+        name: NetworkPath.model_construct(
+            name=name,
+            description=description,
+            source=source,
+            fault=fault,
+            segments=segments.get(name, []),
+        )
+        for name, description, source, fault in tables["paths"].iter_rows()
+    }
+
+    results = _load_results(tables)
+
+    return Network.model_construct(
+        name=metadata["name"],
+        description=metadata["description"],
+        frequencies=metadata["frequencies"],
+        buses=buses,
+        branches=branches,
+        faults=faults,
+        sources=sources,
+        results=results,
+        paths=paths,
+        active_fault=metadata["active_fault"],
+    )
+
+
+def _load_results(tables: Dict[str, pl.DataFrame]) -> Dict[str, Result]:
+    """
+    Rebuild the Result instances from the result tables of an Arrow study.
+
+    Args:
+        tables (Dict[str, pl.DataFrame]): The tables of the study keyed by their names.
+
+    Returns:
+        Dict[str, Result]: A dictionary of Result instances keyed by their fault names.
+    """
+    bus_values = tables["result_bus_values"]
+    bus_voltages = _group_complex(
+        bus_values, ["fault", "bus"], "uepr_real", "uepr_imag"
+    )
+    bus_currents = _group_complex(bus_values, ["fault", "bus"], "ia_real", "ia_imag")
+    branch_currents = _group_complex(
+        tables["result_branch_values"], ["fault", "branch"], "i_s_real", "i_s_imag"
+    )
+
+    result_buses = {}
+    for fault_name, bus_name, uepr, ia in tables["result_buses"].iter_rows():
+        key = (fault_name, bus_name)
+        result_buses.setdefault(fault_name, []).append(
+            ResultBus.model_construct(
+                name=bus_name,
+                uepr=uepr,
+                ia=ia,
+                uepr_freq=bus_voltages.get(key, {}),
+                ia_freq=bus_currents.get(key, {}),
+            )
+        )
+
+    result_branches = {}
+    for fault_name, branch_name, i_s in tables["result_branches"].iter_rows():
+        result_branches.setdefault(fault_name, []).append(
+            ResultBranch.model_construct(
+                name=branch_name,
+                i_s=i_s,
+                i_s_freq=branch_currents.get((fault_name, branch_name), {}),
+            )
+        )
+
+    reduction_factors = {}
+    grounding_impedances = {}
+    for fault_name, freq, rf, gi_real, gi_imag in tables[
+        "result_impedances"
+    ].iter_rows():
+        reduction_factors.setdefault(fault_name, {})[freq] = rf
+        grounding_impedances.setdefault(fault_name, {})[freq] = (
+            ComplexNumber.model_construct(real=gi_real, imag=gi_imag)
+            if gi_real is not None
+            else None
+        )
+
+    results = {}
+    for fault_name, network_hash, rf_bus, gi_bus in tables["results"].iter_rows():
+        results[fault_name] = Result.model_construct(
+            buses=result_buses.get(fault_name, []),
+            branches=result_branches.get(fault_name, []),
+            reduction_factor=(
+                ResultReductionFactor.model_construct(
+                    name=None,
+                    fault_bus=rf_bus,
+                    value=reduction_factors.get(fault_name, {}),
+                )
+                if rf_bus is not None
+                else None
+            ),
+            grounding_impedance=(
+                ResultGroundingImpedance.model_construct(
+                    name=None,
+                    fault_bus=gi_bus,
+                    value=grounding_impedances.get(fault_name, {}),
+                )
+                if gi_bus is not None
+                else None
+            ),
+            fault=fault_name,
+            network_hash=network_hash,
+        )
+    return results
+
+
+def _read_metadata(path: Path) -> dict:
+    """
+    Read and check the metadata file of an Arrow study directory.
+
+    Args:
+        path (Path): The directory of the Arrow study.
+
+    Returns:
+        dict: The metadata of the study.
+
+    Raises:
+        FileNotFoundError: If the directory is not an Arrow study.
+        ValueError: If the study was written with an unsupported format version.
+    """
+    metadata_path = path / METADATA_FILE
+    if not metadata_path.exists():
+        raise FileNotFoundError(f"'{path}' is not a groundinsight Arrow study.")
+    with metadata_path.open("r") as f:
+        metadata = json.load(f)
+    if metadata.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported Arrow study format version {metadata.get('format_version')}."
+        )
+    return metadata
+
+
+def _append(table: Dict[str, List], *values):
+    """
+    Append one row to a table given as a dictionary of column lists.
+
+    Args:
+        table (Dict[str, List]): The columns of the table in schema order.
+        *values: The values of the row in schema order.
+    """
+    for column, value in zip(table.values(), values):
+        column.append(value)
+
+
+def _split_complex(value: Optional[ComplexNumber]) -> tuple:
+    """
+    Split an optional complex value into its real and imaginary parts.
+
+    Args:
+        value (Optional[ComplexNumber]): The value to split.
+
+    Returns:
+        tuple: (real, imag), or (None, None) for missing values.
+    """
+    if value is None:
+        return None, None
+    return value.real, value.imag
+
+
+def _group_complex(
+    frame: pl.DataFrame, key, real_column: str, imag_column: str
+) -> Dict:
+    """
+    Group the complex values of a long table by element.
+
+    Rows without a real part are skipped, so missing frequencies stay missing.
+
+    Args:
+        frame (pl.DataFrame): The long table.
+        key (str or List[str]): The key column(s) of the elements.
+        real_column (str): The column with the real parts.
+        imag_column (str): The column with the imaginary parts.
+
+    Returns:
+        Dict: A dictionary mapping element keys to dictionaries of frequency to ComplexNumber.
+    """
+    key_columns = [key] if isinstance(key, str) else key
+    grouped = {}
+    rows = zip(
+        *(frame[column].to_list() for column in key_columns),
+        frame["frequency"].to_list(),
+        frame[real_column].to_list(),
+        frame[imag_column].to_list(),
+    )
+    for *keys, freq, real, imag in rows:
+        if real is None:
+            continue
+        element_key = keys[0] if isinstance(key, str) else tuple(keys)
+        grouped.setdefault(element_key, {})[freq] = ComplexNumber.model_construct(
+            real=real, imag=imag
+        )
+    return grouped
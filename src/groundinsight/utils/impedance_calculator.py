@@ -2,7 +2,40 @@
 
 import sympy as sp
 import numpy as np
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
+
+
+@lru_cache(maxsize=256)
+def _compile_formula(formula_str: str, param_names: Tuple[str, ...]):
+    """
+    Parse an impedance formula and compile it into a NumPy function of (f, *params).
+
+    Parsing and lambdify are much slower than evaluating the compiled function, so the compiled
+    functions are cached per formula and parameter names and shared by all elements of a type.
+
+    Args:
+        formula_str (str): A SymPy-compatible formula string for impedance.
+        param_names (Tuple[str, ...]): The names of the parameters after the frequency 'f'.
+
+    Returns:
+        Callable: The compiled function, which also accepts NumPy arrays.
+    """
+    sympy_symbols = sp.symbols(["f", *param_names])
+
+    # Parse the formula string into a SymPy expression
+    expr = sp.sympify(formula_str)
+
+    # Substitute 'j' with the imaginary unit for numerical computation
+    expr = expr.subs({"j": 1j})
+
+    # Compile the function with parameters using lambdify
+    # Use 'numpy' modules to ensure compatibility with numpy arrays
+    return sp.lambdify(
+        sympy_symbols,
+        expr,
+        modules=["numpy"]
+    )
 
 
 def compute_impedance(
@@ -37,26 +70,9 @@ def compute_impedance(
         return {freq: ComplexNumber(real=np.inf, imag=np.inf) for freq in frequencies}
 
     try:
-        # Define all necessary symbols
         # Start with frequency 'f' and include all keys from params
         symbols = ["f"] + list(params.keys())
-        sympy_symbols = sp.symbols(' '.join(symbols))
-        
-        # Create a symbols dictionary for substitution if needed
-        symbols_dict = {str(s): s for s in sympy_symbols}
-        # Parse the formula string into a SymPy expression
-        expr = sp.sympify(formula_str)
-
-        # Substitute 'I' with the imaginary unit for numerical computation
-        expr = expr.subs({"j": 1j})
-
-        # Compile the function with parameters using lambdify
-        # Use 'numpy' modules to ensure compatibility with numpy arrays
-        compiled_func = sp.lambdify(
-            sympy_symbols,
-            expr,
-            modules=["numpy"]
-        )
+        compiled_func = _compile_formula(formula_str, tuple(symbols[1:]))
 
         # Create a list where each element is (f_i, param1, param2, ...)
         impedance_dict = {}
@@ -82,3 +98,45 @@ def compute_impedance(
 
     except Exception as e:
         raise ValueError(f"Error computing impedance: {e}")
+
+
+def compute_impedance_array(
+    formula_str: str, frequencies: List[float], params: Dict[str, Any]
+) -> np.ndarray:
+    """
+    Compute impedance values for many elements and frequencies at once.
+
+    This is the bulk counterpart of `compute_impedance`: the formula is compiled once and evaluated
+    on NumPy arrays, with the elements along the first axis and the frequencies along the second.
+
+    Args:
+        formula_str (str): A SymPy-compatible formula string for impedance.
+                           Example: "(rho * 0.001 + 0.25 + j * f * 0.012) * l"
+        frequencies (List[float]): A list of frequencies (in Hz) at which to compute the impedance.
+        params (Dict[str, Any]): A dictionary mapping each parameter of the formula to one value per
+                                 element. Example: {"rho": [100.0, 120.0], "l": [1.0, 0.5]}
+
+    Returns:
+        np.ndarray: A complex array of shape (elements, frequencies).
+
+    Raises:
+        ValueError: If there is an error in parsing or computing the impedance formula.
+    """
+    param_values = [np.asarray(values, dtype=float) for values in params.values()]
+    n_elements = len(param_values[0]) if param_values else 1
+    shape = (n_elements, len(frequencies))
+
+    # Check if "NaN" is present in the formula string (case-insensitive)
+    if "nan" in formula_str.lower():
+        return np.full(shape, complex(np.inf, np.inf))
+
+    try:
+        compiled_func = _compile_formula(formula_str, tuple(params.keys()))
+        impedance = compiled_func(
+            np.asarray(frequencies, dtype=float)[np.newaxis, :],
+            *[values[:, np.newaxis] for values in param_values]
+        )
+        # constant terms of the formula broadcast to all elements and frequencies
+        return np.broadcast_to(np.asarray(impedance, dtype=complex), shape).copy()
+    except Exception as e:
+        raise ValueError(f"Error computing impedance: {e}")
@@ -0,0 +1,289 @@
+# utils/json_stream.py
+
+"""
+Streaming JSON Module.
+
+This module reads and writes the network JSON format of `Network.model_dump_json` element by
+element instead of holding the whole document in memory. The writer serializes one bus, branch,
+fault, source, path or result entry at a time. The reader keeps only a small text buffer, cuts
+each element out of the stream and validates it on its own with `model_validate_json`, so the
+loaded objects are identical to those of `Network.model_validate_json`. Peak memory is bounded by
+the size of the largest single element instead of the size of the file.
+"""
+
+import json
+from typing import IO, Dict, Iterator, Tuple, Type
+from pydantic import BaseModel
+from groundinsight.models.core_models import (
+    Bus,
+    Branch,
+    Fault,
+    Source,
+    Path,
+    Network,
+    Result,
+    ResultBus,
+    ResultBranch,
+)
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Network sections that are streamed entry by entry, with the model of their entries
+_ELEMENT_SECTIONS: Dict[str, Type[BaseModel]] = {
+    "buses": Bus,
+    "branches": Branch,
+    "faults": Fault,
+    "sources": Source,
+    "paths": Path,
+}
+
+# Result lists that are streamed item by item, with the model of their items
+_RESULT_LISTS: Dict[str, Type[BaseModel]] = {
+    "buses": ResultBus,
+    "branches": ResultBranch,
+}
+
+
+def write_network_json(network: Network, file: IO[str]):
+    """
+    Write a Network instance to a text file element by element.
+
+    The output has the same structure as `Network.model_dump_json` without indentation.
+
+    Args:
+        network (Network): The Network instance to write.
+        file (IO[str]): A text file opened for writing.
+    """
+    scalars = network.model_dump(
+        mode="json",
+        include={"name", "description", "frequencies", "active_fault"},
+    )
+    file.write("{")
+    first = True
+    for field in Network.model_fields:
+        if not first:
+            file.write(",")
+        first = False
+        file.write(f"{json.dumps(field)}:")
+        if field in _ELEMENT_SECTIONS:
+            _write_entries(file, getattr(network, field))
+        elif field == "results":
+            _write_results(file, network.results)
+        else:
+            file.write(json.dumps(scalars[field]))
+    file.write(f',"content_hash":{json.dumps(network.content_hash)}}}')
+
+
+def _write_entries(file: IO[str], elements: Dict[str, BaseModel]):
+    """
+    Write a dictionary of models as a JSON object, one entry at a time.
+
+    Args:
+        file (IO[str]): A text file opened for writing.
+        elements (Dict[str, BaseModel]): The models keyed by their names.
+    """
+    file.write("{")
+    for index, (name, element) in enumerate(elements.items()):
+        if index:
+            file.write(",")
+        file.write(f"{json.dumps(name)}:{element.model_dump_json()}")
+    file.write("}")
+
+
+def _write_results(file: IO[str], results: Dict[str, Result]):
+    """
+    Write the results of a network, one bus and branch result at a time.
+
+    Args:
+        file (IO[str]): A text file opened for writing.
+        results (Dict[str, Result]): The results keyed by their fault names.
+    """
+    file.write("{")
+    for index, (fault_name, result) in enumerate(results.items()):
+        if index:
+            file.write(",")
+        file.write(f"{json.dumps(fault_name)}:{{")
+        for field_index, field in enumerate(Result.model_fields):
+            if field_index:
+                file.write(",")
+            file.write(f"{json.dumps(field)}:")
+            if field in _RESULT_LISTS:
+                file.write("[")
+                for item_index, item in enumerate(getattr(result, field)):
+                    if item_index:
+                        file.write(",")
+                    file.write(item.model_dump_json())
+                file.write("]")
+            else:
+                value = getattr(result, field)
+                if isinstance(value, BaseModel):
+                    file.write(value.model_dump_json())
+                else:
+                    file.write(json.dumps(value))
+        file.write("}")
+    file.write("}")
+
+
+def read_network_json(file: IO[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Network:
+    """
+    Read a Network instance from a text file element by element.
+
+    Args:
+        file (IO[str]): A text file opened for reading that contains a network in JSON format.
+        chunk_size (int, optional): The number of characters read from the file at a time.
+                                    Defaults to 65536.
+
+    Returns:
+        Network: The loaded Network instance.
+
+    Raises:
+        ValueError: If the content is not valid JSON or does not conform to the Network model.
+    """
+    reader = _JSONStreamReader(file, chunk_size)
+    data = {}
+    for key in reader.iter_object():
+        if key in _ELEMENT_SECTIONS:
+            model = _ELEMENT_SECTIONS[key]
+            data[key] = {
+                name: model.model_validate_json(raw)
+                for name, raw in reader.iter_object_values()
+            }
+        elif key == "results":
+            data[key] = {
+                fault_name: _read_result(reader) for fault_name in reader.iter_object()
+            }
+        else:
+            data[key] = json.loads(reader.read_value())
+    # the validated elements are taken over without validating them again
+    return Network.model_validate(data)
+
+
+def _read_result(reader: "_JSONStreamReader") -> Result:
+    """
+    Read one result object, validating its bus and branch results one at a time.
+
+    Args:
+        reader (_JSONStreamReader): The reader positioned at the result object.
+
+    Returns:
+        Result: The loaded Result instance.
+    """
+    data = {}
+    for key in reader.iter_object():
+        if key in _RESULT_LISTS:
+            model = _RESULT_LISTS[key]
+            data[key] = [model.model_validate_json(raw) for raw in reader.iter_array()]
+        else:
+            data[key] = json.loads(reader.read_value())
+    return Result.model_validate(data)
+
+
+class _JSONStreamReader:
+    """
+    A minimal pull parser that walks the containers of a JSON document held in a file.
+
+    Only the text of the element that is currently read is kept in memory. Values are returned
+    as raw JSON strings so they can be handed to `model_validate_json`.
+    """
+
+    def __init__(self, file: IO[str], chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        """Append at least `size` characters to the buffer, returning False at the end of file."""
+        if self.eof:
+            return False
+        # drop the consumed part so the buffer only holds the current element
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        chunk = self.file.read(max(size, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def _peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self.chunk_size):
+                raise ValueError("Unexpected end of JSON document.")
+
+    def _expect(self, char: str):
+        """Consume the next non-whitespace character, which has to be `char`."""
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON document.")
+        self.pos += 1
+
+    def read_value(self) -> str:
+        """Consume the next JSON value and return its raw text."""
+        self._peek()
+        while True:
+            try:
+                _, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # the value is incomplete, read as much again as is buffered
+                if not self._fill(len(self.buffer) - self.pos):
+                    raise ValueError(f"Invalid JSON document: {e}") from e
+                continue
+            if end == len(self.buffer) and self._fill(self.chunk_size):
+                # a number at the end of the buffer may continue in the next chunk
+                continue
+            raw = self.buffer[self.pos : end]
+            self.pos = end
+            return raw
+
+    def _read_key(self) -> str:
+        """Consume an object key and the following colon."""
+        key = json.loads(self.read_value())
+        if not isinstance(key, str):
+            raise ValueError("Invalid JSON document: object keys have to be strings.")
+        self._expect(":")
+        return key
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the next JSON object.
+
+        The caller has to consume the value of each key before requesting the next key.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            yield self._read_key()
+            if self._peek() == ",":
+                self.pos += 1
+                continue
+            self._expect("}")
+            return
+
+    def iter_object_values(self) -> Iterator[Tuple[str, str]]:
+        """Iterate over the keys and raw values of the next JSON object."""
+        for key in self.iter_object():
+            yield key, self.read_value()
+
+    def iter_array(self) -> Iterator[str]:
+        """Iterate over the raw items of the next JSON array."""
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self._peek() == ",":
+                self.pos += 1
+                continue
+            self._expect("]")
+            return
@@ -0,0 +1,82 @@
+# tests/conftest.py
+
+"""
+Shared fixtures of the tests.
+
+The solver and simulation tests run on generated networks with the same bus and branch types.
+`make_network` builds such a network for a topology, and `network` is a new network for tests that
+are parametrized over the topologies with `indirect=True`.
+"""
+
+import pytest
+import groundinsight as gi
+from groundinsight.models.core_models import BusType, BranchType
+
+FREQUENCIES = [50, 250]
+
+# The generator and its default arguments per topology
+TOPOLOGIES = {
+    "grid": (gi.create_grid_network, {"rows": 3, "columns": 3}),
+    "tree": (gi.create_tree_network, {"number_buses": 15, "branching": 2}),
+    "chain": (gi.create_tree_network, {"number_buses": 9, "branching": 1}),
+    "ring": (gi.create_ring_network, {"number_buses": 6}),
+    "parallel": (gi.create_parallel_network, {"number_buses": 6}),
+}
+
+
+@pytest.fixture(scope="session")
+def bus_type() -> BusType:
+    """A bus type whose earth impedance depends on the specific earth resistance and the frequency."""
+    return BusType(
+        name="TestBusType",
+        system_type="Grounded",
+        voltage_level=110.0,
+        impedance_formula="rho * 0.01 + 1 + j * f / 50",
+    )
+
+
+@pytest.fixture(scope="session")
+def branch_type() -> BranchType:
+    """A branch type with a grounding conductor that couples with the sources."""
+    return BranchType(
+        name="TestBranchType",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0.001 + 0.25 + j * f * 0.012) * l",
+        mutual_impedance_formula="(0.0 + j * f * 0.010) * l",
+    )
+
+
+@pytest.fixture(scope="session")
+def make_network(bus_type, branch_type):
+    """
+    Returns a function that generates a network with the shared bus and branch types.
+
+    The function takes the topology ("grid", "tree", "chain", "ring" or "parallel") and keyword
+    arguments of the generator that replace the defaults, e.g. `rows`, `frequencies` or `seed`.
+    The network has the fault "fault1" and no paths.
+    """
+
+    def make(topology: str = "grid", **arguments):
+        create, defaults = TOPOLOGIES[topology]
+        return create(
+            **{
+                "name": topology.capitalize(),
+                "frequencies": FREQUENCIES,
+                "bus_type": bus_type,
+                "branch_type": branch_type,
+                "rho_range": (50.0, 500.0),
+                "length_range": (0.5, 2.0),
+                "number_sources": 2,
+                "seed": 3,
+                **defaults,
+                **arguments,
+            }
+        )
+
+    return make
+
+
+@pytest.fixture
+def network(request, make_network):
+    """A new network of the topology given by indirect parametrization, a grid by default."""
+    return make_network(getattr(request, "param", "grid"))
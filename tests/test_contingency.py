@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import groundinsight as gi
+from groundinsight.models.core_models import ComplexNumber
+
+def _rebuilt_epr(network, modify):
+    """EPR rows at the fault bus of a network changed by `modify` and solved from scratch."""
+    gi.create_paths(network)
+    modify(network)
+    gi.run_fault(network, "fault1")
+    res_buses = network.res_buses("fault1")
+    return res_buses.filter(res_buses["bus_name"] == "bus9")["EPR_V"].to_list()
+
+
+@pytest.fixture(scope="module")
+def outage_type(branch_type):
+    # a branch without grounding conductor carries no current, like a branch that is out of service
+    return branch_type.model_copy(update={"name": "OutageType", "grounding_conductor": False})
+
+
+@pytest.fixture(scope="module")
+def analysis(make_network):
+    return gi.ContingencyAnalysis(make_network("grid"), "fault1")
+
+
+@pytest.mark.parametrize("branch_name", ["branch1", "branch7", "branch12"])
+def test_branch_outages(analysis, make_network, outage_type, branch_name):
+    outages = analysis.branch_outages()
+    assert outages.columns == [
+        "element_type", "element", "frequency_Hz", "RMS", "EPR_V", "EPR_max_V", "EPR_max_bus",
+    ]
+    assert len(outages) == 12 * 3
+    rows = outages.filter(outages["element"] == branch_name)
+    assert rows["frequency_Hz"].to_list() == [50.0, 250.0, None]
+
+    def take_out(network):
+        network.branches[branch_name].type = outage_type
+
+    assert np.allclose(rows["EPR_V"].to_list(), _rebuilt_epr(make_network("grid"), take_out))
+
+
+def test_modifications(analysis, make_network):
+    new_impedance = {50.0: 5 + 1j, 250.0: 5 + 3j}
+    modified = analysis.branch_modifications({"branch3": new_impedance})
+
+    def change_branch(network):
+        network.branches["branch3"].self_impedance = {
+            freq: ComplexNumber(real=z.real, imag=z.imag) for freq, z in new_impedance.items()
+        }
+
+    assert np.allclose(modified["EPR_V"].to_list(), _rebuilt_epr(make_network("grid"), change_branch))
+
+    modified = analysis.bus_modifications({"bus5": {50.0: 100 + 0j}})
+
+    def change_bus(network):
+        network.buses["bus5"].impedance[50.0] = ComplexNumber(real=100, imag=0)
+
+    assert np.allclose(modified["EPR_V"].to_list(), _rebuilt_epr(make_network("grid"), change_bus))
+
+    with pytest.raises(ValueError):
+        analysis.branch_outages(["branch99"])
+
+
+def test_bus_outages(analysis, make_network):
+    outages = analysis.bus_outages(["bus9"])
+
+    def disconnect(network):
+        network.buses["bus9"].impedance = {
+            freq: ComplexNumber(real=1e300, imag=0) for freq in network.frequencies
+        }
+
+    assert np.allclose(outages["EPR_V"].to_list(), _rebuilt_epr(make_network("grid"), disconnect))
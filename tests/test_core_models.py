@@ -2,6 +2,7 @@
 
 from pydantic import ValidationError
 import pytest
+import polars as pl
 from groundinsight.models.core_models import (
     ComplexNumber,
     BusType,
@@ -1293,3 +1294,185 @@ def test_network_set_active_fault():
         network.set_active_fault("Nonexistent Fault")
 
 
+
+def _hash_test_network(bus_order):
+    """
+    Build a small network for the content hash tests with buses added in the given order.
+    """
+    bus_type = BusType(
+        name="BusTypeHash",
+        system_type="Grounded",
+        voltage_level=230.0,
+        impedance_formula="rho * 0 + 1 + I * f * 1/50",
+    )
+    branch_type = BranchType(
+        name="BranchTypeHash",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0 + 0.25 + I * f * 0.012)*l",
+        mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+    )
+    network = Network(name="Hash Network", frequencies=[50.0, 250.0])
+    for bus_name in bus_order:
+        network.add_bus(Bus(name=bus_name, type=bus_type, impedance={}))
+    network.add_branch(
+        Branch(
+            name="Branch 1",
+            type=branch_type,
+            length=1.0,
+            from_bus="Bus 1",
+            to_bus="Bus 2",
+            self_impedance={},
+            mutual_impedance={},
+        )
+    )
+    network.add_source(Source(name="Source 1", bus="Bus 1", values={50: 60, 250: 10}))
+    network.add_fault(Fault(name="Fault 2", bus="Bus 2", scalings={50: 1.0, 250: 1.0}))
+    return network
+
+def test_network_content_hash():
+    """
+    Test that the content hash is stable and follows changes of the network elements.
+    """
+    network = _hash_test_network(["Bus 1", "Bus 2"])
+    reordered = _hash_test_network(["Bus 2", "Bus 1"])
+    assert len(network.content_hash) == 64
+    assert network.content_hash == reordered.content_hash
+
+    # the active fault does not change the content
+    original_hash = network.content_hash
+    network.set_active_fault("Fault 2")
+    assert network.content_hash == original_hash
+
+    # re-adding a changed element updates the hash
+    bus = network.buses["Bus 2"].model_copy()
+    bus.specific_earth_resistance = 300.0
+    network.add_bus(bus, overwrite=True)
+    assert network.content_hash != original_hash
+
+    # assigned fields are picked up without re-adding the element
+    changed_hash = network.content_hash
+    values = dict(network.sources["Source 1"].values)
+    values[50.0] = ComplexNumber(real=70, imag=0)
+    network.sources["Source 1"].values = values
+    assert network.content_hash != changed_hash
+    changed_hash = network.content_hash
+    network.buses["Bus 1"].specific_earth_resistance = 500.0
+    assert network.content_hash != changed_hash
+
+    # a change of a shared type is picked up for all its elements
+    changed_hash = network.content_hash
+    network.buses["Bus 1"].type.voltage_level = 30.0
+    assert network.content_hash != changed_hash
+
+    # copies do not keep the digest of the original
+    bus = network.buses["Bus 1"].model_copy(update={"specific_earth_resistance": 1.0})
+    assert bus.content_digest() != network.buses["Bus 1"].content_digest()
+
+    # the paths enter the hash
+    changed_hash = network.content_hash
+    network.define_paths()
+    assert network.content_hash != changed_hash
+
+    # the hash is part of the JSON representation and survives a round trip
+    loaded = Network.model_validate_json(network.model_dump_json())
+    assert loaded.content_hash == network.content_hash
+
+def test_network_is_result_current():
+    """
+    Test that results remember the content hash of the network they were calculated for.
+    """
+    network = _hash_test_network(["Bus 1", "Bus 2"])
+    network.define_paths()
+    assert network.is_result_current("Fault 2") is False
+
+    from groundinsight.network_operations import run_fault
+
+    run_fault(network, "Fault 2")
+    assert network.results["Fault 2"].network_hash == network.content_hash
+    assert network.is_result_current("Fault 2") is True
+
+    bus = network.buses["Bus 1"].model_copy()
+    bus.specific_earth_resistance = 50.0
+    network.add_bus(bus, overwrite=True)
+    assert network.is_result_current("Fault 2") is False
+
+
+def test_network_result_frames():
+    """
+    Test that res_buses and res_branches return typed columns with separate RMS rows.
+    """
+    network = _hash_test_network(["Bus 1", "Bus 2"])
+    network.results["Fault 2"] = Result(
+        buses=[
+            ResultBus(
+                name=name,
+                uepr=5.0,
+                ia=2.0,
+                uepr_freq={50: ComplexNumber(real=3, imag=4), 250: ComplexNumber(real=0, imag=-1)},
+                ia_freq={50: ComplexNumber(real=2, imag=0), 250: ComplexNumber(real=-1, imag=0)},
+            )
+            for name in ["Bus 1", "Bus 2"]
+        ],
+        branches=[
+            ResultBranch(name="Branch 1", i_s=1.0, i_s_freq={50: ComplexNumber(real=0, imag=1), 250: ComplexNumber(real=0, imag=0)})
+        ],
+        fault="Fault 2",
+    )
+
+    res_buses = network.res_buses(fault="Fault 2")
+    assert res_buses.columns == [
+        "bus_name", "fault", "frequency_Hz", "RMS", "EPR_V", "EPR_degree", "I_bus_A", "I_bus_degree"
+    ]
+    assert res_buses.schema["frequency_Hz"] == pl.Float64
+    assert res_buses.schema["RMS"] == pl.Boolean
+    assert res_buses["bus_name"].to_list() == ["Bus 1"] * 3 + ["Bus 2"] * 3
+    assert res_buses["frequency_Hz"].to_list() == [50.0, 250.0, None] * 2
+    assert res_buses["RMS"].to_list() == [False, False, True] * 2
+    assert res_buses["EPR_V"].to_list() == pytest.approx([5.0, 1.0, 5.0] * 2)
+    assert res_buses["EPR_degree"].to_list()[:3] == [pytest.approx(53.1301, rel=1e-4), -90.0, None]
+    assert res_buses["I_bus_degree"].to_list()[:3] == [0.0, 180.0, None]
+
+    res_branches = network.res_branches(fault="Fault 2")
+    assert res_branches["fault"].to_list() == ["Fault 2"] * 3
+    assert res_branches["I_branch_A"].to_list() == [1.0, 0.0, 1.0]
+    assert res_branches["I_branch_degree"].to_list() == [90.0, 0.0, None]
+    assert res_branches.filter(pl.col("RMS"))["I_branch_A"].to_list() == [1.0]
+
+
+def test_network_memory_report():
+    """
+    Test that memory_report covers the elements, the electrical network arrays and each result.
+    """
+    import groundinsight as gi
+    from groundinsight.models.result_store import estimate_result_size
+
+    bus_type = BusType(name="MemoryBus", system_type="Grounded", voltage_level=110.0, impedance_formula="rho * 0.01 + 1 + j * f / 50")
+    branch_type = BranchType(
+        name="MemoryBranch", grounding_conductor=True,
+        self_impedance_formula="(0.25 + j * f * 0.012) * l", mutual_impedance_formula="(j * f * 0.010) * l",
+    )
+    network = gi.create_tree_network(
+        name="Memory", frequencies=[50, 250], number_buses=30, bus_type=bus_type, branch_type=branch_type
+    )
+    network.add_fault(Fault(name="fault2", bus="bus20"))
+    gi.create_paths(network)
+    gi.run_fault(network, "fault1")
+    gi.run_fault(network, "fault2")
+
+    report = network.memory_report()
+    assert report.columns == ["component", "name", "count", "bytes"]
+    rows = {(row["component"], row["name"]): row for row in report.iter_rows(named=True)}
+    assert rows[("buses", None)]["count"] == 30
+    assert rows[("branches", None)]["count"] == 29
+    # sparse admittance matrices are reported with their exact size: values, row indices and
+    # column pointers of 30 diagonal and 2 * 29 off-diagonal elements
+    assert rows[("Y_matrices", None)]["bytes"] == 2 * (88 * (16 + 4) + 31 * 4)
+    assert rows[("u_vectors", None)]["bytes"] == 2 * 30 * 16
+    for fault in ["fault1", "fault2"]:
+        assert rows[("results", fault)]["bytes"] == estimate_result_size(network.results[fault])
+
+    network.limit_result_memory(max_bytes=1)
+    report = network.memory_report()
+    assert report.filter(pl.col("component") == "spilled_results")["name"].to_list() == ["fault1"]
+    assert report.filter(pl.col("component") == "results")["name"].to_list() == ["fault2"]
+    network.limit_result_memory(None)
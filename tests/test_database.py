@@ -169,4 +169,342 @@ def test_network_save_load():
     assert loaded_net.buses == net.buses
     assert loaded_net.branches == net.branches
     assert loaded_net.sources == net.sources
-    assert loaded_net.faults == net.faults 
\ No newline at end of file
+    assert loaded_net.faults == net.faults 
+def test_concurrent_thread_sessions():
+    #the database is opened in WAL mode and each thread works with its own session
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from sqlalchemy import text
+
+    gi.close_dbsession()
+    gi.start_dbsession("tests/test_grounding.db", journal_mode="WAL", busy_timeout=10, pool_size=4)
+
+    with gi.engine.connect() as connection:
+        journal_mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+        busy_timeout = connection.execute(text("PRAGMA busy_timeout")).scalar()
+    assert journal_mode.lower() == "wal"
+    assert busy_timeout == 10000
+
+    barrier = threading.Barrier(4)
+
+    def load(_):
+        barrier.wait()
+        thread_session = gi.session()
+        network = gi.load_network_from_db("TestNet")
+        return network.name, id(thread_session)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(load, range(4)))
+
+    assert all(name == "TestNet" for name, _ in results)
+    # every thread worked with its own session
+    assert len({session_id for _, session_id in results}) == 4
+
+@pytest.mark.parametrize("url_kind", ["memory", "file"])
+def test_database_url_and_indexes(tmp_path, url_kind):
+    #any SQLAlchemy URL can be used and the foreign keys are indexed
+    from sqlalchemy import inspect
+
+    url = "sqlite://" if url_kind == "memory" else f"sqlite:///{tmp_path / 'grounding.db'}"
+
+    net = gi.create_network(name="UrlNet", frequencies=[50])
+    bus_type = BusType(
+        name="BusTypeFormulaTest",
+        system_type="Grounded",
+        voltage_level=230.0,
+        impedance_formula="rho * 0 + 1 + I * f * 1/50",
+    )
+    branch_type = BranchType(
+        name="TestBranchType",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0 + 0.25 + I * f * 0.012)*l",
+        mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+    )
+    gi.create_bus(name="bus1", type=bus_type, network=net)
+    gi.create_bus(name="bus2", type=bus_type, network=net)
+    gi.create_branch(name="branch1", type=branch_type, from_bus="bus1", to_bus="bus2", length=1, network=net)
+    gi.create_source(name="source1", bus="bus1", values={50: 60}, network=net)
+    gi.create_fault(name="fault1", bus="bus2", scalings={50: 1.0}, network=net)
+    gi.create_paths(network=net)
+
+    gi.close_dbsession()
+    gi.start_dbsession(url=url)
+    try:
+        gi.save_network_to_db(network=net)
+        loaded_net = gi.load_network_from_db("UrlNet")
+        assert loaded_net.buses == net.buses
+        assert loaded_net.branches == net.branches
+
+        inspector = inspect(gi.engine)
+        branch_indexes = {
+            tuple(index["column_names"]) for index in inspector.get_indexes("branches")
+        }
+        assert ("from_bus_name",) in branch_indexes
+        assert ("to_bus_name",) in branch_indexes
+        network_bus_indexes = {
+            tuple(index["column_names"]) for index in inspector.get_indexes("network_buses")
+        }
+        assert ("bus_name",) in network_bus_indexes
+        network_path_indexes = {
+            tuple(index["column_names"]) for index in inspector.get_indexes("network_paths")
+        }
+        assert ("path_name",) in network_path_indexes
+        assert inspector.get_pk_constraint("network_buses")["constrained_columns"] == [
+            "network_name",
+            "bus_name",
+        ]
+    finally:
+        gi.close_dbsession()
+
+def test_invalid_journal_mode():
+    #the journal mode is checked before it is put into the PRAGMA statement
+    from groundinsight.database.engine import create_db_engine
+
+    with pytest.raises(ValueError, match="journal mode"):
+        create_db_engine("sqlite://", journal_mode="WAL; DROP TABLE networks")
+    engine = create_db_engine("sqlite://", journal_mode="delete")
+    engine.dispose()
+
+def test_import_without_async_stack():
+    #the async extension of SQLAlchemy is only imported when an async session is started
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "sys.modules['sqlalchemy.ext.asyncio'] = None\n"
+        "import groundinsight as gi\n"
+        "from groundinsight.database.engine import create_async_db_engine\n"
+        "try:\n"
+        "    create_async_db_engine('sqlite+aiosqlite://')\n"
+        "except ImportError:\n"
+        "    print('ImportError')\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert completed.stdout.strip().endswith("ImportError")
+
+def test_async_network_and_results_save_load(tmp_path):
+    #the async API shares the ORM models with the synchronous API
+    import asyncio
+
+    pytest.importorskip("aiosqlite")
+
+    net = gi.create_network(name="AsyncNet", frequencies=[50, 250])
+    bus_type = BusType(
+        name="BusTypeFormulaTest",
+        system_type="Grounded",
+        voltage_level=230.0,
+        impedance_formula="rho * 0 + 1 + I * f * 1/50",
+    )
+    branch_type = BranchType(
+        name="TestBranchType",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0 + 0.25 + I * f * 0.012)*l",
+        mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+    )
+    gi.create_bus(name="bus1", type=bus_type, network=net)
+    gi.create_bus(name="bus2", type=bus_type, network=net)
+    gi.create_bus(name="bus3", type=bus_type, network=net)
+    gi.create_branch(name="branch1", type=branch_type, from_bus="bus1", to_bus="bus2", length=1, network=net)
+    gi.create_branch(name="branch2", type=branch_type, from_bus="bus2", to_bus="bus3", length=1, network=net)
+    gi.create_source(name="source1", bus="bus1", values={50: 60, 250: 10}, network=net)
+    gi.create_fault(name="fault1", bus="bus3", scalings={50: 1.0, 250: 1.0}, network=net)
+    gi.create_fault(name="fault2", bus="bus2", scalings={50: 1.0, 250: 1.0}, network=net)
+    gi.create_paths(network=net)
+    gi.run_fault(network=net, fault_name="fault1")
+    gi.run_fault(network=net, fault_name="fault2")
+
+    db_path = tmp_path / "async_grounding.db"
+
+    async def round_trip():
+        with pytest.raises(RuntimeError):
+            await gi.aio.load_network("AsyncNet")
+        await gi.aio.start_dbsession(sqlite_path=str(db_path))
+        try:
+            await gi.aio.save_bustype(bus_type)
+            with pytest.raises(ValueError):
+                await gi.aio.save_bustype(bus_type)
+            await gi.aio.save_network(net, overwrite=True)
+            await gi.aio.save_results(net)
+            loaded_net, results, bus_types = await asyncio.gather(
+                gi.aio.load_network("AsyncNet"),
+                gi.aio.load_results("AsyncNet", faults=["fault2"]),
+                gi.aio.load_bustypes(),
+            )
+        finally:
+            await gi.aio.close_dbsession()
+        return loaded_net, results, bus_types
+
+    loaded_net, results, bus_types = asyncio.run(round_trip())
+
+    assert loaded_net.buses == net.buses
+    assert loaded_net.branches == net.branches
+    assert bus_types["BusTypeFormulaTest"] == bus_type
+    assert list(results.keys()) == ["fault2"]
+    assert results["fault2"] == net.results["fault2"]
+
+    # the synchronous API reads the results written by the async API
+    gi.close_dbsession()
+    gi.start_dbsession(sqlite_path=str(db_path))
+    try:
+        assert gi.load_results_from_db("AsyncNet") == net.results
+    finally:
+        gi.close_dbsession()
+
+def test_subnetwork_load(tmp_path, monkeypatch):
+    #only the neighbourhood of the requested buses or the connected part of a fault is loaded
+    net = gi.create_network(name="SubNet", frequencies=[50])
+    bus_type = BusType(
+        name="BusTypeFormulaTest",
+        system_type="Grounded",
+        voltage_level=230.0,
+        impedance_formula="rho * 0 + 1 + I * f * 1/50",
+    )
+    branch_type = BranchType(
+        name="TestBranchType",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0 + 0.25 + I * f * 0.012)*l",
+        mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+    )
+    # chain sub_bus1 ... sub_bus6 and a separate chain sub_bus7 - sub_bus8
+    for i in range(1, 9):
+        gi.create_bus(name=f"sub_bus{i}", type=bus_type, network=net)
+    for i in range(1, 6):
+        gi.create_branch(name=f"sub_branch{i}", type=branch_type, from_bus=f"sub_bus{i}", to_bus=f"sub_bus{i+1}", length=1, network=net)
+    gi.create_branch(name="sub_branch7", type=branch_type, from_bus="sub_bus7", to_bus="sub_bus8", length=1, network=net)
+    gi.create_source(name="sub_source1", bus="sub_bus1", values={50: 60}, network=net)
+    gi.create_source(name="sub_source2", bus="sub_bus7", values={50: 60}, network=net)
+    gi.create_fault(name="sub_fault4", bus="sub_bus4", scalings={50: 1.0}, network=net)
+    gi.create_fault(name="sub_fault6", bus="sub_bus6", scalings={50: 1.0}, network=net)
+    gi.create_fault(name="sub_fault8", bus="sub_bus8", scalings={50: 1.0}, network=net)
+    gi.create_paths(network=net)
+
+    gi.close_dbsession()
+    gi.start_dbsession(sqlite_path=str(tmp_path / "subnetwork.db"))
+    try:
+        gi.save_network_to_db(network=net)
+
+        neighbourhood = gi.load_subnetwork_from_db("SubNet", bus_names=["sub_bus4"], hops=1)
+        assert set(neighbourhood.buses) == {"sub_bus3", "sub_bus4", "sub_bus5"}
+        assert set(neighbourhood.branches) == {"sub_branch3", "sub_branch4"}
+        assert set(neighbourhood.faults) == {"sub_fault4"}
+        assert neighbourhood.sources == {}
+        assert neighbourhood.paths == {}
+
+        fault_net = gi.load_subnetwork_from_db("SubNet", fault_name="sub_fault4")
+        assert set(fault_net.buses) == {f"sub_bus{i}" for i in range(1, 7)}
+        assert set(fault_net.faults) == {"sub_fault4"}
+        assert set(fault_net.sources) == {"sub_source1"}
+        assert {path.fault for path in fault_net.paths.values()} == {"sub_fault4"}
+
+        # every IN clause is chunked, also the one of the paths
+        from groundinsight.database import crud
+
+        monkeypatch.setattr(crud, "_IN_CLAUSE_CHUNK_SIZE", 1)
+        chunked_net = gi.load_subnetwork_from_db("SubNet", fault_name="sub_fault4")
+        assert chunked_net.paths == fault_net.paths
+        monkeypatch.undo()
+
+        with pytest.raises(ValueError):
+            gi.load_subnetwork_from_db("SubNet", bus_names=["unknown_bus"])
+        with pytest.raises(ValueError):
+            gi.load_subnetwork_from_db("SubNet")
+    finally:
+        gi.close_dbsession()
+
+    # the subnetwork gives the same results as the full network
+    gi.run_fault(network=net, fault_name="sub_fault4")
+    gi.run_fault(network=fault_net, fault_name="sub_fault4")
+    full_uepr = {bus.name: bus.uepr for bus in net.results["sub_fault4"].buses}
+    for bus in fault_net.results["sub_fault4"].buses:
+        assert bus.uepr == pytest.approx(full_uepr[bus.name])
+
+def test_network_save_skips_unchanged(tmp_path):
+    #an unchanged network is not rewritten and keeps its stored results
+    net = gi.create_network(name="HashNet", frequencies=[50])
+    bus_type = BusType(
+        name="BusTypeFormulaTest",
+        system_type="Grounded",
+        voltage_level=230.0,
+        impedance_formula="rho * 0 + 1 + I * f * 1/50",
+    )
+    branch_type = BranchType(
+        name="TestBranchType",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0 + 0.25 + I * f * 0.012)*l",
+        mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+    )
+    gi.create_bus(name="hash_bus1", type=bus_type, network=net)
+    gi.create_bus(name="hash_bus2", type=bus_type, network=net)
+    gi.create_branch(name="hash_branch1", type=branch_type, from_bus="hash_bus1", to_bus="hash_bus2", length=1, network=net)
+    gi.create_source(name="hash_source1", bus="hash_bus1", values={50: 60}, network=net)
+    gi.create_fault(name="hash_fault1", bus="hash_bus2", scalings={50: 1.0}, network=net)
+    gi.run_fault(network=net, fault_name="hash_fault1")
+
+    gi.close_dbsession()
+    gi.start_dbsession(sqlite_path=str(tmp_path / "hash.db"))
+    try:
+        assert gi.save_network_to_db(network=net) is True
+        gi.save_results_to_db(network=net)
+        assert gi.save_network_to_db(network=net, overwrite=True) is False
+        assert "hash_fault1" in gi.load_results_from_db("HashNet")
+
+        loaded_net = gi.load_network_from_db("HashNet")
+        assert loaded_net.content_hash == net.content_hash
+        loaded_net.results = gi.load_results_from_db("HashNet")
+        assert loaded_net.is_result_current("hash_fault1")
+
+        # the description and the active fault are stored without a rewrite
+        net.description = "changed description"
+        net.faults["hash_fault1"]._set_active(False)
+        net.active_fault = None
+        assert gi.save_network_to_db(network=net, overwrite=True) is False
+        loaded_net = gi.load_network_from_db("HashNet")
+        assert loaded_net.description == "changed description"
+        assert loaded_net.active_fault is None
+        assert loaded_net.faults["hash_fault1"].active is False
+
+        # in-place changes of an element are detected
+        net.buses["hash_bus2"].specific_earth_resistance = 300.0
+        assert not net.is_result_current("hash_fault1")
+        assert gi.save_network_to_db(network=net, overwrite=True) is True
+        assert gi.load_network_from_db("HashNet").buses["hash_bus2"].specific_earth_resistance == 300.0
+        assert gi.load_results_from_db("HashNet") == {}
+
+        gi.create_bus(name="hash_bus3", type=bus_type, network=net)
+        assert gi.save_network_to_db(network=net, overwrite=True) is True
+    finally:
+        gi.close_dbsession()
+
+def test_upgrade_schema_of_existing_database(tmp_path):
+    #a database written before the content hash and the indexes existed is upgraded on start
+    import shutil
+    from pathlib import Path
+    from sqlalchemy import inspect
+
+    db_path = tmp_path / "grounding.db"
+    shutil.copy(Path(__file__).parent.parent / "notebooks" / "grounding.db", db_path)
+
+    gi.close_dbsession()
+    for run in range(2):
+        # the upgrade is idempotent
+        gi.start_dbsession(sqlite_path=str(db_path))
+        try:
+            inspector = inspect(gi.engine)
+            columns = {column["name"] for column in inspector.get_columns("networks")}
+            assert "content_hash" in columns
+            network_path_indexes = {
+                tuple(index["column_names"]) for index in inspector.get_indexes("network_paths")
+            }
+            assert ("path_name",) in network_path_indexes
+
+            net = gi.load_network_from_db("MyTestNetwork")
+            assert net.buses
+            if run == 0:
+                # the stored network has no content hash yet and is rewritten once
+                assert gi.save_network_to_db(network=net, overwrite=True) is True
+            assert gi.save_network_to_db(network=net, overwrite=True) is False
+        finally:
+            gi.close_dbsession()
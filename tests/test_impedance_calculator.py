@@ -1,6 +1,9 @@
 import pytest
 import numpy as np
-from groundinsight.utils.impedance_calculator import compute_impedance
+from groundinsight.utils.impedance_calculator import (
+    compute_impedance,
+    compute_impedance_array,
+)
 
 
 def test_compute_impedance():
@@ -31,4 +34,27 @@ def test_missing_parameter():
 
     # Test for missing parameters
     with pytest.raises(ValueError) as e:
-        compute_impedance(formula_str, frequencies, params)
\ No newline at end of file
+        compute_impedance(formula_str, frequencies, params)
+
+
+def test_compute_impedance_array():
+    formula_str = "(rho * 0.001 + 0.25 + j * f * 0.012) * l"
+    frequencies = [50, 250]
+    params = {"rho": [100.0, 300.0, 50.0], "l": [1.0, 0.5, 2.0]}
+
+    result = compute_impedance_array(formula_str, frequencies, params)
+
+    assert result.shape == (3, 2)
+    for i in range(3):
+        expected = compute_impedance(
+            formula_str, frequencies, {"rho": params["rho"][i], "l": params["l"][i]}
+        )
+        for j, freq in enumerate(frequencies):
+            assert result[i, j] == pytest.approx(
+                complex(expected[freq].real, expected[freq].imag)
+            )
+
+    # constant formulas are broadcast to all elements
+    constant = compute_impedance_array("1 + rho * 0", frequencies, {"rho": [1.0, 2.0]})
+    assert constant.shape == (2, 2)
+    assert np.all(constant == 1)
@@ -6,6 +6,7 @@ Based on the example from the groundinsight package
 """
 
 import pytest
+import polars as pl
 import groundinsight as gi
 
 def test_save_network_successful(tmp_path):
@@ -68,3 +69,239 @@ def test_save_network_successful(tmp_path):
     assert net.faults == net2.faults
     assert net.paths == net2.paths
     assert net.results == net2.results
+
+
+def test_save_network_to_arrow(tmp_path):
+    """
+    Test that a network with results survives a round trip through the Arrow study format
+    """
+    net = gi.create_network(name="ArrowNet", frequencies=[50, 250])
+
+    bus_type = gi.BusType(
+        name="ArrowBusType",
+        system_type="Grounded",
+        voltage_level=230,
+        impedance_formula="rho * 0 + 1 + I * f * 1/50",
+    )
+
+    branch_type = gi.BranchType(
+        name="ArrowBranchType",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0 + 0.25 + I * f * 0.012)*l",
+        mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+    )
+
+    gi.create_bus(name="bus1", type=bus_type, network=net)
+    gi.create_bus(name="bus2", type=bus_type, network=net, description="middle bus")
+    gi.create_bus(name="bus3", type=bus_type, network=net)
+    gi.create_branch(name="branch1", type=branch_type, from_bus="bus1", to_bus="bus2", length=1, network=net)
+    gi.create_branch(name="branch2", type=branch_type, from_bus="bus2", to_bus="bus3", length=2, network=net)
+    gi.create_source(name="source1", bus="bus1", values={50: 60, 250: 3}, network=net)
+    gi.create_fault(name="fault1", bus="bus3", scalings={50: 1.0, 250: 0.5}, network=net)
+    gi.create_fault(name="fault2", bus="bus2", scalings={50: 1.0}, network=net)
+    gi.create_paths(network=net)
+    gi.run_fault(network=net, fault_name="fault2")
+    gi.run_fault(network=net, fault_name="fault1")
+
+    study = tmp_path / "study"
+    gi.save_network_to_arrow(network=net, path=str(study))
+    net2 = gi.load_network_from_arrow(path=str(study))
+
+    assert net.name == net2.name
+    assert net.frequencies == net2.frequencies
+    assert net.buses == net2.buses
+    assert net.branches == net2.branches
+    assert net.sources == net2.sources
+    assert net.faults == net2.faults
+    assert net.paths == net2.paths
+    assert net.results == net2.results
+    assert net2.active_fault == "fault1"
+    assert net2.faults["fault1"].active
+    assert net2.content_hash == net.content_hash
+    assert net2.is_result_current("fault1")
+
+    # the loaded network can be solved again
+    gi.run_fault(network=net2, fault_name="fault2")
+    assert net.results["fault2"] == net2.results["fault2"]
+
+    # lazy access reads only the requested table
+    tables = gi.scan_network_arrow(str(study))
+    uepr = (
+        tables["result_buses"]
+        .filter(pl.col("fault") == "fault1")
+        .select("bus", "uepr")
+        .collect()
+    )
+    assert dict(uepr.iter_rows()) == {bus.name: bus.uepr for bus in net.results["fault1"].buses}
+
+
+def test_load_network_from_arrow_invalid(tmp_path):
+    """
+    Test that loading a directory without an Arrow study raises an error
+    """
+    with pytest.raises(FileNotFoundError):
+        gi.load_network_from_arrow(path=str(tmp_path))
+
+
+@pytest.mark.parametrize("chunk_size", [7, 65536])
+def test_streaming_json(tmp_path, chunk_size):
+    """
+    Test that the streaming JSON reader and writer produce the same objects as the one-shot functions
+    """
+    net = gi.create_network(name="StreamNet", frequencies=[50, 250])
+
+    bus_type = gi.BusType(
+        name="StreamBusType",
+        system_type="Grounded",
+        voltage_level=230,
+        impedance_formula="rho * 0 + 1 + I * f * 1/50",
+    )
+
+    branch_type = gi.BranchType(
+        name="StreamBranchType",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0 + 0.25 + I * f * 0.012)*l",
+        mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+    )
+
+    gi.create_bus(name="bus1", type=bus_type, network=net, description='quoted "bus" {1}')
+    gi.create_bus(name="bus2", type=bus_type, network=net)
+    gi.create_bus(name="bus3", type=bus_type, network=net)
+    gi.create_branch(name="branch1", type=branch_type, from_bus="bus1", to_bus="bus2", length=1, network=net)
+    gi.create_branch(name="branch2", type=branch_type, from_bus="bus2", to_bus="bus3", length=1.5, network=net)
+    gi.create_source(name="source1", bus="bus1", values={50: 60, 250: 3}, network=net)
+    gi.create_fault(name="fault1", bus="bus3", scalings={50: 1.0, 250: 0.5}, network=net)
+    gi.create_paths(network=net)
+    gi.run_fault(network=net, fault_name="fault1")
+
+    # streaming reader on a file written by the one-shot writer
+    json_file = tmp_path / "network.json"
+    gi.save_network_to_json(network=net, path=str(json_file))
+    expected = gi.load_network_from_json(path=str(json_file))
+    with json_file.open("r") as f:
+        streamed = gi.read_network_json(f, chunk_size=chunk_size)
+    assert streamed == expected
+
+    # one-shot and streaming reader on a file written by the streaming writer
+    stream_file = tmp_path / "network_stream.json"
+    gi.save_network_to_json(network=net, path=str(stream_file), stream=True)
+    assert gi.load_network_from_json(path=str(stream_file)) == expected
+    assert gi.load_network_from_json(path=str(stream_file), stream=True) == expected
+
+
+def test_streaming_json_invalid(tmp_path):
+    """
+    Test that a truncated JSON file raises a ValueError in the streaming reader
+    """
+    json_file = tmp_path / "network.json"
+    json_file.write_text('{"name": "Broken", "frequencies": [50], "buses": {"bus1": {"name": ')
+    with pytest.raises(ValueError):
+        gi.load_network_from_json(path=str(json_file), stream=True)
+
+
+def test_results_lazy(tmp_path, monkeypatch):
+    """
+    Test that the lazy multi-fault result frames match the per-fault DataFrames in memory and on disk
+    """
+    net = gi.create_network(name="LazyNet", frequencies=[50, 250])
+
+    bus_type = gi.BusType(
+        name="LazyBusType",
+        system_type="Grounded",
+        voltage_level=230,
+        impedance_formula="rho * 0 + 1 + I * f * 1/50",
+    )
+
+    branch_type = gi.BranchType(
+        name="LazyBranchType",
+        grounding_conductor=True,
+        self_impedance_formula="(rho * 0 + 0.25 + I * f * 0.012)*l",
+        mutual_impedance_formula="(rho * 0 + 0.0 + I * f * 0.010)*l",
+    )
+
+    for bus in ["bus1", "bus2", "bus3"]:
+        gi.create_bus(name=bus, type=bus_type, network=net)
+    gi.create_branch(name="branch1", type=branch_type, from_bus="bus1", to_bus="bus2", length=1, network=net)
+    gi.create_branch(name="branch2", type=branch_type, from_bus="bus2", to_bus="bus3", length=2, network=net)
+    gi.create_source(name="source1", bus="bus1", values={50: 60, 250: 3}, network=net)
+    gi.create_fault(name="fault1", bus="bus3", scalings={50: 1.0, 250: 0.5}, network=net)
+    gi.create_fault(name="fault2", bus="bus2", scalings={50: 1.0, 250: 1.0}, network=net)
+    gi.create_paths(network=net)
+    gi.run_fault(network=net, fault_name="fault1")
+    gi.run_fault(network=net, fault_name="fault2")
+
+    expected_buses = pl.concat([net.res_buses("fault1"), net.res_buses("fault2")])
+    expected_branches = pl.concat([net.res_branches("fault1"), net.res_branches("fault2")])
+    assert net.results_lazy().collect().equals(expected_buses)
+    assert net.results_lazy("branches").collect().equals(expected_branches)
+    assert net.results_lazy(faults=["fault2"]).collect().equals(net.res_buses("fault2"))
+
+    max_epr = (
+        net.results_lazy()
+        .filter(pl.col("frequency_Hz") == 50)
+        .group_by("bus_name")
+        .agg(pl.col("EPR_V").max())
+        .sort("bus_name")
+        .collect()
+    )
+    assert max_epr["EPR_V"].to_list() == [
+        max(abs(complex(bus.uepr_freq[50.0])) for fault in ["fault1", "fault2"] for bus in net.results[fault].buses if bus.name == name)
+        for name in ["bus1", "bus2", "bus3"]
+    ]
+
+    # a recalculated fault is queried with its new result
+    gi.run_fault(network=net, fault_name="fault1")
+    assert net.results_lazy(faults=["fault1"]).collect().equals(net.res_buses("fault1"))
+
+    # the frames of the faults are only built when the query is collected
+    from groundinsight.models import core_models
+
+    built_frames = []
+    build_bus_frame = core_models._RESULT_FRAME_BUILDERS["buses"]
+
+    def counting_builder(fault, result, **options):
+        built_frames.append((fault, options))
+        return build_bus_frame(fault, result, **options)
+
+    monkeypatch.setitem(core_models._RESULT_FRAME_BUILDERS, "buses", counting_builder)
+    query = net.results_lazy().filter(pl.col("RMS")).select("bus_name", "fault", "EPR_V")
+    assert built_frames == []
+    expected_rms = pl.concat([net.res_buses(fault) for fault in net.results])
+    assert query.collect().equals(expected_rms.filter(pl.col("RMS")).select("bus_name", "fault", "EPR_V"))
+    assert [fault for fault, _ in built_frames] == list(net.results)
+    # only the selected columns are computed and no frequency rows are built for RMS values
+    assert built_frames[0][1]["frequencies"] == set()
+    assert "I_bus_A" not in built_frames[0][1]["columns"]
+
+    # a filter on the fault skips the frames of the other faults
+    built_frames.clear()
+    query = (
+        net.results_lazy()
+        .filter(pl.col("fault") == "fault2")
+        .filter(pl.col("frequency_Hz") == 250)
+        .select("bus_name", "I_bus_degree")
+    )
+    expected = net.res_buses("fault2").filter(pl.col("frequency_Hz") == 250).select("bus_name", "I_bus_degree")
+    assert query.collect().equals(expected)
+    assert [fault for fault, _ in built_frames] == ["fault2"]
+    assert built_frames[0][1]["frequencies"] == {250.0}
+    first_fault = next(iter(net.results))
+    assert net.results_lazy().head(2).collect().equals(net.res_buses(first_fault).head(2))
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError):
+        net.results_lazy(faults=["unknown"])
+
+    # the same queries run on a stored study
+    study = tmp_path / "study"
+    gi.save_network_to_arrow(network=net, path=str(study))
+    sort_columns = ["fault", "bus_name", "RMS", "frequency_Hz"]
+    stored = gi.scan_results_arrow(str(study)).collect().sort(sort_columns)
+    memory = net.results_lazy().collect().sort(sort_columns)
+    assert stored.columns == memory.columns
+    assert stored.drop_nulls("frequency_Hz")["EPR_V"].to_list() == pytest.approx(memory.drop_nulls("frequency_Hz")["EPR_V"].to_list())
+    assert stored.select("fault", "bus_name", "frequency_Hz", "RMS").equals(memory.select("fault", "bus_name", "frequency_Hz", "RMS"))
+    assert stored["I_bus_degree"].to_list()[:2] == pytest.approx(memory["I_bus_degree"].to_list()[:2])
+    branches = gi.scan_results_arrow(str(study), element="branches").collect()
+    assert branches.columns == expected_branches.columns
+    assert branches.height == expected_branches.height
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+import groundinsight as gi
+from groundinsight.models.core_models import Result
+from groundinsight.simulation.krylov import KrylovSolver
+
+@pytest.fixture
+def network(make_network):
+    return make_network("grid", frequencies=[50, 250, 350], columns=4, seed=5)
+
+
+@pytest.mark.parametrize("method", ["gmres", "bicgstab"])
+def test_krylov_solver_matches_lu(network, method):
+    gi.run_fault(network, "fault1", solver="lu")
+    expected = network.results["fault1"]
+    assert expected.convergence is None
+
+    gi.run_fault(network, "fault1", solver="krylov", solver_options={"method": method, "rtol": 1e-12})
+    result = network.results["fault1"]
+    assert network.electrical_network.tree_topology is None
+    for bus, expected_bus in zip(result.buses, expected.buses):
+        assert bus.uepr == pytest.approx(expected_bus.uepr, rel=1e-9)
+    for freq, value in expected.reduction_factor.value.items():
+        assert result.reduction_factor.value[freq] == pytest.approx(value, rel=1e-9)
+
+    assert set(result.convergence) == set(network.frequencies)
+    for convergence in result.convergence.values():
+        assert convergence.method == method
+        assert convergence.converged
+        assert convergence.iterations > 0
+        assert convergence.residual <= 1e-12
+    # the statistics are kept with the result
+    assert Result.model_validate(result.model_dump(mode="json")).convergence == result.convergence
+
+
+def test_krylov_solver_multiple_rhs_and_warm_start(network):
+    gi.run_fault(network, "fault1", solver="krylov")
+    Y = network.electrical_network.Y_matrices[50.0]
+    solver = KrylovSolver(Y, rtol=1e-12)
+    rhs = np.eye(Y.shape[0], 3, dtype=complex)
+    np.testing.assert_allclose(solver.solve(rhs), np.linalg.solve(Y.toarray(), rhs), rtol=1e-9, atol=1e-12)
+
+    # starting from the solution needs no iterations
+    iterations = solver.iterations
+    solver.solve(rhs[:, 0], x0=np.linalg.solve(Y.toarray(), rhs[:, 0]))
+    assert solver.iterations == iterations
+    assert solver.nbytes > 0
+
+
+def test_krylov_solver_not_converged(network, capsys):
+    gi.run_fault(network, "fault1", solver="lu")
+    expected = network.results["fault1"]
+    options = {"method": "bicgstab", "rtol": 1e-15, "maxiter": 1, "drop_tol": 0.5, "fill_factor": 1}
+
+    # the frequencies that do not converge are solved with sparse LU
+    gi.run_fault(network, "fault1", solver="krylov", solver_options=options)
+    assert "did not converge" in capsys.readouterr().out
+    result = network.results["fault1"]
+    assert not all(convergence.converged for convergence in result.convergence.values())
+    assert all(
+        convergence.fallbacks > 0
+        for convergence in result.convergence.values()
+        if not convergence.converged
+    )
+    for bus, expected_bus in zip(result.buses, expected.buses):
+        assert bus.uepr == pytest.approx(expected_bus.uepr, rel=1e-9)
+
+    with pytest.raises(RuntimeError, match="did not converge"):
+        gi.run_fault(network, "fault1", solver="krylov", solver_options={**options, "on_failure": "raise"})
+
+
+def test_krylov_solver_options(network):
+    with pytest.raises(ValueError):
+        gi.run_fault(network, "fault1", solver="krylov", solver_options={"tolerance": 1e-8})
+    with pytest.raises(ValueError):
+        gi.run_fault(network, "fault1", solver="lu", solver_options={"rtol": 1e-8})
+    with pytest.raises(ValueError):
+        gi.run_fault(network, "fault1", solver="krylov", solver_options={"method": "cg"})
+    with pytest.raises(ValueError):
+        gi.run_fault(network, "fault1", solver="krylov", solver_options={"on_failure": "ignore"})
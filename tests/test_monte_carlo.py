@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+import groundinsight as gi
+from groundinsight.simulation.monte_carlo import StreamingStatistics
+
+@pytest.mark.parametrize("topology", ["grid", "tree"])
+def test_samples_match_full_calculations(make_network, topology):
+    network = make_network(topology)
+    elements = list(network.buses.values()) + list(network.branches.values())
+    rho = np.random.default_rng(1).uniform(20.0, 1000.0, len(elements))
+    analysis = gi.MonteCarloAnalysis(network, "fault1", sampler=lambda rng, nominal, size: np.tile(rho, (size, 1)),
+                                     batch_size=3)
+    assert (analysis._topology is not None) == (topology == "tree")
+    analysis.run(3)
+    # the statistics of the identical samples are those of one sample
+    epr = analysis.epr_statistics()
+    reduction_factor = analysis.reduction_factor_statistics()
+    assert epr["samples"].to_list() == [3] * len(epr)
+
+    expected = make_network(topology)
+    for element, value in zip(list(expected.buses.values()) + list(expected.branches.values()), rho):
+        element.specific_earth_resistance = value
+        element.calculate_impedance(expected.frequencies)
+    gi.run_fault(expected, "fault1")
+    result = expected.results["fault1"]
+    for bus in result.buses:
+        rows = epr.filter(epr["bus_name"] == bus.name)
+        expected_epr = [abs(complex(bus.uepr_freq[f])) for f in network.frequencies] + [bus.uepr]
+        np.testing.assert_allclose(rows["EPR_mean_V"].to_numpy(), expected_epr, rtol=1e-9)
+        np.testing.assert_allclose(rows["EPR_p50_V"].to_numpy(), expected_epr, rtol=1e-9)
+        assert rows["EPR_std_V"].to_list() == pytest.approx([0.0] * 3, abs=1e-9)
+    np.testing.assert_allclose(reduction_factor["RF_mean"].to_numpy(),
+                               [result.reduction_factor.value[f] for f in network.frequencies], rtol=1e-9)
+
+
+def test_streaming_statistics():
+    values = np.exp(np.random.default_rng(0).standard_normal((4000, 6))) * np.arange(1, 7)
+    statistics = StreamingStatistics(6, (5.0, 50.0, 95.0))
+    statistics.update(values[:1000])
+    statistics.update(values[1000:])
+    assert statistics.count == 4000
+    np.testing.assert_allclose(statistics.mean, values.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(statistics.std, values.std(axis=0, ddof=1), rtol=1e-10)
+    np.testing.assert_allclose(statistics.minimum, values.min(axis=0))
+    np.testing.assert_allclose(statistics.maximum, values.max(axis=0))
+    np.testing.assert_allclose(statistics.percentile_values(), np.percentile(values, (5, 50, 95), axis=0),
+                               rtol=0.1)
+    with pytest.raises(ValueError):
+        StreamingStatistics(6, (0.0, 50.0))
+
+
+def test_monte_carlo_accumulates_samples(make_network):
+    analysis = gi.MonteCarloAnalysis(make_network("grid"), "fault1", seed=0, batch_size=8)
+    with pytest.raises(RuntimeError):
+        analysis.epr_statistics()
+    with pytest.raises(RuntimeError):
+        analysis.reduction_factor_statistics()
+    first = analysis.run(10)
+    assert first.columns == [
+        "bus_name", "fault", "frequency_Hz", "RMS", "samples", "EPR_mean_V", "EPR_std_V", "EPR_min_V",
+        "EPR_max_V", "EPR_p5_V", "EPR_p50_V", "EPR_p95_V",
+    ]
+    assert len(first) == 9 * 3
+    frame = analysis.run(15)
+    assert analysis.n_samples == 25
+    assert frame["samples"].to_list() == [25] * len(frame)
+    assert (frame["EPR_min_V"] <= frame["EPR_p50_V"]).all()
+    assert (frame["EPR_p50_V"] <= frame["EPR_max_V"]).all()
+    assert analysis.reduction_factor_statistics()["frequency_Hz"].to_list() == [50.0, 250.0]
+
+    # the same seed draws the same samples
+    repeated = gi.MonteCarloAnalysis(make_network("grid"), "fault1", seed=0, batch_size=8)
+    repeated.run(25)
+    assert repeated.epr_statistics()["EPR_mean_V"].to_list() == pytest.approx(frame["EPR_mean_V"].to_list())
+
+
+def test_monte_carlo_errors(make_network):
+    with pytest.raises(ValueError):
+        gi.MonteCarloAnalysis(make_network("grid"), "fault99")
+    with pytest.raises(ValueError):
+        gi.MonteCarloAnalysis(make_network("grid"), "fault1", sigma=-0.1)
+    analysis = gi.MonteCarloAnalysis(make_network("grid"), "fault1", sampler=lambda rng, nominal, size: nominal)
+    with pytest.raises(ValueError):
+        analysis.run(2)
@@ -0,0 +1,102 @@
+import pytest
+import groundinsight as gi
+from groundinsight.models.core_models import Bus, Branch
+
+
+def test_generator_topologies(bus_type, branch_type):
+    frequencies = [50, 250]
+    grid = gi.create_grid_network(
+        name="Grid", frequencies=frequencies, rows=3, columns=4,
+        bus_type=bus_type, branch_type=branch_type,
+    )
+    assert len(grid.buses) == 12
+    assert len(grid.branches) == 3 * 3 + 2 * 4
+    assert grid.faults["fault1"].bus == "bus12"
+
+    tree = gi.create_tree_network(
+        name="Tree", frequencies=frequencies, number_buses=13, branching=3,
+        bus_type=bus_type, branch_type=branch_type,
+    )
+    assert len(tree.branches) == 12
+    children = [b.to_bus for b in tree.branches.values() if b.from_bus == "bus1"]
+    assert children == ["bus2", "bus3", "bus4"]
+
+    ring = gi.create_ring_network(
+        name="Ring", frequencies=frequencies, number_buses=10,
+        bus_type=bus_type, branch_type=branch_type,
+    )
+    assert len(ring.branches) == 10
+    assert ring.branches["branch10"].to_bus == "bus1"
+    assert ring.faults["fault1"].bus == "bus6"
+
+    bundle = gi.create_parallel_network(
+        name="Parallel", frequencies=frequencies, number_buses=5, parallel_branches=3,
+        bus_type=bus_type, branch_type=branch_type, number_sources=2,
+    )
+    assert len(bundle.branches) == 12
+    assert sorted(bundle.sources) == ["source1", "source3"]
+
+    with pytest.raises(ValueError):
+        gi.create_ring_network(
+            name="Ring", frequencies=frequencies, number_buses=2,
+            bus_type=bus_type, branch_type=branch_type,
+        )
+    with pytest.raises(ValueError):
+        gi.create_tree_network(
+            name="Tree", frequencies=frequencies, number_buses=10,
+            bus_type=bus_type, branch_type=branch_type, rho_range=(200.0, 100.0),
+        )
+
+
+def test_generator_seed_and_impedances(bus_type, branch_type):
+    kwargs = dict(
+        name="Grid", frequencies=[50, 250], rows=4, columns=4,
+        bus_type=bus_type, branch_type=branch_type,
+        rho_range=(50.0, 500.0), length_range=(0.5, 2.0),
+    )
+    net = gi.create_grid_network(seed=7, **kwargs)
+    same = gi.create_grid_network(seed=7, **kwargs)
+    other = gi.create_grid_network(seed=8, **kwargs)
+    assert net.content_hash == same.content_hash
+    assert net.content_hash != other.content_hash
+
+    rhos = [bus.specific_earth_resistance for bus in net.buses.values()]
+    assert min(rhos) >= 50.0 and max(rhos) <= 500.0
+    assert len(set(rhos)) == len(rhos)
+
+    # the bulk impedances match those of the single element path
+    for bus in net.buses.values():
+        expected = Bus(
+            name=bus.name, type=bus_type, impedance={},
+            specific_earth_resistance=bus.specific_earth_resistance,
+        )
+        expected.calculate_impedance(net.frequencies)
+        assert bus.impedance == expected.impedance
+    for branch in net.branches.values():
+        expected = Branch(
+            name=branch.name, type=branch_type, length=branch.length,
+            from_bus=branch.from_bus, to_bus=branch.to_bus,
+            self_impedance={}, mutual_impedance={},
+            specific_earth_resistance=branch.specific_earth_resistance,
+        )
+        expected.calculate_impedance(net.frequencies)
+        for freq in net.frequencies:
+            assert branch.self_impedance[freq].real == pytest.approx(expected.self_impedance[freq].real)
+            assert branch.self_impedance[freq].imag == pytest.approx(expected.self_impedance[freq].imag)
+            assert branch.mutual_impedance[freq].imag == pytest.approx(expected.mutual_impedance[freq].imag)
+
+    gi.create_paths(network=net)
+    gi.run_fault(network=net, fault_name="fault1")
+    res_buses = net.res_buses("fault1")
+    assert len(res_buses.filter(res_buses["RMS"])) == 16
+
+
+def test_add_buses_duplicates(bus_type):
+    net = gi.create_network(name="Bulk", frequencies=[50])
+    net.add_buses([Bus(name="bus1", type=bus_type, impedance={})])
+    with pytest.raises(ValueError):
+        net.add_buses([Bus(name="bus1", type=bus_type, impedance={})])
+    with pytest.raises(ValueError):
+        net.add_buses([Bus(name="bus2", type=bus_type, impedance={})] * 2)
+    net.add_buses([Bus(name="bus1", type=bus_type, impedance={}, specific_earth_resistance=200.0)], overwrite=True)
+    assert net.buses["bus1"].impedance[50.0].real == pytest.approx(3.0)
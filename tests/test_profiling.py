@@ -0,0 +1,47 @@
+import pytest
+import groundinsight as gi
+from groundinsight.profiling import stage, _NULL_STAGE
+
+
+def test_stage_profiler(network):
+    # the grid is meshed and is solved per frequency with sparse LU
+    records = []
+    with gi.StageProfiler(callback=records.append) as profiler:
+        gi.run_fault(network=network, fault_name="fault1")
+        gi.run_fault(network=network, fault_name="fault1")
+
+    frame = profiler.to_frame()
+    assert frame.columns == [
+        "fault", "stage", "frequency_Hz", "calls", "wall_time_s", "peak_memory_bytes",
+    ]
+    stages = set(frame["stage"])
+    for name in ["run_fault", "paths", "build", "solve", "branch_currents",
+                 "reduction_factors", "grounding_impedance", "build.admittance", "solve.linear"]:
+        assert name in stages
+    assert set(frame["fault"]) == {"fault1"}
+
+    solve = frame.filter(frame["stage"] == "solve")
+    assert solve["calls"].to_list() == [2]
+    assert solve["frequency_Hz"].to_list() == [None]
+    linear = frame.filter(frame["stage"] == "solve.linear").sort("frequency_Hz")
+    assert linear["frequency_Hz"].to_list() == [50.0, 250.0]
+    assert linear["calls"].to_list() == [2, 2]
+    assert frame["peak_memory_bytes"].null_count() == len(frame)
+
+    # the callback gets one record per stage run
+    assert len(records) == frame["calls"].sum()
+    assert records[-1]["stage"] == "run_fault"
+
+    # nothing is recorded without an active profiler
+    assert stage("solve") is _NULL_STAGE
+    gi.run_fault(network=network, fault_name="fault1")
+    assert profiler.to_frame()["calls"].sum() == len(records)
+
+
+def test_stage_profiler_memory(network):
+    with gi.StageProfiler(memory=True) as profiler:
+        gi.run_fault(network=network, fault_name="fault1")
+    frame = profiler.to_frame()
+    assert frame["peak_memory_bytes"].null_count() == 0
+    run = frame.filter(frame["stage"] == "run_fault")["peak_memory_bytes"][0]
+    assert run >= frame["peak_memory_bytes"].max() > 0
@@ -0,0 +1,115 @@
+import time
+import numpy as np
+import polars as pl
+import pytest
+import groundinsight as gi
+from groundinsight.electrical_network import admittance_matrices
+
+KEEP = ["bus1", "bus2", "bus6", "bus12"]
+
+
+@pytest.fixture(scope="module")
+def uncoupled_branch_type(branch_type):
+    # without mutual impedance, the equivalent network is exact for all buses that are kept
+    return branch_type.model_copy(
+        update={"name": "UncoupledBranchType", "mutual_impedance_formula": "0 * l"}
+    )
+
+
+@pytest.fixture
+def network(make_network, uncoupled_branch_type):
+    network = make_network(
+        "grid", columns=4, number_sources=1, branch_type=uncoupled_branch_type
+    )
+    gi.create_paths(network)
+    return network
+
+
+def test_reduced_admittance(network):
+    reduced = network.reduced_admittance(KEEP)
+    bus_indices = {name: idx for idx, name in enumerate(network.buses)}
+    keep = [bus_indices[name] for name in KEEP]
+    eliminated = [idx for idx in range(len(bus_indices)) if idx not in keep]
+    for freq, matrix in admittance_matrices(network, bus_indices).items():
+        Y = matrix.toarray()
+        expected = Y[np.ix_(keep, keep)] - Y[np.ix_(keep, eliminated)] @ np.linalg.solve(
+            Y[np.ix_(eliminated, eliminated)], Y[np.ix_(eliminated, keep)]
+        )
+        np.testing.assert_allclose(reduced[float(freq)], expected, rtol=1e-10)
+
+
+def test_reduce_network(network, tmp_path):
+    gi.run_fault(network, "fault1")
+    equivalent = network.reduce(keep_buses=KEEP, name="Equivalent")
+    assert list(equivalent.buses) == KEEP
+    assert set(equivalent.sources) == {"source1"}
+    assert set(equivalent.faults) == {"fault1"}
+    # bus1-bus2 is a kept branch, the equivalent branch in parallel has no share of its current
+    assert equivalent.branches["bus1-bus2_equivalent"].parallel_coefficient == 0.0
+    # the paths of the network are restricted to the kept branches
+    assert equivalent.paths
+    assert all(
+        segment.name in network.branches
+        for path in equivalent.paths.values()
+        for segment in path.segments
+    )
+    gi.run_fault(equivalent, "fault1")
+
+    columns = ["bus_name", "frequency_Hz", "RMS", "EPR_V", "EPR_degree"]
+    expected = network.res_buses("fault1").filter(pl.col("bus_name").is_in(KEEP)).select(columns)
+    actual = equivalent.res_buses("fault1").select(columns)
+    # the RMS rows have a null frequency and are joined by bus only
+    joined = expected.filter(~pl.col("RMS")).join(
+        actual.filter(~pl.col("RMS")), on=["bus_name", "frequency_Hz"]
+    )
+    assert joined.height == len(KEEP) * len(network.frequencies)
+    np.testing.assert_allclose(joined["EPR_V"], joined["EPR_V_right"], rtol=1e-9)
+    np.testing.assert_allclose(joined["EPR_degree"], joined["EPR_degree_right"], atol=1e-7)
+    joined_rms = expected.filter(pl.col("RMS")).join(actual.filter(pl.col("RMS")), on="bus_name")
+    assert joined_rms.height == len(KEEP)
+    np.testing.assert_allclose(joined_rms["EPR_V"], joined_rms["EPR_V_right"], rtol=1e-9)
+
+    kept_branch = [branch.name for branch in network.branches.values()
+                   if branch.from_bus == "bus1" and branch.to_bus == "bus2"][0]
+    assert equivalent.results["fault1"].branches[0].name == kept_branch
+    assert equivalent.results["fault1"].branches[0].i_s == pytest.approx(
+        next(branch.i_s for branch in network.results["fault1"].branches if branch.name == kept_branch),
+        rel=1e-9,
+    )
+
+    # the tabulated impedances survive a JSON round trip
+    gi.save_network_to_json(equivalent, str(tmp_path / "equivalent.json"))
+    loaded = gi.load_network_from_json(str(tmp_path / "equivalent.json"))
+    for name, bus in equivalent.buses.items():
+        assert loaded.buses[name].impedance == bus.impedance
+
+
+def test_reduce_network_errors(network):
+    with pytest.raises(ValueError):
+        network.reduce(keep_buses=["bus1", "bus6"])  # the fault is at bus12
+    with pytest.raises(ValueError):
+        network.reduce(keep_buses=["bus1", "bus12", "bus1"])
+    with pytest.raises(ValueError):
+        network.reduced_admittance(["bus1", "unknown"])
+    with pytest.raises(ValueError):
+        network.reduced_admittance([])
+
+
+def test_reduce_meshed_network_paths(make_network, uncoupled_branch_type):
+    """
+    Test that the paths of a meshed equivalent are not searched over its equivalent branches
+    """
+    network = make_network(
+        "grid", rows=10, columns=10, number_sources=1, seed=5, branch_type=uncoupled_branch_type
+    )
+    keep = ["bus1", "bus2", "bus3", "bus23", "bus45", "bus56", "bus67", "bus78", "bus89", "bus100"]
+    equivalent = network.reduce(keep_buses=keep)
+    # all pairs of kept buses are coupled, which would give hundreds of thousands of paths
+    assert len(equivalent.branches) == 2 + len(keep) * (len(keep) - 1) // 2
+
+    start = time.perf_counter()
+    gi.run_fault(equivalent, "fault1")
+    assert time.perf_counter() - start < 2.0
+    # the source and the fault are only connected through eliminated buses
+    assert len(equivalent.paths) == 1
+    assert next(iter(equivalent.paths.values())).segments == []
@@ -0,0 +1,102 @@
+# tests/test_result_index.py
+
+import polars as pl
+import pytest
+import groundinsight as gi
+
+
+@pytest.fixture
+def solved_network(make_network):
+    """
+    A chain network with a source at the first bus and a solved fault at every other bus.
+    """
+    net = make_network("chain", name="IndexNetwork", number_buses=8, number_sources=1)
+    for index in range(2, 8):
+        gi.create_fault(name=f"fault{index}", bus=f"bus{index}", scalings={50: 1.0, 250: 1.0}, network=net)
+    gi.create_paths(network=net)
+    for fault_name in net.faults:
+        gi.run_fault(network=net, fault_name=fault_name)
+    return net
+
+
+def _brute_force(net, frequency=None):
+    rows = pl.concat([net.res_buses(fault) for fault in net.results])
+    if frequency is None:
+        rows = rows.filter(pl.col("RMS"))
+    else:
+        rows = rows.filter(pl.col("frequency_Hz") == frequency)
+    return rows.sort("EPR_V", descending=True)
+
+
+def test_worst_cases_top_k(solved_network):
+    """
+    Test that the top-k query returns the same values as a full scan of the results
+    """
+    net = solved_network
+    assert set(net._result_summaries) == set(net.results)
+
+    for frequency in [None, 50, 250]:
+        expected = _brute_force(net, frequency)
+        worst = net.worst_cases(metric="uepr", k=5, frequency=frequency)
+        assert worst.columns == ["fault", "bus_name", "frequency_Hz", "value"]
+        assert worst["value"].to_list() == pytest.approx(expected["EPR_V"].head(5).to_list())
+        assert worst["frequency_Hz"].to_list() == [frequency] * 5
+
+    everything = net.worst_cases(k=None)
+    assert everything.height == len(net.results) * len(net.buses)
+
+    branches = net.worst_cases(metric="i_s", k=3, frequency=50)
+    expected = pl.concat([net.res_branches(fault) for fault in net.results]).filter(pl.col("frequency_Hz") == 50)
+    assert branches["value"].to_list() == pytest.approx(expected["I_branch_A"].sort(descending=True).head(3).to_list())
+
+
+def test_worst_cases_threshold_and_grouping(solved_network):
+    """
+    Test threshold queries and the per-fault and per-element maxima
+    """
+    net = solved_network
+    expected = _brute_force(net)
+    threshold = expected["EPR_V"][10]
+
+    above = net.worst_cases(k=None, threshold=threshold)
+    assert above.height == expected.filter(pl.col("EPR_V") >= threshold).height
+    assert above["value"].min() >= threshold
+
+    per_fault = net.worst_cases(k=None, per="fault")
+    assert per_fault["fault"].n_unique() == len(net.results)
+    for fault, value in zip(per_fault["fault"], per_fault["value"]):
+        assert value == pytest.approx(net.res_buses(fault).filter(pl.col("RMS"))["EPR_V"].max())
+
+    per_bus = net.worst_cases(k=None, per="element")
+    assert sorted(per_bus["bus_name"].to_list()) == sorted(net.buses)
+    bus_max = expected.group_by("bus_name").agg(pl.col("EPR_V").max())
+    for bus, value in bus_max.iter_rows():
+        assert per_bus.filter(pl.col("bus_name") == bus)["value"][0] == pytest.approx(value)
+
+    with pytest.raises(ValueError):
+        net.worst_cases(metric="unknown")
+    with pytest.raises(ValueError):
+        net.worst_cases(per="unknown")
+
+
+def test_worst_cases_follows_result_changes(solved_network):
+    """
+    Test that the index follows replaced, removed and spilled results
+    """
+    net = solved_network
+    before = net.worst_cases(k=None, per="fault")
+
+    del net.results["fault1"]
+    assert "fault1" not in net.worst_cases(k=None, per="fault")["fault"].to_list()
+
+    net.faults["fault5"].scalings[50.0] = 2.0
+    gi.run_fault(network=net, fault_name="fault5")
+    after = net.worst_cases(k=None, per="fault")
+    old_value = before.filter(pl.col("fault") == "fault5")["value"][0]
+    assert after.filter(pl.col("fault") == "fault5")["value"][0] > old_value
+
+    # spilled results are not loaded again for queries
+    net.limit_result_memory(max_bytes=1)
+    net.worst_cases(k=None)
+    assert len(net.results.spilled) == len(net.results) - 1
+    assert net.worst_cases(k=None, per="fault").equals(after.filter(pl.col("fault") != "fault1"))
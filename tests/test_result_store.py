@@ -0,0 +1,106 @@
+# tests/test_result_store.py
+
+import os
+import pickle
+import pytest
+import groundinsight as gi
+from groundinsight.models.result_store import ResultStore, estimate_result_size
+
+
+def _sweep_network(make_network, name):
+    """
+    Build a chain network with a source at the first bus and a fault at every other bus.
+    """
+    net = make_network("chain", name=name, number_buses=6, number_sources=1)
+    for index in range(2, 6):
+        gi.create_fault(name=f"fault{index}", bus=f"bus{index}", scalings={50: 1.0, 250: 1.0}, network=net)
+    return net
+
+
+def test_result_store_spills_and_reloads(tmp_path, make_network):
+    """
+    Test that a fault sweep with a small memory budget spills results and reloads them transparently
+    """
+    reference = _sweep_network(make_network, "StoreReference")
+    net = _sweep_network(make_network, "StoreLimited")
+    for fault_name in reference.faults:
+        gi.run_fault(network=reference, fault_name=fault_name)
+
+    one_result = estimate_result_size(reference.results["fault2"])
+    spill_file = tmp_path / "results.spill"
+    net.limit_result_memory(max_bytes=2 * one_result, spill_path=str(spill_file))
+    for fault_name in net.faults:
+        gi.run_fault(network=net, fault_name=fault_name)
+
+    store = net.results
+    assert isinstance(store, ResultStore)
+    assert store.memory_bytes <= 2 * one_result
+    assert store.spilled == ["fault1", "fault2", "fault3"]
+    assert os.path.getsize(spill_file) > 0
+
+    # spilled results are loaded on access
+    assert list(net.results) == list(reference.results)
+    assert net.results["fault2"] == reference.results["fault2"]
+    assert "fault2" not in store.spilled
+    assert net.res_buses("fault3").equals(reference.res_buses("fault3"))
+    assert net.results_lazy().collect().equals(reference.results_lazy().collect())
+    assert net.results == reference.results
+    assert store.memory_bytes <= 2 * one_result
+
+    # serialization sees all results
+    assert net.model_dump(mode="json")["results"] == reference.model_dump(mode="json")["results"]
+
+    # replacing a result drops its spilled copy, deleting removes it
+    gi.run_fault(network=net, fault_name="fault2")
+    assert net.results["fault2"] == reference.results["fault2"]
+    del net.results["fault4"]
+    assert "fault4" not in net.results
+    with pytest.raises(KeyError):
+        net.results["fault4"]
+
+    # without a limit the results are plain dictionary entries again
+    net.limit_result_memory(max_bytes=None)
+    assert type(net.results) is dict
+    assert net.results["fault3"] == reference.results["fault3"]
+    # an explicit spill path is kept
+    assert spill_file.exists()
+
+
+def test_result_store_temporary_spill_file():
+    """
+    Test that the temporary spill file is removed when the store is closed
+    """
+    with pytest.raises(ValueError):
+        ResultStore(max_bytes=0)
+
+    store = ResultStore(max_bytes=1)
+    assert os.path.exists(store.spill_path)
+    store.close()
+    assert not os.path.exists(store.spill_path)
+
+
+def test_result_store_compacts_spill_file(tmp_path, make_network):
+    """
+    Test that overwriting the same faults again and again does not grow the spill file
+    """
+    net = _sweep_network(make_network, "StoreCompaction")
+    for fault_name in ["fault2", "fault3"]:
+        gi.run_fault(network=net, fault_name=fault_name)
+    results = {fault_name: net.results[fault_name] for fault_name in ["fault2", "fault3"]}
+    one_spill = max(len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)) for result in results.values())
+
+    spill_file = tmp_path / "results.spill"
+    store = ResultStore(max_bytes=1, spill_path=str(spill_file))
+    for _ in range(20):
+        # each assignment evicts the other fault and makes its previous spilled copy stale
+        for fault_name, result in results.items():
+            store[fault_name] = result
+        assert os.path.getsize(spill_file) <= 4 * one_spill
+        assert store.spill_bytes == os.path.getsize(spill_file)
+
+    assert store["fault2"] == results["fault2"]
+    assert store["fault3"] == results["fault3"]
+    del store["fault2"]
+    del store["fault3"]
+    assert os.path.getsize(spill_file) == 0
+    store.close()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+import groundinsight as gi
+from groundinsight.models.core_models import ComplexNumber
+
+STEP = 1e-6
+
+
+def _perturbed(network, element_type, element, impedance):
+    """EPR phasors and reduction factors at the fault bus after changing an impedance by STEP * Z."""
+    model = (network.buses if element_type == "bus" else network.branches)[element]
+    values = getattr(model, impedance)
+    setattr(model, impedance, {
+        freq: ComplexNumber(real=z.real * (1 + STEP), imag=z.imag * (1 + STEP)) for freq, z in values.items()
+    })
+    gi.run_fault(network, "fault1")
+    electrical_network = network.electrical_network
+    fault_index = electrical_network.bus_indices["bus9"]
+    epr = np.array([electrical_network.u_vectors[freq][fault_index] for freq in network.frequencies])
+    reduction_factor = np.array(list(network.results["fault1"].reduction_factor.value.values()))
+    return epr, reduction_factor, {freq: complex(z) for freq, z in values.items()}
+
+
+@pytest.fixture(scope="module")
+def analysis(make_network):
+    return gi.SensitivityAnalysis(make_network("grid"), "fault1")
+
+
+@pytest.mark.parametrize("element_type, element, impedance", [
+    ("bus", "bus5", "impedance"),
+    ("bus", "bus9", "impedance"),
+    ("branch", "branch3", "self_impedance"),
+    ("branch", "branch12", "self_impedance"),
+    ("branch", "branch6", "mutual_impedance"),
+])
+def test_sensitivities_match_finite_differences(
+    analysis, make_network, element_type, element, impedance
+):
+    frame = analysis.impedance_sensitivities()
+    assert frame.columns == [
+        "element_type", "element", "impedance", "frequency_Hz", "RMS", "dEPR_dZ_real", "dEPR_dZ_imag",
+        "EPR_sensitivity", "dRF_dZ_real", "dRF_dZ_imag", "RF_sensitivity",
+    ]
+    assert len(frame) == (9 + 2 * 12) * 3
+    rows = frame.filter(
+        (frame["element"] == element) & (frame["impedance"] == impedance) & ~frame["RMS"]
+    )
+    assert rows["frequency_Hz"].to_list() == [50.0, 250.0]
+
+    electrical_network = analysis.electrical_network
+    fault_index = electrical_network.bus_indices["bus9"]
+    epr = np.array([electrical_network.u_vectors[freq][fault_index] for freq in analysis.frequencies])
+    reduction_factor = np.array(list(analysis.network.results["fault1"].reduction_factor.value.values()))
+    new_epr, new_reduction_factor, impedances = _perturbed(make_network("grid"), element_type, element, impedance)
+    delta = STEP * np.array([impedances[freq] for freq in analysis.frequencies])
+
+    depr = rows["dEPR_dZ_real"].to_numpy() + 1j * rows["dEPR_dZ_imag"].to_numpy()
+    drf = rows["dRF_dZ_real"].to_numpy() + 1j * rows["dRF_dZ_imag"].to_numpy()
+    np.testing.assert_allclose(depr * delta, new_epr - epr, rtol=1e-4, atol=1e-12)
+    np.testing.assert_allclose(rows["EPR_sensitivity"].to_numpy() * STEP, np.abs(new_epr) / np.abs(epr) - 1,
+                               rtol=1e-4, atol=1e-12)
+    np.testing.assert_allclose(np.real(drf * delta), new_reduction_factor - reduction_factor, rtol=1e-4, atol=1e-12)
+    np.testing.assert_allclose(rows["RF_sensitivity"].to_numpy() * STEP, new_reduction_factor - reduction_factor,
+                               rtol=1e-4, atol=1e-12)
+
+    # the RMS row weights the frequencies with their squared EPR
+    rms = frame.filter((frame["element"] == element) & (frame["impedance"] == impedance) & frame["RMS"])
+    rms_epr = np.sqrt(np.sum(np.abs(epr) ** 2))
+    new_rms_epr = np.sqrt(np.sum(np.abs(new_epr) ** 2))
+    assert rms["EPR_sensitivity"][0] * STEP == pytest.approx(new_rms_epr / rms_epr - 1, rel=1e-4)
+    assert rms["dEPR_dZ_real"][0] is None
+
+
+def test_sensitivity_selection(analysis, make_network):
+    frame = analysis.impedance_sensitivities(buses=["bus1"], branches=["branch2"])
+    assert frame["impedance"].to_list() == ["impedance"] * 3 + ["self_impedance"] * 3 + ["mutual_impedance"] * 3
+    with pytest.raises(ValueError):
+        analysis.impedance_sensitivities(buses=["bus99"])
+    with pytest.raises(ValueError):
+        analysis.impedance_sensitivities(branches=["branch99"])
+    with pytest.raises(ValueError):
+        gi.SensitivityAnalysis(make_network("grid"), "fault99")
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import groundinsight as gi
+from groundinsight.models.core_models import Fault
+
+def assert_results_close(result, expected):
+    assert [bus.name for bus in result.buses] == [bus.name for bus in expected.buses]
+    for bus, expected_bus in zip(result.buses, expected.buses):
+        assert bus.uepr == pytest.approx(expected_bus.uepr, rel=1e-9)
+        assert bus.ia == pytest.approx(expected_bus.ia, rel=1e-9)
+        for freq, value in expected_bus.uepr_freq.items():
+            assert complex(bus.uepr_freq[freq]) == pytest.approx(complex(value), rel=1e-9)
+    for branch, expected_branch in zip(result.branches, expected.branches):
+        assert branch.name == expected_branch.name
+        assert branch.i_s == pytest.approx(expected_branch.i_s, rel=1e-9, abs=1e-9)
+        for freq, value in expected_branch.i_s_freq.items():
+            assert complex(branch.i_s_freq[freq]) == pytest.approx(complex(value), rel=1e-9, abs=1e-9)
+    for freq, value in expected.reduction_factor.value.items():
+        assert result.reduction_factor.value[freq] == pytest.approx(value, rel=1e-9)
+    for freq, value in expected.grounding_impedance.value.items():
+        assert complex(result.grounding_impedance.value[freq]) == pytest.approx(complex(value), rel=1e-9)
+
+
+@pytest.mark.parametrize("topology, size", [
+    ("ring", {"number_buses": 12}),
+    ("tree", {"number_buses": 30, "branching": 3}),
+])
+def test_rescale_sources(make_network, topology, size):
+    def build():
+        network = make_network(topology, seed=4, **size)
+        network.add_fault(Fault(name="fault2", bus="bus3", scalings={50: 1.0, 250: 0.5}))
+        return network
+
+    network = build()
+    for fault_name in network.faults:
+        gi.run_fault(network, fault_name, store_unit_responses=True)
+    source1, source2 = list(network.sources)
+
+    # the stored responses reproduce the calculated results
+    assert network._unit_responses["fault2"].sources == [source1, source2]
+    for fault_name, response in network._unit_responses.items():
+        assert_results_close(response.result(network), network.results[fault_name])
+
+    updated = network.rescale_sources(
+        sources={source1: {50: 1500.0 - 200.0j}, source2: 0.5},
+        scalings={"fault1": {50: 0.8, 250: 1.2}},
+    )
+    assert updated == ["fault1", "fault2"]
+    assert network.sources[source1].values[50].real == 1500.0
+    assert network.sources[source2].values[250].real == 500.0
+    assert network.faults["fault1"].scalings == {50.0: 0.8, 250.0: 1.2}
+
+    expected = build()
+    expected.sources[source1].values[50] = gi.models.core_models.ComplexNumber(real=1500.0, imag=-200.0)
+    expected.sources[source2].values = {freq: value * 0.5 for freq, value in expected.sources[source2].values.items()}
+    expected.faults["fault1"].scalings = {50.0: 0.8, 250.0: 1.2}
+    for fault_name in expected.faults:
+        gi.run_fault(expected, fault_name)
+        assert network.is_result_current(fault_name)
+        assert_results_close(network.results[fault_name], expected.results[fault_name])
+        assert network.results[fault_name].network_hash == expected.content_hash
+
+    # the worst-case index follows the updated results
+    worst = network.worst_cases(k=1)
+    assert worst["value"][0] == pytest.approx(
+        max(bus.uepr for result in expected.results.values() for bus in result.buses), rel=1e-9
+    )
+
+    report = network.memory_report()
+    row = report.filter(report["component"] == "unit_responses").row(0, named=True)
+    assert row["count"] == 2 and row["bytes"] == sum(r.nbytes for r in network._unit_responses.values())
+
+
+def test_rescale_sources_errors(make_network):
+    network = make_network("ring", frequencies=[50])
+    with pytest.raises(ValueError, match="No unit responses"):
+        network.rescale_sources(sources={"source1": 2.0})
+
+    gi.run_fault(network, "fault1", store_unit_responses=True)
+    with pytest.raises(ValueError):
+        network.rescale_sources(sources={"unknown": 2.0})
+    with pytest.raises(ValueError):
+        network.rescale_sources(sources={"source1": {60: 100.0}})
+    with pytest.raises(ValueError):
+        network.rescale_sources(scalings={"unknown": {50: 1.0}})
+
+    # the responses are discarded once the network changes
+    network.branches["branch1"].length = 2.0
+    with pytest.raises(ValueError, match="changed"):
+        network.rescale_sources(sources={"source1": 2.0})
+
+    # running a fault without storing its responses drops the old ones
+    gi.run_fault(network, "fault1")
+    assert network._unit_responses == {}
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+import groundinsight as gi
+from groundinsight.electrical_network import admittance_matrices
+from groundinsight.models.core_models import Fault
+from groundinsight.simulation.symbolic import SymbolicAnalysis
+from groundinsight.simulation.symmetric import SymmetricFactorization
+
+@pytest.fixture
+def network(make_network):
+    network = make_network("ring", frequencies=[50, 150, 250, 350], number_buses=120, seed=7)
+    network.add_fault(Fault(name="fault2", bus="bus60", scalings={50: 1.0, 250: 0.5}))
+    return network
+
+
+def test_symbolic_analysis_shared_by_frequencies_and_faults(network):
+    expected = {}
+    for fault_name in network.faults:
+        gi.run_fault(network, fault_name, solver="lu")
+        expected[fault_name] = network.results[fault_name]
+
+    # "auto" factorizes the meshed network with the ordering of the first frequency of fault1
+    gi.run_fault(network, "fault1")
+    analysis = network._symbolic_analysis
+    ordering = analysis.ordering
+    assert network.electrical_network.symbolic_analysis is analysis
+    assert isinstance(network.electrical_network.factorizations[50.0], SymmetricFactorization)
+    gi.run_fault(network, "fault2")
+    assert network._symbolic_analysis is analysis
+    assert analysis.ordering is ordering
+    for factorization in network.electrical_network.factorizations.values():
+        assert factorization.ordering is ordering
+
+    for fault_name in network.faults:
+        result = network.results[fault_name]
+        for bus, expected_bus in zip(result.buses, expected[fault_name].buses):
+            assert bus.uepr == pytest.approx(expected_bus.uepr, rel=1e-10)
+        for branch, expected_branch in zip(result.branches, expected[fault_name].branches):
+            assert branch.i_s == pytest.approx(expected_branch.i_s, rel=1e-10, abs=1e-10)
+
+    report = network.memory_report()
+    row = report.filter(report["component"] == "symbolic_analysis").row(0, named=True)
+    assert row["bytes"] == analysis.nbytes > 0
+
+
+def test_symbolic_analysis_follows_pattern_changes(network):
+    gi.run_fault(network, "fault1")
+    analysis = network._symbolic_analysis
+
+    # reconnecting the last branch in parallel to its neighbour opens the ring into a chain
+    branch = network.branches["branch120"].model_copy(update={"to_bus": "bus119"})
+    network.add_branch(branch, overwrite=True)
+    gi.run_fault(network, "fault1", solver="symmetric")
+    assert network._symbolic_analysis is not analysis
+    assert network._symbolic_analysis.tree_topology() is not None
+    assert analysis.tree_topology() is None
+
+
+def test_symbolic_analysis_factorization(network):
+    matrices = admittance_matrices(network, {name: idx for idx, name in enumerate(network.buses)})
+    analysis = SymbolicAnalysis(matrices[50.0])
+    assert all(analysis.matches(matrix) for matrix in matrices.values())
+    assert not analysis.matches(matrices[50.0][:-1, :-1].tocsc())
+
+    rhs = np.zeros((120, 2), dtype=complex)
+    rhs[0, 0], rhs[119, 1] = 1.0, -2.0j
+    for freq, matrix in matrices.items():
+        factorization = analysis.factorize(matrix)
+        assert factorization.nnz == SymmetricFactorization.factorize(matrix, analysis.ordering).nnz
+        np.testing.assert_allclose(
+            factorization.solve(rhs), np.linalg.solve(matrix.toarray(), rhs), rtol=1e-9, atol=1e-14
+        )
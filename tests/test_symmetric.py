@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import groundinsight as gi
+from scipy.sparse.linalg import splu
+from groundinsight.electrical_network import admittance_matrices
+from groundinsight.simulation.symmetric import SymmetricFactorization
+
+def test_symmetric_solver_matches_lu(make_network):
+    network = make_network("grid", frequencies=[50, 250, 350], columns=4, seed=6)
+    gi.run_fault(network, "fault1", solver="lu")
+    expected = network.results["fault1"]
+    gi.run_fault(network, "fault1", solver="symmetric")
+    result = network.results["fault1"]
+    for bus, expected_bus in zip(result.buses, expected.buses):
+        assert bus.uepr == pytest.approx(expected_bus.uepr, rel=1e-12)
+    for branch, expected_branch in zip(result.branches, expected.branches):
+        assert branch.i_s == pytest.approx(expected_branch.i_s, rel=1e-12)
+
+    # all frequencies are factorized with the ordering of the first one
+    electrical_network = network.electrical_network
+    assert sorted(electrical_network.symmetric_ordering) == list(range(electrical_network.num_buses))
+    for factorization in electrical_network.factorizations.values():
+        assert factorization.ordering is electrical_network.symmetric_ordering
+
+
+def test_symmetric_factorization_fill_in(make_network):
+    network = make_network("grid", rows=20, columns=20, seed=6)
+    matrices = admittance_matrices(network, {name: idx for idx, name in enumerate(network.buses)})
+    first = SymmetricFactorization.factorize(matrices[50.0])
+    second = SymmetricFactorization.factorize(matrices[250.0], first.ordering)
+    assert first.nnz == second.nnz
+    assert second.nnz < 0.75 * splu(matrices[250.0]).nnz
+    assert second.nbytes > 0
+
+    rhs = np.zeros((400, 2), dtype=complex)
+    rhs[0, 0], rhs[399, 1] = 1.0, -2.0j
+    for freq, factorization in ((50.0, first), (250.0, second)):
+        np.testing.assert_allclose(
+            factorization.solve(rhs), np.linalg.solve(matrices[freq].toarray(), rhs), rtol=1e-9, atol=1e-14
+        )
+        np.testing.assert_allclose(
+            factorization.solve(rhs[:, 0]), np.linalg.solve(matrices[freq].toarray(), rhs[:, 0]), rtol=1e-9
+        )
+
+
+def test_symmetric_factorization_off_diagonal_pivots():
+    from scipy.sparse import csc_matrix
+    from groundinsight.simulation.symbolic import SymbolicAnalysis
+
+    # a zero on the diagonal forces SuperLU to pivot off the diagonal
+    matrix = csc_matrix(
+        np.array([[0, 1, 0, 0], [1, 0, 2, 0], [0, 2, 1, 1j], [0, 0, 1j, 3]], dtype=complex)
+    )
+    rhs = np.array([1.0, -2.0j, 0.5, 1.0])
+    expected = np.linalg.solve(matrix.toarray(), rhs)
+
+    factorization = SymmetricFactorization.factorize(matrix)
+    assert factorization.ordering is None
+    np.testing.assert_allclose(factorization.solve(rhs), expected, rtol=1e-12)
+
+    # a reused ordering that does not suit the matrix still gives the exact solution
+    reused = SymmetricFactorization.factorize(matrix, np.arange(4))
+    np.testing.assert_allclose(reused.solve(rhs), expected, rtol=1e-12)
+
+    analysis = SymbolicAnalysis(matrix)
+    np.testing.assert_allclose(analysis.factorize(matrix).solve(rhs), expected, rtol=1e-12)
+    assert analysis.ordering is None
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import groundinsight as gi
+
+
+@pytest.mark.parametrize("topology, size", [
+    ("grid", {}),
+    ("tree", {"number_buses": 60, "branching": 4}),
+])
+def test_transfer_impedance_cache(make_network, topology, size):
+    network = make_network(topology, seed=2, **size)
+    gi.run_fault(network, "fault1")
+    electrical_network = network.electrical_network
+    cache = electrical_network.transfer_impedances
+    assert cache is electrical_network.transfer_impedances
+    names = list(electrical_network.bus_indices)
+
+    for freq in network.frequencies:
+        Z = np.linalg.inv(electrical_network.Y_matrices[freq].toarray())
+        np.testing.assert_allclose(cache.column(names[2], freq), Z[:, 2], rtol=1e-10)
+        np.testing.assert_allclose(cache.columns([names[0], names[3]], freq), Z[:, [0, 3]], rtol=1e-10)
+        assert cache.impedance(names[1], names[3], freq) == pytest.approx(Z[1, 3], rel=1e-10)
+        # the row of a cached column answers the reverse query
+        assert cache.impedance(names[3], names[4], freq) == pytest.approx(Z[3, 4], rel=1e-10)
+
+        # the voltages of the fault are the superposition of the injected currents
+        i_vector = electrical_network.i_vectors[freq]
+        injections = {name: i_vector[idx] for name, idx in electrical_network.bus_indices.items() if i_vector[idx]}
+        np.testing.assert_allclose(
+            cache.voltages(injections, freq), electrical_network.u_vectors[freq], rtol=1e-9
+        )
+
+    assert cache.misses > 0 and cache.hits > 0
+    with pytest.raises(ValueError):
+        cache.column(names[0], 60)
+    with pytest.raises(ValueError):
+        cache.column("unknown", 50)
+
+    report = network.memory_report()
+    row = report.filter(report["component"] == "transfer_impedances").row(0, named=True)
+    assert row["count"] == len(cache) and row["bytes"] == cache.nbytes
+
+
+def test_transfer_impedance_cache_limit(make_network):
+    network = make_network("grid", frequencies=[50])
+    gi.create_paths(network)
+    network.set_active_fault("fault1")
+    gi.build_electrical_network(network)
+    # columns are computed from a new factorization if the network is not solved yet
+    cache = network.electrical_network.transfer_impedances
+    column_bytes = 9 * 16
+    cache.max_bytes = 2 * column_bytes
+
+    cache.column("bus1", 50)
+    cache.column("bus2", 50)
+    cache.column("bus1", 50)  # bus1 is now the most recently used column
+    cache.column("bus3", 50)
+    assert len(cache) == 2 and cache.nbytes == 2 * column_bytes
+    misses = cache.misses
+    cache.column("bus1", 50)
+    assert cache.misses == misses
+    cache.column("bus2", 50)
+    assert cache.misses == misses + 1
+
+    cache.max_bytes = column_bytes
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
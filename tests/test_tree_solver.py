@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import splu
+import groundinsight as gi
+from groundinsight.electrical_network import ElectricalNetwork
+from groundinsight.simulation.tree_solver import TreeFactorization, TreeTopology
+
+FREQUENCIES = [50, 150, 250]
+
+def _solve(network, solver):
+    gi.run_fault(network, "fault1", solver=solver)
+    electrical_network = network.electrical_network
+    voltages = np.array([electrical_network.u_vectors[freq] for freq in network.frequencies])
+    result = network.results["fault1"]
+    return electrical_network, voltages, result
+
+
+@pytest.mark.parametrize("topology, size", [
+    ("tree", {"number_buses": 40, "branching": 3}),
+    ("chain", {"number_buses": 25}),
+    ("parallel", {"number_buses": 10}),
+])
+def test_tree_solver_matches_lu(make_network, bus_type, topology, size):
+    network = make_network(topology, frequencies=FREQUENCIES, seed=5, **size)
+    # an isolated bus makes the network a forest
+    gi.create_bus(name="isolated", type=bus_type, specific_earth_resistance=100.0, network=network)
+    gi.create_paths(network)
+
+    electrical_network, lu_voltages, lu_result = _solve(network, "lu")
+    assert electrical_network.tree_topology is None
+    lu_reduction = dict(lu_result.reduction_factor.value)
+    lu_branches = {branch.name: branch.i_s for branch in lu_result.branches}
+
+    electrical_network, voltages, result = _solve(network, "tree")
+    assert electrical_network.tree_topology is not None
+    assert isinstance(electrical_network.factorizations[50.0], TreeFactorization)
+    np.testing.assert_allclose(voltages, lu_voltages, rtol=1e-10, atol=1e-10)
+    for freq, value in result.reduction_factor.value.items():
+        assert value == pytest.approx(lu_reduction[freq], rel=1e-10)
+    for branch in result.branches:
+        assert branch.i_s == pytest.approx(lu_branches[branch.name], rel=1e-9, abs=1e-9)
+
+
+def test_auto_solver_selection(make_network):
+    wide = make_network("tree", frequencies=FREQUENCIES, number_buses=200, branching=4)
+    gi.create_paths(wide)
+    gi.run_fault(wide, "fault1")
+    assert wide.electrical_network.tree_topology is not None
+
+    # a long chain at few frequencies is faster with sparse LU
+    chain = make_network("chain", frequencies=FREQUENCIES, number_buses=200)
+    gi.create_paths(chain)
+    gi.run_fault(chain, "fault1")
+    assert chain.electrical_network.tree_topology is None
+
+    grid = make_network("grid", frequencies=FREQUENCIES)
+    gi.create_paths(grid)
+    gi.run_fault(grid, "fault1")
+    assert grid.electrical_network.tree_topology is None
+    with pytest.raises(ValueError):
+        gi.run_fault(grid, "fault1", solver="tree")
+    with pytest.raises(ValueError):
+        gi.run_fault(grid, "fault1", solver="cholesky")
+
+
+def test_tree_topology_and_factorization(make_network):
+    network = make_network("chain", frequencies=FREQUENCIES)
+    network.set_active_fault("fault1")
+    electrical_network = ElectricalNetwork(network, solver="lu")
+    matrices = list(electrical_network.Y_matrices.values())
+
+    topology = TreeTopology.from_matrices(matrices, 9)
+    # a chain of 9 buses is rooted at its middle bus
+    assert topology.num_levels == 4
+    assert (topology.parent == -1).sum() == 1
+    assert topology.parent[4] == -1
+
+    factorization = TreeFactorization.factorize(topology, matrices)
+    rhs = np.random.default_rng(0).normal(size=(9, 4)) + 0j
+    for k, matrix in enumerate(matrices):
+        np.testing.assert_allclose(
+            factorization.matrix(k).solve(rhs), splu(matrix).solve(rhs), rtol=1e-10
+        )
+    # all matrices at once with one right-hand side per matrix
+    solution = factorization.solve(rhs[:, :3])
+    for k, matrix in enumerate(matrices):
+        np.testing.assert_allclose(solution[:, k], splu(matrix).solve(rhs[:, k]), rtol=1e-10)
+
+    # a bus without any connection makes the matrix singular
+    matrix = csc_matrix(np.diag([1.0, 0.0, 2.0]))
+    with pytest.raises(RuntimeError):
+        TreeFactorization.factorize(TreeTopology.from_matrices([matrix], 3), [matrix])
+
+
+def test_tree_topology_detects_mesh(make_network):
+    network = make_network("ring", frequencies=FREQUENCIES)
+    network.set_active_fault("fault1")
+    electrical_network = ElectricalNetwork(network)
+    assert TreeTopology.from_matrices(list(electrical_network.Y_matrices.values()), 6) is None